@@ -1,20 +1,41 @@
 """
 診断士学習記録アプリ v3 - ロードマップ&目標vs実績追加版
 資格取得コンサル × UI/UXデザイナーの視点で再設計
+
+起動時の読み込み時間の計測: python app_v3.py --profile-startup
 """
+import sys
+
+if __name__ == "__main__" and "--profile-startup" in sys.argv and "streamlit" not in sys.modules:
+    # streamlit run ではなく直接実行された場合のみ（重いモジュールを読み込む前に分岐）
+    from utils.startup_profile import main as profile_startup
+    sys.exit(profile_startup(sys.argv[1:]))
+
 import streamlit as st
 from datetime import date, datetime, timedelta
-import pyperclip
-import pandas as pd
 from urllib.parse import quote
 
-from database.init_db import init_database
 from models.record import StudyRecord
-from services.database import DatabaseService
-from services.obsidian import ObsidianService
-from services.obsidian_sync import ObsidianSyncService
-from services.tweet import TweetService
-from utils.phase import get_current_phase
+from services.registry import (
+    ensure_database,
+    get_available_daily_notes,
+    get_database_service,
+    get_multi_vault_sync_service,
+    get_obsidian_service,
+    get_reconcile_service,
+    get_resumable_sync_jobs,
+    get_sync_service,
+    get_tweet_cache,
+    get_tweet_service,
+    get_vault_sources,
+    invalidate_sync_views,
+)
+from services.export_queue import get_export_queue
+from services.reconcile import PREFER_DB, PREFER_NOTE
+from services.sync_job import get_sync_job_manager, JOB_COMPLETED, JOB_CANCELLED
+from utils import perf
+from utils.clipboard import ClipboardError, copy_to_clipboard
+from utils.phase import get_current_phase, get_phase_for_date
 from utils.stats import (
     calculate_days_until_exam,
     calculate_required_daily_pace,
@@ -24,15 +45,29 @@ from utils.stats import (
     calculate_subject_progress
 )
 from utils.quotes import get_daily_quote
-from components.roadmap import show_roadmap, show_goal_vs_actual, show_learning_journey_summary
-from components.subjects import show_subject_progress_by_category
-from components.review import show_weekly_review, show_monthly_review
+from components.perf_hud import show_perf_hud
+from components.snapshot import load_snapshot
+from components.sections import lazy_component, show_lazy_section
 from components.tweet_char_counter import show_char_counter
 
+# pandas・Plotly を使うコンポーネントは表示するときに読み込む（起動時間の短縮）
+show_roadmap = lazy_component('components.roadmap', 'show_roadmap')
+show_goal_vs_actual = lazy_component('components.roadmap', 'show_goal_vs_actual')
+show_learning_journey_summary = lazy_component('components.roadmap', 'show_learning_journey_summary')
+show_subject_progress_by_category = lazy_component('components.subjects', 'show_subject_progress_by_category')
+show_weekly_review = lazy_component('components.review', 'show_weekly_review')
+show_monthly_review = lazy_component('components.review', 'show_monthly_review')
+
 
 # 科目絵文字マッピング（utils.subjectsからインポート）
 from utils.subjects import SUBJECT_EMOJI_MAP
 
+# 分析画面の推移グラフの表示期間（日数、Noneは全期間）
+ANALYTICS_CHART_RANGES = {'全期間': None, '1年': 365, '3ヶ月': 90, '1ヶ月': 30}
+
+# 学習履歴の1ページの件数の選択肢
+HISTORY_PAGE_SIZES = (10, 20, 50)
+
 # ページ設定（モバイル最適化）
 st.set_page_config(
     page_title="診断士学習記録",
@@ -195,27 +230,32 @@ st.markdown("""
 
 
 def init_app():
-    """アプリ初期化"""
-    init_database()
+    """アプリ初期化（DB初期化・サービス生成はプロセス内で1回だけ）"""
+    ensure_database()
 
     if 'db_service' not in st.session_state:
-        st.session_state.db_service = DatabaseService()
+        st.session_state.db_service = get_database_service()
     if 'obsidian_service' not in st.session_state:
-        st.session_state.obsidian_service = ObsidianService()
+        st.session_state.obsidian_service = get_obsidian_service()
     if 'tweet_service' not in st.session_state:
-        st.session_state.tweet_service = TweetService()
+        st.session_state.tweet_service = get_tweet_service()
 
 
+@perf.timed('render')
 def main():
-    """メイン画面"""
+    """メイン画面（計測が有効なら1回の描画を1つの実行として記録）"""
     init_app()
 
+    # この描画で使うデータ（全コンポーネントで共有）
+    with perf.timed('snapshot'):
+        snapshot = load_snapshot()
+
     # サイドバー：最近の学習記録
-    with st.sidebar:
+    with st.sidebar, perf.timed('sidebar'):
         st.markdown("### 📜 最近の学習記録")
         st.caption("クリックで投稿文を表示")
 
-        recent_records = st.session_state.db_service.get_recent_records(limit=5)
+        recent_records = snapshot.recent_records(limit=5)
 
         if not recent_records:
             st.info("まだ学習記録がありません")
@@ -288,8 +328,8 @@ def main():
             st.markdown("---")
 
             # 投稿文を生成
-            stats = st.session_state.db_service.get_cumulative_stats()
-            tweet_text = TweetService.generate_daily_tweet(selected, stats)
+            # 投稿文はキャッシュから取得（記録が更新されていれば再生成）
+            tweet_text = get_tweet_cache().get_daily_tweet(selected)
 
             # 2カラムレイアウト
             col_preview, col_actions = st.columns([2, 1])
@@ -326,9 +366,9 @@ def main():
                 # 補助アクション
                 if st.button("📋 コピー", key="copy_history_tweet", use_container_width=True):
                     try:
-                        pyperclip.copy(tweet_text)
+                        copy_to_clipboard(tweet_text)
                         st.toast("✅ コピーしました！", icon="✅")
-                    except pyperclip.PyperclipException:
+                    except ClipboardError:
                         st.error("⚠️ クリップボードへのアクセスに失敗しました")
                         st.caption("ブラウザの設定でクリップボード機能を許可してください")
                     except Exception as e:
@@ -357,11 +397,11 @@ def main():
 - 文字数: 140文字以内厳守（改行含む）"""
 
                     try:
-                        pyperclip.copy(helper_prompt)
+                        copy_to_clipboard(helper_prompt)
                         st.toast("✅ Claudeヘルパーをコピー！", icon="✨")
                         with st.expander("📋 プロンプト確認"):
                             st.code(helper_prompt, language=None)
-                    except (pyperclip.PyperclipException, Exception) as e:
+                    except (ClipboardError, Exception) as e:
                         st.error(f"⚠️ コピーに失敗しました: {type(e).__name__}")
 
                 # 学習詳細
@@ -381,24 +421,25 @@ def main():
     tab1, tab2, tab3, tab4 = st.tabs(["🏠 ダッシュボード", "✏️ 今日の記録", "📊 分析", "⚙️ 設定"])
 
     with tab1:
-        show_dashboard()
+        show_dashboard(snapshot)
 
     with tab2:
-        show_daily_input()
+        show_daily_input(snapshot)
 
     with tab3:
-        show_analytics()
+        show_analytics(snapshot)
 
     with tab4:
-        show_settings()
+        show_settings(snapshot)
 
 
-def show_daily_mission(stats, days_to_toukei):
+@perf.timed('dashboard.mission')
+def show_daily_mission(stats, days_to_toukei, snapshot):
     """今日のミッション - 最優先タスク表示"""
     st.markdown("### 🎯 今日のミッション")
 
     # 今日の学習記録を取得
-    today_record = st.session_state.db_service.get_record_by_date(date.today())
+    today_record = snapshot.record_by_date(date.today())
 
     # 今日の実績
     toukei_today = today_record.toukei_time if today_record else 0.0
@@ -486,23 +527,23 @@ def show_daily_mission(stats, days_to_toukei):
         st.success("✅ 今日の目標達成！")
 
 
-def show_dashboard():
+@perf.timed('dashboard')
+def show_dashboard(snapshot):
     """ダッシュボード画面（完全再設計版）"""
-    # データ取得
-    stats = st.session_state.db_service.get_cumulative_stats()
-    all_records = st.session_state.db_service.get_all_records()
+    # データ取得（描画ごとのスナップショット）
+    stats = snapshot.stats
+    all_records = snapshot.all_records
 
     # 統計計算
-    days_to_toukei, days_to_shindan = calculate_days_until_exam()
-    required_pace = calculate_required_daily_pace(
-        stats.shindan_total,
-        stats.shindan_goal,
-        days_to_shindan
-    )
-    streak = calculate_streak(all_records)
-    weekly_stats = calculate_weekly_stats(all_records)
-    monthly_stats = calculate_monthly_stats(all_records)
-    current_phase = get_current_phase()
+    with perf.timed('dashboard.stats'):
+        days_to_toukei, days_to_shindan = calculate_days_until_exam()
+        required_pace = calculate_required_daily_pace(
+            stats.shindan_total,
+            stats.shindan_goal,
+            days_to_shindan
+        )
+        streak = calculate_streak(all_records)
+        current_phase = get_current_phase()
 
     # 今日の古典名言
     daily_quote = get_daily_quote()
@@ -523,7 +564,7 @@ def show_dashboard():
     st.divider()
 
     # 🎯 今日のミッション（最優先表示）
-    show_daily_mission(stats, days_to_toukei)
+    show_daily_mission(stats, days_to_toukei, snapshot)
 
     st.divider()
 
@@ -564,45 +605,16 @@ def show_dashboard():
 
     st.divider()
 
+    # 開いているセクションだけ描画（閉じたセクションの集計・グラフ作成は行わない）
     # 📈 現在の学習進捗（累計目標 vs 実績）
-    with st.expander("📈 累計進捗 - 目標 vs 実績", expanded=True):
-        show_goal_vs_actual(stats, st.session_state.db_service)
+    show_lazy_section(
+        "goal_vs_actual", "📈 累計進捗 - 目標 vs 実績",
+        show_goal_vs_actual, stats, st.session_state.db_service,
+        expanded=True
+    )
 
     # 📊 最近の学習状況（週次・月次統合）
-    with st.expander("📊 最近の学習状況（週次・月次）", expanded=False):
-        col1, col2 = st.columns(2)
-
-        with col1:
-            st.markdown("#### 📅 今週の学習時間")
-            st.markdown(f"""
-            <div style="background: rgba(50, 50, 50, 0.4); padding: 20px; border-radius: 12px; border-left: 4px solid #4ECDC4;">
-                <div style="color: #E0E0E0; margin-bottom: 8px;">
-                    📘 診断士: <strong style="color: #4ECDC4; font-size: 20px;">{weekly_stats['shindan']:.1f}h</strong>
-                </div>
-                <div style="color: #E0E0E0; margin-bottom: 8px;">
-                    📊 統計: <strong style="color: #FF6B6B; font-size: 20px;">{weekly_stats['toukei']:.1f}h</strong>
-                </div>
-                <div style="color: #FFD700; margin-top: 12px; font-size: 18px;">
-                    合計: <strong>{weekly_stats['total']:.1f}h</strong>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-
-        with col2:
-            st.markdown("#### 📅 今月の学習時間")
-            st.markdown(f"""
-            <div style="background: rgba(50, 50, 50, 0.4); padding: 20px; border-radius: 12px; border-left: 4px solid #FF6B6B;">
-                <div style="color: #E0E0E0; margin-bottom: 8px;">
-                    📘 診断士: <strong style="color: #4ECDC4; font-size: 20px;">{monthly_stats['shindan']:.1f}h</strong>
-                </div>
-                <div style="color: #E0E0E0; margin-bottom: 8px;">
-                    📊 統計: <strong style="color: #FF6B6B; font-size: 20px;">{monthly_stats['toukei']:.1f}h</strong>
-                </div>
-                <div style="color: #FFD700; margin-top: 12px; font-size: 18px;">
-                    合計: <strong>{monthly_stats['total']:.1f}h</strong>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
+    show_lazy_section("recent", "📊 最近の学習状況（週次・月次）", show_recent_study_summary, snapshot)
 
     # レビュー機能へのクイックアクセス
     st.markdown("---")
@@ -610,35 +622,77 @@ def show_dashboard():
     col_review1, col_review2 = st.columns(2)
 
     with col_review1:
-        with st.expander("📅 今週の振り返り", expanded=False):
-            show_weekly_review()
+        show_lazy_section("weekly_review", "📅 今週の振り返り", show_weekly_review, snapshot)
 
     with col_review2:
-        with st.expander("📆 今月の振り返り", expanded=False):
-            show_monthly_review()
+        show_lazy_section("monthly_review", "📆 今月の振り返り", show_monthly_review, snapshot)
 
     # その他の分析セクション
     st.markdown("---")
     st.markdown("### 📊 詳細分析")
 
     # 🗺️ ロードマップ
-    with st.expander("🗺️ 学習ロードマップ", expanded=False):
-        show_roadmap()
+    show_lazy_section("roadmap", "🗺️ 学習ロードマップ", show_roadmap, snapshot)
 
     # 📚 科目別進捗（1次/2次試験別）
-    with st.expander("📚 科目別進捗（1次/2次試験）", expanded=False):
-        show_subject_progress_by_category(st.session_state.db_service, all_records)
+    show_lazy_section(
+        "subject_progress", "📚 科目別進捗（1次/2次試験）",
+        show_subject_progress_by_category, st.session_state.db_service, snapshot
+    )
 
     # 🏆 過去の学習成果
-    with st.expander("🏆 過去の学習成果", expanded=False):
-        show_learning_journey_summary(st.session_state.db_service, all_records)
+    show_lazy_section(
+        "journey", "🏆 過去の学習成果",
+        show_learning_journey_summary, st.session_state.db_service, all_records
+    )
 
     # Obsidian同期モーダル
     if st.session_state.get('show_obsidian_sync', False):
         show_obsidian_sync_modal()
 
 
-def show_daily_input():
+def show_recent_study_summary(snapshot):
+    """最近の学習状況（今週・今月の学習時間）"""
+    weekly_stats = calculate_weekly_stats(snapshot.all_records)
+    monthly_stats = calculate_monthly_stats(snapshot.all_records)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("#### 📅 今週の学習時間")
+        st.markdown(f"""
+        <div style="background: rgba(50, 50, 50, 0.4); padding: 20px; border-radius: 12px; border-left: 4px solid #4ECDC4;">
+            <div style="color: #E0E0E0; margin-bottom: 8px;">
+                📘 診断士: <strong style="color: #4ECDC4; font-size: 20px;">{weekly_stats['shindan']:.1f}h</strong>
+            </div>
+            <div style="color: #E0E0E0; margin-bottom: 8px;">
+                📊 統計: <strong style="color: #FF6B6B; font-size: 20px;">{weekly_stats['toukei']:.1f}h</strong>
+            </div>
+            <div style="color: #FFD700; margin-top: 12px; font-size: 18px;">
+                合計: <strong>{weekly_stats['total']:.1f}h</strong>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("#### 📅 今月の学習時間")
+        st.markdown(f"""
+        <div style="background: rgba(50, 50, 50, 0.4); padding: 20px; border-radius: 12px; border-left: 4px solid #FF6B6B;">
+            <div style="color: #E0E0E0; margin-bottom: 8px;">
+                📘 診断士: <strong style="color: #4ECDC4; font-size: 20px;">{monthly_stats['shindan']:.1f}h</strong>
+            </div>
+            <div style="color: #E0E0E0; margin-bottom: 8px;">
+                📊 統計: <strong style="color: #FF6B6B; font-size: 20px;">{monthly_stats['toukei']:.1f}h</strong>
+            </div>
+            <div style="color: #FFD700; margin-top: 12px; font-size: 18px;">
+                合計: <strong>{monthly_stats['total']:.1f}h</strong>
+            </div>
+        </div>
+        """, unsafe_allow_html=True)
+
+
+@perf.timed('daily_input')
+def show_daily_input(snapshot):
     """日次記録入力画面（改善版）"""
     st.header("✏️ 今日の学習記録")
 
@@ -648,11 +702,11 @@ def show_daily_input():
         target_date = st.date_input("📅 日付", value=date.today())
 
     with col2:
-        phase = get_current_phase()
+        phase = get_phase_for_date(target_date)
         st.info(f"**フェーズ**: {phase}")
 
     # 既存データ読み込み
-    existing_record = st.session_state.db_service.get_record_by_date(target_date)
+    existing_record = snapshot.record_by_date(target_date)
 
     # 中小企業診断士セクション
     with st.expander("📘 中小企業診断士", expanded=True):
@@ -674,7 +728,7 @@ def show_daily_input():
             )
 
         with col2:
-            subjects = st.session_state.db_service.get_subjects()
+            subjects = snapshot.subjects()
             subject_names = [s[0] for s in subjects]
 
             # 絵文字付き表示オプションを作成
@@ -812,21 +866,21 @@ def save_and_generate_tweet(
 
     try:
         record_id = st.session_state.db_service.save_record(record)
-        stats = st.session_state.db_service.get_cumulative_stats()
-        file_path = st.session_state.obsidian_service.export_to_obsidian(record, stats)
-        tweet_text = st.session_state.tweet_service.generate_daily_tweet(record, stats)
+        # Obsidian出力はバックグラウンドで実行（保存はDBコミットで完了）
+        get_export_queue().enqueue(record.date)
+        tweet_text = get_tweet_cache().fill_daily(record.date)
     except Exception as e:
         st.error(f"⚠️ データの保存中にエラーが発生しました: {str(e)}")
         return
 
     try:
-        pyperclip.copy(tweet_text)
+        copy_to_clipboard(tweet_text)
         clipboard_msg = "✅ クリップボードにコピーしました"
     except:
         clipboard_msg = "⚠️ クリップボードへのコピーに失敗しました"
 
     st.success(f"✅ 記録を保存しました（ID: {record_id}）")
-    st.success(f"✅ Obsidianファイルを出力: {file_path.name}")
+    st.caption(f"📤 Obsidianファイル {record.date.isoformat()}.md をバックグラウンドで出力します")
     st.info(clipboard_msg)
 
     st.subheader("📱 X投稿文")
@@ -854,7 +908,7 @@ def save_and_generate_tweet(
     with col2:
         if st.button("📋 投稿文を再コピー", use_container_width=True):
             try:
-                pyperclip.copy(tweet_text)
+                copy_to_clipboard(tweet_text)
                 st.success("✅ コピーしました")
             except:
                 st.error("⚠️ コピーに失敗しました")
@@ -883,12 +937,12 @@ def save_and_generate_tweet(
 - 文字数: 140文字以内厳守（改行含む）"""
 
             try:
-                pyperclip.copy(helper_prompt)
+                copy_to_clipboard(helper_prompt)
                 st.success("✅ Claudeヘルパープロンプトをコピーしました！")
                 st.info("👉 Claude Codeに貼り付けて、文章の改善案をもらってください")
                 with st.expander("📋 コピーされたプロンプトを確認"):
                     st.code(helper_prompt, language=None)
-            except (pyperclip.PyperclipException, Exception) as e:
+            except (ClipboardError, Exception) as e:
                 st.error(f"⚠️ コピーに失敗しました: {type(e).__name__}")
 
 
@@ -933,11 +987,11 @@ def save_record_only(
 
     try:
         record_id = st.session_state.db_service.save_record(record)
-        stats = st.session_state.db_service.get_cumulative_stats()
-        file_path = st.session_state.obsidian_service.export_to_obsidian(record, stats)
+        # Obsidian出力はバックグラウンドで実行（保存はDBコミットで完了）
+        get_export_queue().enqueue(record.date)
 
         st.success(f"✅ 記録を保存しました（ID: {record_id}）")
-        st.success(f"✅ Obsidianファイルを出力: {file_path.name}")
+        st.caption(f"📤 Obsidianファイル {record.date.isoformat()}.md をバックグラウンドで出力します")
         return True
     except Exception as e:
         st.error(f"⚠️ データの保存中にエラーが発生しました: {type(e).__name__}")
@@ -946,11 +1000,12 @@ def save_record_only(
         return False
 
 
-def show_analytics():
+@perf.timed('analytics')
+def show_analytics(snapshot):
     """分析画面"""
     st.header("📊 学習分析")
 
-    all_records = st.session_state.db_service.get_all_records()
+    all_records = snapshot.all_records
 
     if not all_records:
         st.info("まだ記録がありません")
@@ -959,48 +1014,100 @@ def show_analytics():
     # 学習時間推移グラフ
     st.subheader("📈 学習時間の推移")
 
-    # DataFrameに変換
-    df_data = []
-    for record in all_records:
-        df_data.append({
-            '日付': record.date,
-            '診断士': record.shindan_time,
-            '統計': record.toukei_time,
-            '合計': record.shindan_time + record.toukei_time
+    # pandas・NumPy は分析画面を開いたときに読み込む
+    with perf.timed('analytics.import'):
+        import numpy as np
+        import pandas as pd
+        from utils.downsample import downsample_indices, to_numeric_dates
+
+    # 表示期間（絞るほど同じ点数を狭い範囲に使うため細かく表示される）
+    range_label = st.radio(
+        "表示期間",
+        list(ANALYTICS_CHART_RANGES.keys()),
+        horizontal=True,
+        key="analytics_chart_range"
+    )
+    range_days = ANALYTICS_CHART_RANGES[range_label]
+    since = date.today() - timedelta(days=range_days) if range_days else None
+
+    with perf.timed('analytics.prepare') as span:
+        # 日付の昇順（all_records は新しい順）
+        chart_records = [r for r in reversed(all_records) if since is None or r.date >= since]
+        dates = [r.date for r in chart_records]
+        shindan = np.array([r.shindan_time for r in chart_records], dtype=float)
+        toukei = np.array([r.toukei_time for r in chart_records], dtype=float)
+        total = shindan + toukei
+
+        # 点数が多い場合はサーバー側で間引いてから送る
+        keep = downsample_indices(to_numeric_dates(dates), [shindan, toukei, total])
+        df = pd.DataFrame({
+            '日付': [dates[i] for i in keep],
+            '診断士': shindan[keep],
+            '統計': toukei[keep],
+            '合計': total[keep],
         })
-
-    df = pd.DataFrame(df_data)
-    df = df.sort_values('日付')
+        span['rows'] = len(keep)
 
     # 折れ線グラフ
-    st.line_chart(df.set_index('日付')[['診断士', '統計', '合計']])
+    with perf.timed('analytics.line_chart'):
+        st.line_chart(df.set_index('日付')[['診断士', '統計', '合計']])
+    if len(keep) < len(chart_records):
+        st.caption(f"{len(chart_records)}日分を{len(keep)}点に間引いて表示しています")
 
     st.divider()
 
     # 科目別集計
     st.subheader("📚 科目別学習時間")
 
-    subject_hours = {}
-    for record in all_records:
-        if record.shindan_subject and record.shindan_time > 0:
-            if record.shindan_subject not in subject_hours:
-                subject_hours[record.shindan_subject] = 0
-            subject_hours[record.shindan_subject] += record.shindan_time
+    subject_hours = snapshot.subject_hours()
 
     if subject_hours:
-        df_subjects = pd.DataFrame(list(subject_hours.items()), columns=['科目', '学習時間'])
-        df_subjects = df_subjects.sort_values('学習時間', ascending=False)
+        with perf.timed('analytics.subjects'):
+            df_subjects = pd.DataFrame(list(subject_hours.items()), columns=['科目', '学習時間'])
+            df_subjects = df_subjects.sort_values('学習時間', ascending=False)
 
-        st.bar_chart(df_subjects.set_index('科目'))
+            st.bar_chart(df_subjects.set_index('科目'))
     else:
         st.info("科目別データがありません")
 
     st.divider()
 
-    # 履歴テーブル
+    # 履歴（1ページ分ずつDBから取得）
     st.subheader("📜 学習履歴")
+    show_history_browser(snapshot)
+
+
+@st.fragment
+@perf.timed('analytics.history')
+def show_history_browser(snapshot):
+    """学習履歴のページ表示
+
+    日付をカーソルにして1ページ分だけDBから取得する（古い履歴でもページあたりの
+    コストは一定）。ページ送りや絞り込みではこのフラグメントだけ再実行する
+    """
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        text_filter = st.text_input(
+            "🔍 絞り込み（科目・内容・課題）",
+            key="history_filter",
+            placeholder="例: 財務会計"
+        ).strip()
+    with col2:
+        page_size = st.selectbox("表示件数", HISTORY_PAGE_SIZES, key="history_page_size")
 
-    for record in all_records[:10]:  # 最新10件
+    # 条件が変わったら最新のページに戻る（各ページ先頭のカーソルを積んでおく）
+    query = (text_filter, page_size)
+    if st.session_state.get('history_query') != query:
+        st.session_state.history_query = query
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+
+    records, next_cursor = snapshot.records_page(cursors[-1], page_size, text_filter)
+
+    if not records:
+        st.info("該当する記録がありません")
+
+    for record in records:
         with st.expander(f"{record.date.strftime('%Y年%m月%d日')} - {record.phase}"):
             col1, col2 = st.columns(2)
 
@@ -1018,8 +1125,21 @@ def show_analytics():
                 if record.toukei_content:
                     st.write(f"内容: {record.toukei_content}")
 
-
-def show_settings():
+    col_prev, col_page, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← 新しい記録", key="history_prev", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun(scope="fragment")
+    with col_page:
+        st.caption(f"ページ {len(cursors)}")
+    with col_next:
+        if st.button("古い記録 →", key="history_next", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun(scope="fragment")
+
+
+@perf.timed('settings')
+def show_settings(snapshot):
     """設定画面"""
     st.header("⚙️ 設定")
 
@@ -1028,11 +1148,10 @@ def show_settings():
 
     col1, col2 = st.columns(2)
     with col1:
-        all_records = st.session_state.db_service.get_all_records()
-        st.metric("総記録数", f"{len(all_records)}件")
+        st.metric("総記録数", f"{snapshot.record_count}件")
 
     with col2:
-        stats = st.session_state.db_service.get_cumulative_stats()
+        stats = snapshot.stats
         total_hours = stats.shindan_total + stats.toukei_total
         st.metric("総学習時間", f"{total_hours}h")
 
@@ -1042,14 +1161,78 @@ def show_settings():
     obsidian_path = st.session_state.obsidian_service.vault_path
     st.code(str(obsidian_path))
 
+    export_status = get_export_queue().status()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("出力待ち", f"{export_status['pending']}件")
+    col2.metric("出力済み（起動後）", f"{export_status['exported_count']}件")
+    col3.metric(
+        "最終出力",
+        export_status['last_exported_at'].strftime('%H:%M:%S') if export_status['last_exported_at'] else "-"
+    )
+    for failed_date, error in export_status['failures'].items():
+        st.error(f"⚠️ {failed_date.isoformat()} の出力に失敗しました: {error}")
+        if st.button("🔁 再出力", key=f"retry_export_{failed_date.isoformat()}"):
+            get_export_queue().enqueue(failed_date)
+            st.rerun()
+
+    if st.button("📤 全記録をObsidianへ再出力", use_container_width=True):
+        with st.spinner("出力中..."):
+            results = st.session_state.obsidian_service.export_all(st.session_state.db_service)
+        st.success(
+            f"✅ {results['total']}件中 {results['written']}件を出力しました"
+            f"（変更なし {results['skipped']}件）"
+        )
+
+    # DBとVaultの照合（前回の照合以降に変更された側だけを反映）
+    reconcile_service = get_reconcile_service()
+    watermark = reconcile_service.get_watermark()
+    st.caption(f"前回の照合: {watermark.strftime('%Y-%m-%d %H:%M:%S') if watermark else '未実施'}")
+
+    if st.button("🔁 DBとVaultを照合", use_container_width=True):
+        with st.spinner("照合中..."):
+            results = reconcile_service.reconcile()
+        st.success(
+            f"✅ 取り込み {len(results['pulled'])}件 / 出力 {results['pushed']}件"
+            f"（変更なし {results['unchanged']}件）"
+        )
+        if results['failed_count'] > 0:
+            st.error(f"⚠️ {results['failed_count']}件のエラーがありました（次回の照合で再試行します）")
+            with st.expander("詳細"):
+                for message in results['messages']:
+                    st.text(message)
+
+    for conflict_date, detail in reconcile_service.get_conflicts().items():
+        st.warning(
+            f"⚠️ {conflict_date.isoformat()}: DB（{detail['db_updated_at'][:19]}）と"
+            f"ノート（{detail['note_mtime'][:19]}）の両方が更新されています"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            if st.button("DBを採用", key=f"resolve_db_{conflict_date.isoformat()}", use_container_width=True):
+                success, message = reconcile_service.resolve_conflict(conflict_date, PREFER_DB)
+                if success:
+                    st.rerun()
+                st.error(message)
+        with col2:
+            if st.button("ノートを採用", key=f"resolve_note_{conflict_date.isoformat()}", use_container_width=True):
+                success, message = reconcile_service.resolve_conflict(conflict_date, PREFER_NOTE)
+                if success:
+                    st.rerun()
+                st.error(message)
+
     st.divider()
 
     st.subheader("科目マスタ")
-    subjects = st.session_state.db_service.get_subjects()
+    subjects = snapshot.subjects()
 
     for subject_name, abbr in subjects:
         st.write(f"- {subject_name} ({abbr}) - 目標: 90h")
 
+    st.divider()
+
+    # 直前までの描画の区間ごとの所要時間（この描画の結果は次の描画で表示される）
+    show_perf_hud()
+
 
 def show_obsidian_sync_modal():
     """Obsidian同期モーダル"""
@@ -1057,11 +1240,18 @@ def show_obsidian_sync_modal():
         st.subheader("🔄 Obsidianから同期")
         st.write("Obsidian Vaultのデイリーノートから学習記録を読み込んでデータベースに同期します。")
 
-        # 同期サービス初期化
-        sync_service = ObsidianSyncService()
+        # ノート一覧・Vault設定・中断したジョブは同期の開始・終了時に読み直す（手動でも再読み込みできる）
+        if st.button("🔁 ノート・Vault設定を再読み込み", key="reload_sync_views"):
+            invalidate_sync_views()
+
+        # 複数Vaultの設定がある場合は差分同期を表示
+        show_multi_vault_sync()
 
-        # 利用可能なデイリーノートを取得
-        available_dates = sync_service.get_available_daily_notes()
+        # 同期サービス（プロセス共有）
+        sync_service = get_sync_service()
+
+        # 利用可能なデイリーノート（再実行のたびにフォルダを読まないよう共有の結果を使う）
+        available_dates = get_available_daily_notes()
 
         if not available_dates:
             st.warning("⚠️ Obsidian Vaultにデイリーノートが見つかりません")
@@ -1134,27 +1324,129 @@ def show_obsidian_sync_modal():
             col1, col2 = st.columns(2)
             with col1:
                 if st.button("🔄 一括同期実行", type="primary", use_container_width=True):
-                    with st.spinner("同期中..."):
-                        results = sync_service.sync_date_range(start_date, end_date)
-
-                        st.success(f"✅ 成功: {results['success_count']}件")
-                        if results['failed_count'] > 0:
-                            st.warning(f"⚠️ 失敗: {results['failed_count']}件")
-
-                        # 詳細を表示
-                        with st.expander("詳細ログ"):
-                            for msg in results['messages']:
-                                st.text(msg)
-
-                        st.balloons()
-                        # ダッシュボードを再読み込み
-                        st.rerun()
+                    # バックグラウンドジョブとして開始（UIはブロックしない）
+                    job = get_sync_job_manager().start(start_date, end_date, sync_service)
+                    st.session_state.sync_job_id = job.job_id
+                    st.rerun()
 
             with col2:
                 if st.button("キャンセル", use_container_width=True):
                     st.session_state.show_obsidian_sync = False
                     st.rerun()
 
+            # 中断したジョブの再開
+            resumable_jobs = get_resumable_sync_jobs()
+            if resumable_jobs and not st.session_state.get('sync_job_id'):
+                with st.expander(f"⏸️ 中断したジョブ（{len(resumable_jobs)}件）"):
+                    for job in resumable_jobs:
+                        st.caption(
+                            f"{job.start_date.isoformat()} ～ {job.end_date.isoformat()} / "
+                            f"{job.resume_date.isoformat()} から再開"
+                        )
+                        if st.button("▶️ 再開", key=f"resume_sync_job_{job.job_id}"):
+                            get_sync_job_manager().resume(job.job_id, sync_service)
+                            st.session_state.sync_job_id = job.job_id
+                            st.rerun()
+
+        # 実行中・完了したジョブの進捗
+        if st.session_state.get('sync_job_id'):
+            show_sync_job_progress(st.session_state.sync_job_id, sync_service)
+
+
+def show_multi_vault_sync():
+    """複数Vaultからの差分同期（vaults.json に2つ以上のVaultがある場合のみ表示）"""
+    multi_sync_service = get_multi_vault_sync_service()
+    try:
+        sources = get_vault_sources()
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        return
+
+    if len(sources) < 2:
+        return
+
+    with st.expander(f"🗂️ 複数Vaultから同期（{len(sources)}件）", expanded=True):
+        for source in sorted(sources, key=lambda s: (-s.priority, s.name)):
+            st.caption(f"{source.name}（優先度 {source.priority}）: {source.daily_notes_path}")
+
+        if st.button("🔄 全Vaultを差分同期", type="primary", use_container_width=True):
+            with st.spinner("同期中..."):
+                results = multi_sync_service.sync()
+
+            st.success(f"✅ {results['success_count']}件を同期しました")
+            for name, vault_results in results['vaults'].items():
+                if vault_results['error']:
+                    st.warning(f"{name}: {vault_results['error']}")
+                else:
+                    st.caption(
+                        f"{name}: ノート {vault_results['notes']}件 / 読み込み {vault_results['parsed']}件 / "
+                        f"削除 {vault_results['removed']}件"
+                    )
+
+            if results['conflicts']:
+                with st.expander(f"⚠️ 複数Vaultで内容が異なる日付（{len(results['conflicts'])}件）"):
+                    for conflict in results['conflicts']:
+                        st.write(
+                            f"{conflict['date'].isoformat()}: {conflict['winner']} を採用"
+                            f"（{', '.join(conflict['others'])}）"
+                        )
+
+            if results['failed_count'] > 0:
+                with st.expander("詳細"):
+                    for message in results['messages']:
+                        st.text(message)
+
+
+@st.fragment(run_every=1.0)
+def show_sync_job_progress(job_id, sync_service):
+    """一括同期ジョブの進捗表示（この部分だけ1秒ごとに再描画）
+
+    Args:
+        job_id: ジョブID
+        sync_service: 再開時に使う同期サービス（開始時と同じもの）
+    """
+    job = get_sync_job_manager().get(job_id)
+    if job is None:
+        st.session_state.sync_job_id = None
+        return
+
+    st.markdown("#### 🔄 一括同期ジョブ")
+    st.progress(job.progress, text=f"{job.processed_days}/{job.total_days}日 処理済み")
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("読み込んだノート", f"{job.files_scanned}件")
+    col2.metric("学習ログあり", f"{job.files_parsed}件")
+    col3.metric("DB書き込み", f"{job.records_written}件")
+    col4.metric("エラー", f"{job.failed_count}件")
+
+    if job.is_active:
+        if st.button("⏹️ 同期を中止", key=f"cancel_sync_job_{job_id}", use_container_width=True):
+            get_sync_job_manager().cancel(job_id)
+        return
+
+    if job.status == JOB_COMPLETED:
+        st.success(f"✅ 同期完了: {job.records_written}件を書き込みました")
+    elif job.status == JOB_CANCELLED:
+        st.warning(f"⏸️ 中止しました（{job.last_committed_date} まで反映済み）")
+    else:
+        st.error(f"⚠️ 同期に失敗しました: {job.error}")
+
+    if job.messages:
+        with st.expander("詳細ログ"):
+            for msg in job.messages:
+                st.text(msg)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        if job.resume_date is not None:
+            if st.button("▶️ 再開", key=f"resume_sync_job_{job_id}_progress", use_container_width=True):
+                get_sync_job_manager().resume(job_id, sync_service)
+    with col2:
+        if st.button("閉じる", key=f"close_sync_job_{job_id}", use_container_width=True):
+            st.session_state.sync_job_id = None
+            # ダッシュボードを再読み込み
+            st.rerun(scope="app")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,86 @@
+"""
+学習ログパーサーのマイクロベンチマーク
+
+埋め込みログや添付ファイル（base64）を含む大きなジャーナル形式のノートを生成し、
+旧実装（全文読み込み + re.finditer）とストリーミング/mmap版を比較する
+
+Usage:
+    python bench_study_log.py [ノートサイズMB] > bench_output.txt
+"""
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils.study_log import parse_study_log, parse_study_log_file
+from utils.subjects import normalize_subject_name
+
+REPEAT = 5
+
+
+def build_journal_note(size_mb: float) -> str:
+    """ベンチマーク用のジャーナル形式ノートを生成"""
+    block = [
+        "## 日記",
+        "今日は午前中に財務会計、午後に統計の演習をした。" * 4,
+        "![[attachment.png]]",
+        "data:image/png;base64," + "iVBORw0KGgoAAAANSUhEUgAA" * 40,
+        "## 学習ログ",
+        "- 朝 dur:: 25m subject:: 財務会計",
+        "- 昼 dur:: 1h subject:: 企業経営理論",
+        "- 夜 dur:: 1.5h subject:: 統計検定",
+        "- dur:: 30m subject:: 未知の科目",
+        "## メモ",
+        "key:: value という形式のフィールドも混在する",
+        "",
+    ]
+    chunk = "\n".join(block)
+    repeat = max(1, int(size_mb * 1024 * 1024 / len(chunk.encode('utf-8'))))
+    return chunk * repeat
+
+
+def legacy_parse(content: str) -> list:
+    """旧実装（毎回パターン文字列から finditer）"""
+    logs = []
+    pattern = r'dur::\s*(\d+(?:\.\d+)?)\s*(h|m)\s+subject::\s*([^\n|#]+)'
+    for match in re.finditer(pattern, content, re.IGNORECASE):
+        subject = normalize_subject_name(match.group(3).strip())
+        if subject is None:
+            continue
+        value = float(match.group(1))
+        hours = value / 60.0 if match.group(2).lower() == 'm' else value
+        logs.append({'subject': subject, 'duration_hours': round(hours, 2)})
+    return logs
+
+
+def bench(label: str, func) -> None:
+    """REPEAT回実行して最速値を表示"""
+    best = float('inf')
+    count = 0
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        count = len(func())
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<28} {best * 1000:9.2f} ms  ({count}件)")
+
+
+def main():
+    size_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 8.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        note_path = Path(tmp) / "2026-01-01.md"
+        note_path.write_text(build_journal_note(size_mb), encoding='utf-8')
+        actual_mb = note_path.stat().st_size / 1024 / 1024
+
+        print(f"=== 学習ログパーサー ベンチマーク ({actual_mb:.1f}MB, best of {REPEAT}) ===\n")
+
+        bench("旧実装 (read + finditer)", lambda: legacy_parse(note_path.read_text(encoding='utf-8')))
+        bench("文字列 (splitlines)", lambda: parse_study_log(note_path.read_text(encoding='utf-8')))
+        bench("ストリーミング", lambda: parse_study_log_file(note_path, use_mmap=False))
+        bench("ストリーミング + mmap", lambda: parse_study_log_file(note_path, use_mmap=True))
+        bench("mmap + 学習ログセクション限定", lambda: parse_study_log_file(note_path, section_only=True, use_mmap=True))
+
+
+if __name__ == "__main__":
+    main()
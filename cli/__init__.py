@@ -0,0 +1,6 @@
+"""
+学習記録アプリのコマンドラインツール
+Streamlit を読み込まずに同期・出力・集計を実行する（cron や launchd からの定期実行用）
+
+    python -m cli --help
+"""
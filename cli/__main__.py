@@ -0,0 +1,6 @@
+"""python -m cli のエントリポイント"""
+import sys
+
+from cli.commands import main
+
+sys.exit(main())
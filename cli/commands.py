@@ -0,0 +1,279 @@
+"""
+コマンドラインツールのサブコマンド
+サービスの読み込みは引数の解析後に行う（--help やエラー時にDBやVaultに触れない）。
+結果は1件ごとに行単位で出力する（パイプやログファイルへのリダイレクトでも逐次表示される）
+
+Usage:
+    python -m cli sync [--start 2026-01-01] [--end 2026-01-31] [--all]
+    python -m cli export [--start 2026-01-01] [--end 2026-01-31]
+    python -m cli rebuild-rollups
+    python -m cli stats [--as-of 2026-03-31] [--json]
+    python -m cli tweet-backfill --start 2026-01-01 [--end 2026-03-31] [--periods daily,weekly]
+"""
+import argparse
+import contextlib
+import json
+import sys
+import time
+from datetime import date, timedelta
+from typing import Callable, Optional, Sequence
+
+# 期間を省略したときの同期対象（今日を含む直近の日数）
+DEFAULT_SYNC_DAYS = 7
+
+# 投稿文の期間の種類（services.tweet.ALL_PERIODS と同じ。--help の表示のためにここで定義）
+TWEET_PERIODS = ('daily', 'weekly', 'monthly')
+
+
+def _ensure_database() -> None:
+    """データベースを初期化（完了メッセージは標準エラーへ。標準出力はコマンドの結果だけにする）"""
+    from services.registry import ensure_database
+
+    with contextlib.redirect_stdout(sys.stderr):
+        ensure_database()
+
+
+def _resolve_range(args: argparse.Namespace, default_days: Optional[int] = None):
+    """--start / --end から期間を決定
+
+    Returns:
+        (開始日, 終了日)（どちらも指定がなく default_days もなければ (None, None)）
+    """
+    end_date = args.end
+    start_date = args.start
+    if start_date is None and end_date is None and default_days is None:
+        return None, None
+    if end_date is None:
+        end_date = date.today()
+    if start_date is None:
+        start_date = end_date - timedelta(days=(default_days or 1) - 1)
+    return start_date, end_date
+
+
+def _iter_dates(start_date: date, end_date: date):
+    """期間内の日付"""
+    current = start_date
+    while current <= end_date:
+        yield current
+        current += timedelta(days=1)
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    """Obsidianのデイリーノートから学習ログを取り込む"""
+    from services.obsidian_sync import SYNC_EMPTY, SYNC_MISSING, SYNC_WRITTEN
+    from services.registry import get_multi_vault_sync_service, get_sync_service
+
+    if args.multi_vault:
+        start_date, end_date = _resolve_range(args)
+        results = get_multi_vault_sync_service().sync(start_date, end_date)
+        for message in results['messages']:
+            print(message)
+        for conflict in results['conflicts']:
+            print(f"⚠️ {conflict['date'].isoformat()}: {conflict['winner']} を採用"
+                  f"（内容の異なるVault: {', '.join(conflict['others'])}）")
+        for name, vault in results['vaults'].items():
+            status = f"❌ {vault['error']}" if vault['error'] else f"{vault['notes']}件（読み込み {vault['parsed']}件）"
+            print(f"📁 {name}: {status}")
+        print(f"✅ 取り込み {results['success_count']}件 / 失敗 {results['failed_count']}件", file=sys.stderr)
+        return 1 if results['failed_count'] else 0
+
+    sync_service = get_sync_service()
+    if args.all:
+        dates = sync_service.get_available_daily_notes()
+    else:
+        start_date, end_date = _resolve_range(args, DEFAULT_SYNC_DAYS)
+        dates = list(_iter_dates(start_date, end_date))
+
+    counts = {SYNC_WRITTEN: 0, SYNC_EMPTY: 0, SYNC_MISSING: 0, 'failed': 0}
+    for target_date in dates:
+        status, message = sync_service.sync_daily_note_with_status(target_date)
+        if status in counts:
+            counts[status] += 1
+        else:
+            counts['failed'] += 1
+        # ノートがない日は --verbose のときだけ表示
+        if status != SYNC_MISSING or args.verbose:
+            print(f"{target_date.isoformat()} {status}: {message}")
+
+    print(f"✅ 取り込み {counts[SYNC_WRITTEN]}件 / ログなし {counts[SYNC_EMPTY]}件 / "
+          f"ノートなし {counts[SYNC_MISSING]}件 / 失敗 {counts['failed']}件", file=sys.stderr)
+    return 1 if counts['failed'] else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """記録をObsidianのノートへ出力（内容が変わらないノートは書き込まない）"""
+    from services.registry import get_database_service, get_obsidian_service
+
+    db_service = get_database_service()
+    obsidian_service = get_obsidian_service()
+    start_date, end_date = _resolve_range(args)
+
+    if start_date is None:
+        results = obsidian_service.export_all(db_service)
+    else:
+        results = obsidian_service.export_dates(db_service, list(_iter_dates(start_date, end_date)))
+
+    print(f"✅ 記録 {results['total']}件: 書き込み {results['written']}件 / 変更なし {results['skipped']}件")
+    return 0
+
+
+def cmd_rebuild_rollups(args: argparse.Namespace) -> int:
+    """記録から派生するデータを作り直す"""
+    from database.init_db import backfill_study_sessions
+    from services.registry import get_database_service, get_obsidian_service
+
+    db_service = get_database_service()
+
+    with db_service.get_connection() as conn:
+        added = backfill_study_sessions(conn.cursor())
+    print(f"✅ 学習セッションを補完: {added}件")
+
+    with db_service.get_connection() as conn:
+        removed = conn.execute('DELETE FROM tweet_cache').rowcount
+    print(f"✅ 投稿文キャッシュを削除: {removed}件（次回表示時に再生成。tweet-backfill で事前生成できます）")
+
+    index = get_obsidian_service().index
+    results = index.refresh()
+    print(f"✅ Vaultインデックスを更新: ノート {results['scanned']}件 / "
+          f"読み直し {results['updated']}件 / 削除 {results['removed']}件")
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    """累計・連続日数・週間/月間の集計を表示"""
+    from services.registry import get_database_service
+    from utils.stats import calculate_monthly_stats, calculate_streak, calculate_weekly_stats
+
+    db_service = get_database_service()
+    cumulative = db_service.get_cumulative_stats(as_of=args.as_of)
+    records = db_service.get_all_records()
+    if args.as_of is not None:
+        records = [record for record in records if record.date <= args.as_of]
+
+    summary = {
+        'as_of': (args.as_of or date.today()).isoformat(),
+        'records': len(records),
+        'streak': calculate_streak(records, today=args.as_of),
+        'shindan_total': cumulative.shindan_total,
+        'shindan_goal': cumulative.shindan_goal,
+        'shindan_progress': round(cumulative.shindan_progress, 1),
+        'toukei_total': cumulative.toukei_total,
+        'toukei_goal': cumulative.toukei_goal,
+        'toukei_progress': round(cumulative.toukei_progress, 1),
+        'weekly': calculate_weekly_stats(records, today=args.as_of),
+        'monthly': calculate_monthly_stats(records, today=args.as_of),
+        'subjects': db_service.get_subject_hours(end_date=args.as_of),
+    }
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False))
+        return 0
+
+    print(f"📅 {summary['as_of']} 時点（記録 {summary['records']}件、連続 {summary['streak']}日）")
+    print(f"📘 診断士: {summary['shindan_total']:.1f}h / {summary['shindan_goal']:.0f}h ({summary['shindan_progress']:.1f}%)")
+    print(f"📊 統計検定: {summary['toukei_total']:.1f}h / {summary['toukei_goal']:.0f}h ({summary['toukei_progress']:.1f}%)")
+    print(f"🗓️ 週間: {summary['weekly']['total']:.1f}h / 月間: {summary['monthly']['total']:.1f}h")
+    for subject, hours in summary['subjects'].items():
+        print(f"  {subject}: {hours:.1f}h")
+    return 0
+
+
+def cmd_tweet_backfill(args: argparse.Namespace) -> int:
+    """期間内の投稿文を生成してキャッシュに保存（画面表示時の生成を省く）"""
+    from services.registry import get_database_service, get_tweet_cache
+    from services.tweet_archive import iter_archive
+
+    start_date, end_date = _resolve_range(args)
+    db_service = get_database_service()
+
+    # 生成は services.tweet_archive と同じ1回の走査。キャッシュへの書き込みが
+    # 読み込み中の接続とぶつからないよう、先に読み切る
+    entries = list(iter_archive(db_service, start_date, end_date, args.periods))
+    for entry in entries:
+        print(f"{entry['period']} {entry['key']}")
+
+    count = get_tweet_cache().store_batch(entries, db_service.get_records_updated_since())
+    print(f"✅ {count}件の投稿文をキャッシュしました", file=sys.stderr)
+    return 0
+
+
+def _periods(value: str) -> Sequence[str]:
+    """--periods の値を解析"""
+    periods = [period.strip() for period in value.split(',') if period.strip()]
+    unknown = [period for period in periods if period not in TWEET_PERIODS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"不明な期間: {', '.join(unknown)}")
+    return periods
+
+
+def _add_range_arguments(parser: argparse.ArgumentParser, default_help: str) -> None:
+    """--start / --end を追加"""
+    parser.add_argument('--start', type=date.fromisoformat, help=f"開始日 (YYYY-MM-DD、{default_help})")
+    parser.add_argument('--end', type=date.fromisoformat, help="終了日 (YYYY-MM-DD、既定: 今日)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """引数パーサーを作成"""
+    parser = argparse.ArgumentParser(prog='python -m cli', description="学習記録アプリのコマンドラインツール")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND', required=True)
+
+    sync = subparsers.add_parser('sync', help="Obsidianのデイリーノートから学習ログを取り込む")
+    _add_range_arguments(sync, f"既定: 直近{DEFAULT_SYNC_DAYS}日")
+    sync.add_argument('--all', action='store_true', help="デイリーノートのある全日付を取り込む")
+    sync.add_argument('--multi-vault', action='store_true',
+                      help="vaults.json の全Vaultから前回以降の変更分だけ取り込む（期間省略時は全期間）")
+    sync.add_argument('-v', '--verbose', action='store_true', help="ノートのない日も表示")
+    sync.set_defaults(handler=cmd_sync)
+
+    export = subparsers.add_parser('export', help="記録をObsidianのノートへ出力")
+    _add_range_arguments(export, "省略時は全記録")
+    export.set_defaults(handler=cmd_export)
+
+    rebuild = subparsers.add_parser(
+        'rebuild-rollups', help="学習セッションの補完・投稿文キャッシュの削除・Vaultインデックスの更新"
+    )
+    rebuild.set_defaults(handler=cmd_rebuild_rollups)
+
+    stats = subparsers.add_parser('stats', help="累計・連続日数・科目別時間を表示")
+    stats.add_argument('--as-of', type=date.fromisoformat, help="この日時点で集計 (YYYY-MM-DD、既定: 全期間)")
+    stats.add_argument('--json', action='store_true', help="JSONで出力")
+    stats.set_defaults(handler=cmd_stats)
+
+    backfill = subparsers.add_parser('tweet-backfill', help="期間内の投稿文を生成してキャッシュ")
+    backfill.add_argument('--start', type=date.fromisoformat, required=True, help="開始日 (YYYY-MM-DD)")
+    backfill.add_argument('--end', type=date.fromisoformat, help="終了日 (YYYY-MM-DD、既定: 今日)")
+    backfill.add_argument('--periods', type=_periods, default=list(TWEET_PERIODS),
+                          help="daily,weekly,monthly のカンマ区切り")
+    backfill.set_defaults(handler=cmd_tweet_backfill)
+
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """コマンドライン実行"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    start_date, end_date = getattr(args, 'start', None), getattr(args, 'end', None)
+    if start_date is not None and start_date > (end_date or date.today()):
+        parser.error("開始日は終了日より前の日付を指定してください")
+
+    # 定期実行のログに逐次書き出されるよう行単位でフラッシュ
+    for stream in (sys.stdout, sys.stderr):
+        if hasattr(stream, 'reconfigure'):
+            stream.reconfigure(line_buffering=True)
+
+    handler: Callable[[argparse.Namespace], int] = args.handler
+    started = time.perf_counter()
+    try:
+        _ensure_database()
+        code = handler(args)
+    except KeyboardInterrupt:
+        print("⚠️ 中断しました", file=sys.stderr)
+        return 130
+
+    print(f"⏱️ {args.command}: {time.perf_counter() - started:.2f}秒", file=sys.stderr)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
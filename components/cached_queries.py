@@ -0,0 +1,114 @@
+"""
+DB読み込みのキャッシュ（Streamlit）
+DatabaseService の読み込み結果を st.cache_data に保存し、データの変更カウンタ（data_version）が
+変わるまでは再クエリしない。書き込みがあればカウンタが増えるため、次の読み込みで必ず取り直す
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from models.record import StudyRecord, CumulativeStats
+from services.registry import get_database_service
+
+# 1関数あたりに保持する結果の数（古いバージョンの結果はすぐ使われなくなる）
+MAX_CACHE_ENTRIES = 16
+
+
+def get_data_version() -> int:
+    """現在のデータの変更カウンタ"""
+    return get_database_service().get_data_version()
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _all_records(version: int) -> List[StudyRecord]:
+    return get_database_service().get_all_records()
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _recent_records(version: int, limit: int) -> List[StudyRecord]:
+    return get_database_service().get_recent_records(limit=limit)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _record_by_date(version: int, target_date: date) -> Optional[StudyRecord]:
+    return get_database_service().get_record_by_date(target_date)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _records_page(
+    version: int,
+    before: Optional[date],
+    limit: int,
+    text_filter: str
+) -> Tuple[List[StudyRecord], Optional[date]]:
+    return get_database_service().get_records_page(before, limit, text_filter)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _cumulative_stats(version: int, as_of: Optional[date]) -> CumulativeStats:
+    return get_database_service().get_cumulative_stats(as_of=as_of)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _subjects(version: int) -> List[tuple]:
+    return get_database_service().get_subjects()
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def _subject_hours(
+    version: int,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    include_toukei: bool
+) -> Dict[str, float]:
+    return get_database_service().get_subject_hours(start_date, end_date, include_toukei)
+
+
+def get_all_records(version: Optional[int] = None) -> List[StudyRecord]:
+    """全記録（新しい順）
+
+    Args:
+        version: データの変更カウンタ（同じ描画内で取得済みなら渡す、省略時は読み込む）
+    """
+    return _all_records(get_data_version() if version is None else version)
+
+
+def get_recent_records(limit: int = 5, version: Optional[int] = None) -> List[StudyRecord]:
+    """最近の記録（関連資格を除く）"""
+    return _recent_records(get_data_version() if version is None else version, limit)
+
+
+def get_record_by_date(target_date: date, version: Optional[int] = None) -> Optional[StudyRecord]:
+    """指定日の記録"""
+    return _record_by_date(get_data_version() if version is None else version, target_date)
+
+
+def get_records_page(
+    before: Optional[date] = None,
+    limit: int = 20,
+    text_filter: str = '',
+    version: Optional[int] = None
+) -> Tuple[List[StudyRecord], Optional[date]]:
+    """記録の1ページ分（新しい順）と次のページのカーソル"""
+    return _records_page(get_data_version() if version is None else version, before, limit, text_filter)
+
+
+def get_cumulative_stats(as_of: Optional[date] = None, version: Optional[int] = None) -> CumulativeStats:
+    """累計統計（関連資格を除く）"""
+    return _cumulative_stats(get_data_version() if version is None else version, as_of)
+
+
+def get_subjects(version: Optional[int] = None) -> List[tuple]:
+    """科目マスタ"""
+    return _subjects(get_data_version() if version is None else version)
+
+
+def get_subject_hours(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    include_toukei: bool = False,
+    version: Optional[int] = None
+) -> Dict[str, float]:
+    """科目別の学習時間（関連資格を除く）"""
+    return _subject_hours(get_data_version() if version is None else version, start_date, end_date, include_toukei)
@@ -0,0 +1,67 @@
+"""
+パフォーマンス計測の表示（設定画面）
+utils.perf が記録した直近の描画の区間ごとの所要時間と、DB呼び出しの集計を表示する
+"""
+import streamlit as st
+
+from utils import perf
+
+# DB呼び出しの区間名の接頭辞（services.database.DatabaseService）
+DB_SPAN_PREFIX = 'db.'
+
+# アプリ全体の描画の区間名（app_v3.main）
+RENDER_SPAN = 'render'
+
+
+def _set_enabled() -> None:
+    """トグルの状態を計測に反映"""
+    perf.set_enabled(st.session_state.perf_enabled)
+
+
+def show_perf_hud() -> None:
+    """計測の切り替えと直近の計測結果"""
+    with st.expander("⏱️ パフォーマンス計測", expanded=perf.is_enabled()):
+        if 'perf_enabled' not in st.session_state:
+            st.session_state.perf_enabled = perf.is_enabled()
+        st.toggle(
+            "計測を有効にする",
+            key="perf_enabled",
+            on_change=_set_enabled,
+            help="アプリ全体で有効になります（環境変数 STUDY_APP_PERF=1 で起動時から有効）"
+        )
+        st.caption(f"トレース: `{perf.PERF_TRACE_PATH}`（1行に1回の描画）")
+
+        error = perf.trace_error()
+        if error:
+            st.warning(f"⚠️ トレースを書き込めませんでした: {error}")
+
+        runs = perf.recent_runs()
+        if not runs:
+            st.info("計測結果はまだありません（有効にしてから画面を操作してください）")
+            return
+
+        # 既定はアプリ全体の直近の描画（フラグメントやバックグラウンドのDB呼び出しも選べる）
+        latest_render = next((i for i, run in enumerate(runs) if run['name'] == RENDER_SPAN), 0)
+        selected = st.selectbox(
+            "計測結果",
+            range(len(runs)),
+            index=latest_render,
+            format_func=lambda i: f"{runs[i]['ts'][11:19]}  {runs[i]['name']}  {runs[i]['total_ms']:.0f}ms",
+            key="perf_run"
+        )
+        run = runs[selected if selected is not None and selected < len(runs) else 0]
+
+        db_calls = perf.summarize_calls(run, DB_SPAN_PREFIX)
+        db_ms = sum(entry['ms'] for entry in db_calls)
+        col1, col2, col3 = st.columns(3)
+        col1.metric("合計", f"{run['total_ms']:.0f}ms")
+        col2.metric("DB", f"{db_ms:.0f}ms")
+        col3.metric("DB呼び出し", f"{sum(entry['calls'] for entry in db_calls)}回")
+
+        st.code(perf.format_run(run), language=None)
+
+        if db_calls:
+            lines = ["| 呼び出し | 回数 | 時間(ms) | 行数 |", "|---|---:|---:|---:|"]
+            for entry in db_calls:
+                lines.append(f"| {entry['name'][len(DB_SPAN_PREFIX):]} | {entry['calls']} | {entry['ms']:.1f} | {entry['rows']} |")
+            st.markdown('\n'.join(lines))
@@ -5,21 +5,22 @@ import streamlit as st
 import pandas as pd
 from datetime import date, datetime, timedelta
 from urllib.parse import quote
-import pyperclip
 
-from services.database import DatabaseService
-from services.tweet import TweetService
+from services.registry import get_tweet_cache
+from utils.clipboard import ClipboardError, copy_to_clipboard
 from utils.subjects import format_subject_with_emoji
 from components.tweet_char_counter import show_char_counter
 
 
-def show_weekly_review():
-    """週次レビュー画面"""
+def show_weekly_review(snapshot):
+    """週次レビュー画面
+
+    Args:
+        snapshot: 描画ごとのデータ（components.snapshot.DashboardSnapshot）
+    """
     st.markdown("### 📅 今週の振り返り")
     st.caption("週単位で学習状況を確認し、投稿文を生成できます")
 
-    db_service = DatabaseService()
-
     # 今週の開始日・終了日を計算（月曜始まり）
     today = date.today()
     weekday = today.weekday()  # 0=月曜, 6=日曜
@@ -41,27 +42,17 @@ def show_weekly_review():
             key="weekly_end"
         )
 
-    # 期間内のレコードを取得
-    all_records = db_service.get_all_records()
-
-    # 期間でフィルタリング
-    period_records = [
-        r for r in all_records
-        if start_date <= r.date <= end_date and r.phase != '関連資格'
-    ]
+    # 期間内のレコード（関連資格を除く）
+    period_records = snapshot.records_between(start_date, end_date)
 
     # 統計計算
     weekly_stats = {
         'total_shindan': sum(r.shindan_time for r in period_records),
         'total_toukei': sum(r.toukei_time for r in period_records),
-        'subject_hours': {}
+        # 科目別集計（1日に複数科目があっても科目ごとに正確に集計）
+        'subject_hours': snapshot.subject_hours(start_date, end_date)
     }
 
-    # 科目別集計
-    for record in period_records:
-        if record.shindan_time > 0 and record.shindan_subject:
-            subject = record.shindan_subject
-            weekly_stats['subject_hours'][subject] = weekly_stats['subject_hours'].get(subject, 0) + record.shindan_time
 
     # サマリーカード
     st.markdown("### 📊 週間サマリー")
@@ -117,16 +108,8 @@ def show_weekly_review():
     st.markdown("### 🐦 週次投稿文を生成")
 
     if st.button("📱 週次投稿文を生成", key="generate_weekly_tweet", type="primary", use_container_width=True):
-        # フェーズを取得（最新の記録から）
-        records = db_service.get_recent_records(limit=1)
-        phase = records[0].phase if records else "基礎固め期"
-
-        tweet_text = TweetService.generate_weekly_tweet(
-            weekly_stats=weekly_stats['subject_hours'],
-            total_shindan=weekly_stats['total_shindan'],
-            total_toukei=weekly_stats['total_toukei'],
-            phase=phase
-        )
+        # 投稿文はキャッシュから取得（期間内の記録が保存されると再生成）
+        tweet_text = get_tweet_cache().get_weekly_tweet(start_date, end_date)
 
         st.text_area(
             "生成された投稿文",
@@ -146,19 +129,21 @@ def show_weekly_review():
         with col2:
             if st.button("📋 コピー", key="copy_weekly_tweet", use_container_width=True):
                 try:
-                    pyperclip.copy(tweet_text)
+                    copy_to_clipboard(tweet_text)
                     st.toast("✅ コピーしました！", icon="✅")
-                except (pyperclip.PyperclipException, Exception) as e:
+                except (ClipboardError, Exception) as e:
                     st.error(f"⚠️ コピーに失敗: {type(e).__name__}")
 
 
-def show_monthly_review():
-    """月次レビュー画面"""
+def show_monthly_review(snapshot):
+    """月次レビュー画面
+
+    Args:
+        snapshot: 描画ごとのデータ（components.snapshot.DashboardSnapshot）
+    """
     st.markdown("### 📆 今月の振り返り")
     st.caption("月単位で学習状況を確認し、投稿文を生成できます")
 
-    db_service = DatabaseService()
-
     # 今月の開始日・終了日
     today = date.today()
     month_start = date(today.year, today.month, 1)
@@ -184,29 +169,19 @@ def show_monthly_review():
             key="monthly_end"
         )
 
-    # 期間内のレコードを取得
-    all_records = db_service.get_all_records()
-
-    # 期間でフィルタリング
-    period_records = [
-        r for r in all_records
-        if start_date <= r.date <= end_date and r.phase != '関連資格'
-    ]
+    # 期間内のレコード（関連資格を除く）
+    period_records = snapshot.records_between(start_date, end_date)
 
     # 統計計算
     monthly_stats = {
         'total_shindan': sum(r.shindan_time for r in period_records),
         'total_toukei': sum(r.toukei_time for r in period_records),
-        'subject_hours': {}
+        # 科目別集計（1日に複数科目があっても科目ごとに正確に集計）
+        'subject_hours': snapshot.subject_hours(start_date, end_date)
     }
 
-    # 科目別集計
-    for record in period_records:
-        if record.shindan_time > 0 and record.shindan_subject:
-            subject = record.shindan_subject
-            monthly_stats['subject_hours'][subject] = monthly_stats['subject_hours'].get(subject, 0) + record.shindan_time
 
-    cumulative_stats = db_service.get_cumulative_stats()
+    cumulative_stats = snapshot.stats
 
     # サマリーカード
     st.markdown("### 📊 月間サマリー")
@@ -276,19 +251,8 @@ def show_monthly_review():
     st.markdown("### 🐦 月次投稿文を生成")
 
     if st.button("📱 月次投稿文を生成", key="generate_monthly_tweet", type="primary", use_container_width=True):
-        # フェーズを取得
-        records = db_service.get_recent_records(limit=1)
-        phase = records[0].phase if records else "基礎固め期"
-
-        tweet_text = TweetService.generate_monthly_tweet(
-            monthly_stats=monthly_stats['subject_hours'],
-            total_shindan=monthly_stats['total_shindan'],
-            total_toukei=monthly_stats['total_toukei'],
-            cumulative_shindan=cumulative_stats.shindan_total,
-            shindan_goal=cumulative_stats.shindan_goal,
-            progress=cumulative_stats.shindan_progress,
-            phase=phase
-        )
+        # 投稿文はキャッシュから取得（累計は期間最終日時点）
+        tweet_text = get_tweet_cache().get_monthly_tweet(start_date, end_date)
 
         st.text_area(
             "生成された投稿文",
@@ -308,7 +272,7 @@ def show_monthly_review():
         with col2:
             if st.button("📋 コピー", key="copy_monthly_tweet", use_container_width=True):
                 try:
-                    pyperclip.copy(tweet_text)
+                    copy_to_clipboard(tweet_text)
                     st.toast("✅ コピーしました！", icon="✅")
-                except (pyperclip.PyperclipException, Exception) as e:
+                except (ClipboardError, Exception) as e:
                     st.error(f"⚠️ コピーに失敗: {type(e).__name__}")
@@ -2,10 +2,76 @@
 学習ロードマップコンポーネント（完全再設計版）
 過去の成果を称え、現在のフェーズを明確にし、未来への道筋を示す
 """
-import streamlit as st
-import pandas as pd
+import hashlib
 from datetime import date, timedelta
-import plotly.graph_objects as go
+
+import streamlit as st
+
+from utils.perf import timed
+
+# 重要な日付
+ROADMAP_START = date(2026, 1, 1)      # 診断士学習開始
+TOUKEI_EXAM = date(2026, 2, 1)        # 統計検定試験
+SHINDAN_1ST_EXAM = date(2026, 8, 5)   # 診断士1次試験
+SHINDAN_2ND_EXAM = date(2026, 10, 25) # 診断士2次試験
+ROADMAP_END = SHINDAN_2ND_EXAM
+
+# フェーズ定義（1次試験まで + 2次試験）
+ROADMAP_PHASES = (
+    {
+        'name': '基礎固め期',
+        'start': date(2026, 1, 1),
+        'end': date(2026, 3, 31),
+        'color': '#4ecdc4',
+        'goal_hours': 240,
+        'description': '全科目1周完了、基礎問題70%以上'
+    },
+    {
+        'name': '応用力強化期',
+        'start': date(2026, 4, 1),
+        'end': date(2026, 5, 31),
+        'color': '#ff6b6b',
+        'goal_hours': 400,
+        'description': '過去問3年分完了、過去問60点以上'
+    },
+    {
+        'name': '直前追い込み期',
+        'start': date(2026, 6, 1),
+        'end': SHINDAN_1ST_EXAM,
+        'color': '#ffd93d',
+        'goal_hours': 570,
+        'description': '模試420点以上 (×3回)、弱点完全克服'
+    },
+    {
+        'name': '2次試験対策',
+        'start': date(2026, 8, 6),
+        'end': SHINDAN_2ND_EXAM,
+        'color': '#9370DB',
+        'goal_hours': 240,
+        'description': '事例演習80問完了、各事例60点以上安定'
+    },
+)
+
+# 月末ベンチマーク (1次試験合計570h ÷ 7ヶ月 ≒ 80h/月)
+MONTHLY_BENCHMARKS = (
+    {'date': date(2026, 1, 31), 'shindan_h': 80, 'label': '1月末\n目標80h'},
+    {'date': date(2026, 2, 28), 'shindan_h': 160, 'label': '2月末\n目標160h'},
+    {'date': date(2026, 3, 31), 'shindan_h': 240, 'label': '3月末\n目標240h'},
+    {'date': date(2026, 4, 30), 'shindan_h': 320, 'label': '4月末\n目標320h'},
+    {'date': date(2026, 5, 31), 'shindan_h': 400, 'label': '5月末\n目標400h'},
+    {'date': date(2026, 6, 30), 'shindan_h': 485, 'label': '6月末\n目標485h'},
+    {'date': date(2026, 7, 31), 'shindan_h': 570, 'label': '7月末\n目標570h'},
+)
+
+# 試験日マーカー
+EXAM_MARKERS = (
+    {'name': '統計検定2級', 'date': TOUKEI_EXAM, 'color': '#4169E1', 'width': 3, 'font_color': 'white'},
+    {'name': '診断士1次試験', 'date': SHINDAN_1ST_EXAM, 'color': '#FFD700', 'width': 4, 'font_color': '#2C2C2C'},
+    {'name': '診断士2次試験', 'date': SHINDAN_2ND_EXAM, 'color': '#9370DB', 'width': 4, 'font_color': 'white'},
+)
+
+# ロードマップのY軸の範囲（フェーズの帯が 0〜1、上下に注釈）
+ROADMAP_Y_RANGE = (-0.25, 1.4)
 
 
 def show_learning_journey_summary(db_service, all_records):
@@ -81,132 +147,55 @@ def show_learning_journey_summary(db_service, all_records):
             """, unsafe_allow_html=True)
 
 
-def show_roadmap():
-    """学習ロードマップを表示（シンプル版）"""
-    st.subheader("🗺️ 学習ロードマップ")
+def _rgba(hex_color: str, alpha: float) -> str:
+    """#RRGGBB → rgba()"""
+    return f'rgba({int(hex_color[1:3], 16)}, {int(hex_color[3:5], 16)}, {int(hex_color[5:7], 16)}, {alpha})'
 
-    # 重要な日付
-    shindan_start = date(2026, 1, 1)      # 診断士学習開始
-    toukei_exam = date(2026, 2, 1)        # 統計検定試験
-    shindan_1st_exam = date(2026, 8, 5)   # 診断士1次試験
-    shindan_2nd_exam = date(2026, 10, 25) # 診断士2次試験
 
-    today = date.today()
+def _roadmap_config_version() -> str:
+    """ロードマップ定義のバージョン（定義を変更すると静的な図を作り直す）"""
+    definition = (ROADMAP_START, ROADMAP_END, ROADMAP_PHASES, MONTHLY_BENCHMARKS, EXAM_MARKERS)
+    return hashlib.sha256(repr(definition).encode('utf-8')).hexdigest()[:16]
 
-    # フェーズ定義（1次試験まで）
-    phases_1st = [
-        {
-            'name': '基礎固め期',
-            'start': date(2026, 1, 1),
-            'end': date(2026, 3, 31),
-            'color': '#4ecdc4',
-            'goal_hours': 240,
-            'description': '全科目1周完了、基礎問題70%以上'
-        },
-        {
-            'name': '応用力強化期',
-            'start': date(2026, 4, 1),
-            'end': date(2026, 5, 31),
-            'color': '#ff6b6b',
-            'goal_hours': 400,
-            'description': '過去問3年分完了、過去問60点以上'
-        },
-        {
-            'name': '直前追い込み期',
-            'start': date(2026, 6, 1),
-            'end': shindan_1st_exam,
-            'color': '#ffd93d',
-            'goal_hours': 570,
-            'description': '模試420点以上 (×3回)、弱点完全克服'
-        }
-    ]
-
-    # 2次試験フェーズ
-    phase_2nd = {
-        'name': '2次試験対策',
-        'start': date(2026, 8, 6),
-        'end': shindan_2nd_exam,
-        'color': '#9370DB',
-        'goal_hours': 240,
-        'description': '事例演習80問完了、各事例60点以上安定'
-    }
-
-    # Plotlyでロードマップ作成
-    fig = go.Figure()
-
-    # 1次試験フェーズの背景色
-    for phase in phases_1st:
-        fig.add_shape(
-            type="rect",
-            x0=phase['start'],
-            x1=phase['end'],
-            y0=0,
-            y1=1,
-            fillcolor=phase['color'],
-            opacity=0.25,
-            line_width=0,
-        )
-
-        mid_date = phase['start'] + (phase['end'] - phase['start']) / 2
-        fig.add_annotation(
-            x=mid_date,
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def _static_roadmap_figure(config_version: str) -> dict:
+    """日付に依存しない部分（フェーズ・ベンチマーク・試験日）の図をシリアライズして返す
+
+    定義が変わらない限り1回だけ作成する。戻り値はキャッシュのコピーなので、
+    呼び出し側で今日の位置や実績を追加してよい。
+    """
+    # Plotly は読み込みが重いため、図を作るときだけ読み込む
+    import plotly.graph_objects as go
+
+    shapes = []
+    annotations = []
+
+    # フェーズの背景色
+    for phase in ROADMAP_PHASES:
+        shapes.append(dict(
+            type="rect", x0=phase['start'], x1=phase['end'], y0=0, y1=1,
+            fillcolor=phase['color'], opacity=0.25, line_width=0,
+        ))
+        annotations.append(dict(
+            x=phase['start'] + (phase['end'] - phase['start']) / 2,
             y=0.5,
             text=f"<b>{phase['name']}</b>",
             showarrow=False,
             font=dict(size=14, color='white', family="Arial Black"),
-            bgcolor=f'rgba({int(phase["color"][1:3], 16)}, {int(phase["color"][3:5], 16)}, {int(phase["color"][5:7], 16)}, 0.85)',
+            bgcolor=_rgba(phase['color'], 0.85),
             bordercolor=phase['color'],
             borderwidth=2,
             borderpad=8
-        )
-
-    # 2次試験フェーズの背景色
-    fig.add_shape(
-        type="rect",
-        x0=phase_2nd['start'],
-        x1=phase_2nd['end'],
-        y0=0,
-        y1=1,
-        fillcolor=phase_2nd['color'],
-        opacity=0.25,
-        line_width=0,
-    )
+        ))
 
-    mid_date_2nd = phase_2nd['start'] + (phase_2nd['end'] - phase_2nd['start']) / 2
-    fig.add_annotation(
-        x=mid_date_2nd,
-        y=0.5,
-        text=f"<b>{phase_2nd['name']}</b>",
-        showarrow=False,
-        font=dict(size=14, color='white', family="Arial Black"),
-        bgcolor=f'rgba({int(phase_2nd["color"][1:3], 16)}, {int(phase_2nd["color"][3:5], 16)}, {int(phase_2nd["color"][5:7], 16)}, 0.85)',
-        bordercolor=phase_2nd['color'],
-        borderwidth=2,
-        borderpad=8
-    )
-
-    # 月末ベンチマーク (1次試験合計570h ÷ 7ヶ月 ≒ 80h/月)
-    monthly_benchmarks = [
-        {'date': date(2026, 1, 31), 'shindan_h': 80, 'label': '1月末\n目標80h'},
-        {'date': date(2026, 2, 28), 'shindan_h': 160, 'label': '2月末\n目標160h'},
-        {'date': date(2026, 3, 31), 'shindan_h': 240, 'label': '3月末\n目標240h'},
-        {'date': date(2026, 4, 30), 'shindan_h': 320, 'label': '4月末\n目標320h'},
-        {'date': date(2026, 5, 31), 'shindan_h': 400, 'label': '5月末\n目標400h'},
-        {'date': date(2026, 6, 30), 'shindan_h': 485, 'label': '6月末\n目標485h'},
-        {'date': date(2026, 7, 31), 'shindan_h': 570, 'label': '7月末\n目標570h'},
-    ]
-
-    for benchmark in monthly_benchmarks:
-        fig.add_shape(
-            type="line",
-            x0=benchmark['date'],
-            x1=benchmark['date'],
-            y0=0,
-            y1=1,
+    # 月末ベンチマーク
+    for benchmark in MONTHLY_BENCHMARKS:
+        shapes.append(dict(
+            type="line", x0=benchmark['date'], x1=benchmark['date'], y0=0, y1=1,
             line=dict(color="rgba(255, 255, 255, 0.3)", width=1, dash="dot")
-        )
-
-        fig.add_annotation(
+        ))
+        annotations.append(dict(
             x=benchmark['date'],
             y=1.12,
             text=f"<b>{benchmark['label']}</b>",
@@ -216,105 +205,42 @@ def show_roadmap():
             bordercolor='rgba(255, 255, 255, 0.2)',
             borderwidth=1,
             borderpad=3
-        )
-
-    # 今日の位置
-    fig.add_shape(
-        type="line",
-        x0=today,
-        x1=today,
-        y0=-0.05,
-        y1=1.05,
-        line=dict(color="#FF6B6B", width=4)
-    )
-
-    fig.add_annotation(
-        x=today,
-        y=1.25,
-        text=f"<b>TODAY</b><br>{today.strftime('%m/%d')}",
-        showarrow=True,
-        arrowhead=3,
-        arrowsize=1.5,
-        arrowwidth=2,
-        arrowcolor="#FF6B6B",
-        ax=0,
-        ay=-40,
-        font=dict(size=12, color='white', family="Arial Black"),
-        bgcolor="#FF6B6B",
-        bordercolor="white",
-        borderwidth=2,
-        borderpad=6
-    )
+        ))
 
     # 試験日マーカー
-    # 統計検定
-    fig.add_shape(
-        type="line",
-        x0=toukei_exam,
-        x1=toukei_exam,
-        y0=0,
-        y1=1,
-        line=dict(color="#4169E1", width=3, dash="solid")
-    )
-
-    fig.add_annotation(
-        x=toukei_exam,
-        y=-0.15,
-        text=f"<b>統計検定2級</b><br>{toukei_exam.strftime('%m/%d')}",
-        showarrow=False,
-        font=dict(size=11, color='white', family="Arial Black"),
-        bgcolor="#4169E1",
-        bordercolor='white',
-        borderwidth=2,
-        borderpad=5
-    )
-
-    # 診断士1次試験
-    fig.add_shape(
-        type="line",
-        x0=shindan_1st_exam,
-        x1=shindan_1st_exam,
-        y0=0,
-        y1=1,
-        line=dict(color="#FFD700", width=4, dash="solid")
-    )
-
-    fig.add_annotation(
-        x=shindan_1st_exam,
-        y=-0.15,
-        text=f"<b>診断士1次試験</b><br>{shindan_1st_exam.strftime('%m/%d')}",
-        showarrow=False,
-        font=dict(size=11, color='#2C2C2C', family="Arial Black"),
-        bgcolor="#FFD700",
-        bordercolor='white',
-        borderwidth=2,
-        borderpad=5
-    )
-
-    # 診断士2次試験
-    fig.add_shape(
-        type="line",
-        x0=shindan_2nd_exam,
-        x1=shindan_2nd_exam,
-        y0=0,
-        y1=1,
-        line=dict(color="#9370DB", width=4, dash="solid")
-    )
-
-    fig.add_annotation(
-        x=shindan_2nd_exam,
-        y=-0.15,
-        text=f"<b>診断士2次試験</b><br>{shindan_2nd_exam.strftime('%m/%d')}",
-        showarrow=False,
-        font=dict(size=11, color='white', family="Arial Black"),
-        bgcolor="#9370DB",
-        bordercolor='white',
-        borderwidth=2,
-        borderpad=5
+    for marker in EXAM_MARKERS:
+        shapes.append(dict(
+            type="line", x0=marker['date'], x1=marker['date'], y0=0, y1=1,
+            line=dict(color=marker['color'], width=marker['width'], dash="solid")
+        ))
+        annotations.append(dict(
+            x=marker['date'],
+            y=-0.15,
+            text=f"<b>{marker['name']}</b><br>{marker['date'].strftime('%m/%d')}",
+            showarrow=False,
+            font=dict(size=11, color=marker['font_color'], family="Arial Black"),
+            bgcolor=marker['color'],
+            bordercolor='white',
+            borderwidth=2,
+            borderpad=5
+        ))
+
+    # 診断士の累計目標（実績は描画時に重ねる）
+    target_trace = go.Scatter(
+        x=[ROADMAP_START] + [b['date'] for b in MONTHLY_BENCHMARKS],
+        y=[0] + [b['shindan_h'] for b in MONTHLY_BENCHMARKS],
+        name='累計目標',
+        mode='lines+markers',
+        line=dict(color='rgba(255, 255, 255, 0.5)', width=2, dash='dash'),
+        marker=dict(size=5),
+        yaxis='y2',
+        hovertemplate='%{x|%m/%d} 目標 %{y:.0f}h<extra></extra>'
     )
 
-    # レイアウト設定
+    fig = go.Figure(data=[target_trace])
     fig.update_layout(
+        shapes=shapes,
+        annotations=annotations,
         xaxis=dict(
             title="<b>日付</b>",
             title_font=dict(size=14, color='#E0E0E0'),
@@ -324,29 +250,114 @@ def show_roadmap():
             showgrid=True,
             gridcolor='rgba(255, 255, 255, 0.1)',
             gridwidth=1,
-            range=[shindan_start - timedelta(days=5), shindan_2nd_exam + timedelta(days=10)],
+            range=[ROADMAP_START - timedelta(days=5), ROADMAP_END + timedelta(days=10)],
             tickfont=dict(color='#B0B0B0')
         ),
         yaxis=dict(
             showticklabels=False,
-            range=[-0.25, 1.4],
+            range=list(ROADMAP_Y_RANGE),
             showgrid=False
         ),
+        # 累計時間の軸（帯の 0〜1 に 0h〜最大時間が重なるよう範囲は描画時に設定）
+        yaxis2=dict(
+            overlaying='y',
+            side='right',
+            showgrid=False,
+            ticksuffix='h',
+            tickfont=dict(color='#B0B0B0', size=10)
+        ),
         height=400,
-        margin=dict(l=30, r=30, t=50, b=110),
+        margin=dict(l=30, r=50, t=50, b=110),
         showlegend=False,
         plot_bgcolor='rgba(30, 30, 30, 0.5)',
         paper_bgcolor='rgba(0, 0, 0, 0)'
     )
 
-    st.plotly_chart(fig, use_container_width=True)
+    return fig.to_plotly_json()
+
+
+def _add_dynamic_layer(figure: dict, today: date, cumulative_series: list) -> dict:
+    """静的な図に今日の位置と診断士の累計実績を追加
+
+    Args:
+        figure: _static_roadmap_figure() の戻り値（コピー）
+        today: 今日の日付
+        cumulative_series: [(日付, 診断士累計, 統計累計), ...]（日付の昇順）
+    """
+    import numpy as np
+    from utils.downsample import downsample_indices, to_numeric_dates
+
+    layout = figure['layout']
+
+    # 今日の位置
+    layout['shapes'].append(dict(
+        type="line", x0=today, x1=today, y0=-0.05, y1=1.05,
+        line=dict(color="#FF6B6B", width=4)
+    ))
+    layout['annotations'].append(dict(
+        x=today,
+        y=1.25,
+        text=f"<b>TODAY</b><br>{today.strftime('%m/%d')}",
+        showarrow=True,
+        arrowhead=3,
+        arrowsize=1.5,
+        arrowwidth=2,
+        arrowcolor="#FF6B6B",
+        ax=0,
+        ay=-40,
+        font=dict(size=12, color='white', family="Arial Black"),
+        bgcolor="#FF6B6B",
+        bordercolor="white",
+        borderwidth=2,
+        borderpad=6
+    ))
+
+    # 累計実績（ロードマップ期間内のみ）
+    points = [(d, shindan) for d, shindan, _ in cumulative_series if d >= ROADMAP_START]
+    max_hours = max(b['shindan_h'] for b in MONTHLY_BENCHMARKS)
+    if points:
+        max_hours = max(max_hours, max(shindan for _, shindan in points))
+        dates = [d for d, _ in points]
+        hours = np.array([shindan for _, shindan in points], dtype=float)
+        keep = downsample_indices(to_numeric_dates(dates), [hours])
+        figure['data'].append(dict(
+            type='scatter',
+            x=[dates[i] for i in keep],
+            y=hours[keep].tolist(),
+            name='累計実績',
+            mode='lines',
+            line=dict(color='#4ECDC4', width=3),
+            yaxis='y2',
+            hovertemplate='%{x|%m/%d} 実績 %{y:.1f}h<extra></extra>'
+        ))
+
+    y_min, y_max = ROADMAP_Y_RANGE
+    layout['yaxis2']['range'] = [y_min * max_hours, y_max * max_hours]
+    return figure
+
+
+def show_roadmap(snapshot):
+    """学習ロードマップを表示（シンプル版）
+
+    Args:
+        snapshot: 描画ごとのデータ（components.snapshot.DashboardSnapshot）
+    """
+    st.subheader("🗺️ 学習ロードマップ")
+
+    today = date.today()
+
+    with timed('roadmap.figure'):
+        figure = _static_roadmap_figure(_roadmap_config_version())
+        figure = _add_dynamic_layer(figure, today, snapshot.cumulative_series())
+    with timed('roadmap.plotly_chart'):
+        st.plotly_chart(figure, use_container_width=True)
 
     # 現在フェーズの詳細情報（コンパクトに）
     st.markdown("### 📅 現在のフェーズ")
 
     # 現在どのフェーズにいるか判定
     current_phase = None
-    all_phases = phases_1st + [phase_2nd]
+    all_phases = ROADMAP_PHASES
 
     for phase in all_phases:
         if phase['start'] <= today <= phase['end']:
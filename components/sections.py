@@ -0,0 +1,52 @@
+"""
+ダッシュボードの遅延描画セクション
+st.expander は閉じていても中身を実行するため、開いたときだけ描画する
+セクションを st.fragment で実装する（セクション内の操作はそのセクションだけ再実行）
+"""
+import importlib
+from typing import Callable
+
+import streamlit as st
+
+from utils.perf import timed
+
+
+@st.fragment
+def show_lazy_section(key: str, title: str, render: Callable, *args, expanded: bool = False) -> None:
+    """開いているときだけ中身を描画するセクション
+
+    開閉やセクション内のウィジェット操作ではこのフラグメントだけが再実行される。
+    args はフル再実行時の値が使われるため、データを書き換える操作を含む
+    セクションでは完了後に st.rerun() でアプリ全体を再実行すること。
+
+    Args:
+        key: セクションの識別子（開閉状態の保存に使用）
+        title: 見出し
+        render: 中身を描画する関数
+        *args: render に渡す引数
+        expanded: 初期状態で開くか
+    """
+    opened = st.toggle(title, value=expanded, key=f"section_open_{key}")
+    if not opened:
+        return
+
+    with st.container(border=True), timed(f"section.{key}"):
+        render(*args)
+
+
+def lazy_component(module_name: str, function_name: str) -> Callable:
+    """呼ばれたときに初めてモジュールを読み込むコンポーネント関数
+
+    pandas や Plotly を使うコンポーネントを、セクションを開くまで読み込まないために使う
+
+    Args:
+        module_name: モジュール名（例: 'components.roadmap'）
+        function_name: 描画関数の名前
+    """
+    def render(*args, **kwargs):
+        with timed(f"component.{function_name}"):
+            return getattr(importlib.import_module(module_name), function_name)(*args, **kwargs)
+
+    render.__name__ = function_name
+    render.__qualname__ = function_name
+    return render
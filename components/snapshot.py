@@ -0,0 +1,96 @@
+"""
+描画1回分のデータスナップショット
+main() の先頭で1回だけ読み込み、ダッシュボードの各コンポーネントに渡す
+（各コンポーネントが個別に全件を読み込まない）
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+
+from components.cached_queries import (
+    get_all_records,
+    get_cumulative_stats,
+    get_data_version,
+    get_records_page,
+    get_subject_hours,
+    get_subjects,
+)
+from models.record import StudyRecord, CumulativeStats
+from utils.cumulative import CumulativeIndex
+
+
+@dataclass
+class DashboardSnapshot:
+    """描画1回分のデータ"""
+    version: int                    # データの変更カウンタ（追加の読み込みもこのバージョンで行う）
+    all_records: List[StudyRecord]  # 全記録（新しい順）
+    stats: CumulativeStats          # 累計統計
+
+    _by_date: Optional[Dict[date, StudyRecord]] = field(default=None, repr=False)
+    _cumulative: Optional[List[Tuple[date, float, float]]] = field(default=None, repr=False)
+
+    @property
+    def record_count(self) -> int:
+        """記録数"""
+        return len(self.all_records)
+
+    def record_by_date(self, target_date: date) -> Optional[StudyRecord]:
+        """指定日の記録"""
+        if self._by_date is None:
+            self._by_date = {record.date: record for record in self.all_records}
+        return self._by_date.get(target_date)
+
+    def recent_records(self, limit: int = 5) -> List[StudyRecord]:
+        """最近の記録（関連資格を除く）"""
+        recent = []
+        for record in self.all_records:
+            if record.phase != '関連資格':
+                recent.append(record)
+                if len(recent) >= limit:
+                    break
+        return recent
+
+    def records_between(self, start_date: date, end_date: date) -> List[StudyRecord]:
+        """期間内の記録（関連資格を除く）"""
+        return [
+            record for record in self.all_records
+            if start_date <= record.date <= end_date and record.phase != '関連資格'
+        ]
+
+    def cumulative_series(self) -> List[Tuple[date, float, float]]:
+        """日付ごとの累計 [(日付, 診断士累計, 統計累計), ...]（日付の昇順、関連資格を除く）"""
+        if self._cumulative is None:
+            self._cumulative = CumulativeIndex.from_records(reversed(self.all_records)).series()
+        return self._cumulative
+
+    def records_page(
+        self,
+        before: Optional[date] = None,
+        limit: int = 20,
+        text_filter: str = ''
+    ) -> Tuple[List[StudyRecord], Optional[date]]:
+        """記録の1ページ分（新しい順）と次のページのカーソル（DBから1ページ分だけ取得）"""
+        return get_records_page(before, limit, text_filter, version=self.version)
+
+    def subject_hours(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_toukei: bool = False
+    ) -> Dict[str, float]:
+        """科目別の学習時間（関連資格を除く）"""
+        return get_subject_hours(start_date, end_date, include_toukei, version=self.version)
+
+    def subjects(self) -> List[tuple]:
+        """科目マスタ"""
+        return get_subjects(version=self.version)
+
+
+def load_snapshot() -> DashboardSnapshot:
+    """現在のデータのスナップショットを読み込む（変更がなければキャッシュから）"""
+    version = get_data_version()
+    return DashboardSnapshot(
+        version=version,
+        all_records=get_all_records(version=version),
+        stats=get_cumulative_stats(version=version),
+    )
@@ -3,11 +3,15 @@
 """
 import streamlit as st
 from typing import List, Dict
-import pandas as pd
 
 
-def show_subject_progress_by_category(db_service, all_records):
-    """カテゴリ別（1次/2次）科目進捗を表示"""
+def show_subject_progress_by_category(db_service, snapshot):
+    """カテゴリ別（1次/2次）科目進捗を表示
+
+    Args:
+        db_service: DatabaseService
+        snapshot: 描画ごとのデータ（components.snapshot.DashboardSnapshot）
+    """
     st.subheader("📚 科目別進捗")
 
     # 全科目情報を取得（関連資格を除外）
@@ -21,13 +25,8 @@ def show_subject_progress_by_category(db_service, all_records):
         ''')
         subjects_data = cursor.fetchall()
 
-    # 科目別の学習時間を集計
-    subject_hours = {}
-    for record in all_records:
-        if record.shindan_subject and record.shindan_time > 0:
-            if record.shindan_subject not in subject_hours:
-                subject_hours[record.shindan_subject] = 0
-            subject_hours[record.shindan_subject] += record.shindan_time
+    # 科目別の学習時間を集計（study_sessions から1クエリで取得）
+    subject_hours = snapshot.subject_hours()
 
     # カテゴリ別に分類
     first_exam_subjects = []
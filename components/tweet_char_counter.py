@@ -1,10 +1,14 @@
 """
 X投稿文の文字数カウンター共通コンポーネント
+X と同じ重み付き文字数（日本語は1文字2、URLは23）で数える
 """
 import streamlit as st
 
-# 定数
-TWEET_CHAR_LIMIT = 140
+from config.constants import TWEET_WEIGHTED_LIMIT
+from utils.tweet_length import weighted_length
+
+# 残りがこれ以下なら警告（全角10文字相当）
+WARNING_MARGIN = 40
 
 
 def show_char_counter(tweet_text: str) -> None:
@@ -14,17 +18,19 @@ def show_char_counter(tweet_text: str) -> None:
     Args:
         tweet_text: 投稿文のテキスト
     """
-    char_count = len(tweet_text)
-    char_percentage = min((char_count / TWEET_CHAR_LIMIT) * 100, 100)
+    weight = weighted_length(tweet_text)
+    char_percentage = min((weight / TWEET_WEIGHTED_LIMIT) * 100, 100)
 
     st.markdown("**文字数チェック**")
 
-    if char_count > TWEET_CHAR_LIMIT:
+    if weight > TWEET_WEIGHTED_LIMIT:
         st.progress(int(char_percentage))
-        st.error(f"⚠️ {char_count - TWEET_CHAR_LIMIT}文字オーバー（{char_count}/{TWEET_CHAR_LIMIT}）")
-    elif char_count > 120:
+        st.error(f"⚠️ {weight - TWEET_WEIGHTED_LIMIT}オーバー（{weight}/{TWEET_WEIGHTED_LIMIT}）")
+    elif weight > TWEET_WEIGHTED_LIMIT - WARNING_MARGIN:
         st.progress(int(char_percentage))
-        st.warning(f"⚠️ 残り{TWEET_CHAR_LIMIT - char_count}文字（{char_count}/{TWEET_CHAR_LIMIT}）")
+        st.warning(f"⚠️ 残り{TWEET_WEIGHTED_LIMIT - weight}（{weight}/{TWEET_WEIGHTED_LIMIT}）")
     else:
         st.progress(int(char_percentage))
-        st.success(f"✅ {char_count}/{TWEET_CHAR_LIMIT}文字")
+        st.success(f"✅ {weight}/{TWEET_WEIGHTED_LIMIT}")
+
+    st.caption("X の数え方: 日本語・絵文字は1文字2、半角英数は1、URLは23")
@@ -11,6 +11,9 @@ from .constants import (
     TOUKEI_GOAL_HOURS,
     STUDY_START_DATE,
     TWEET_CHAR_LIMIT,
+    TWEET_WEIGHTED_LIMIT,
+    TWEET_URL_WEIGHT,
+    CHART_MAX_POINTS,
     PHASE_FOUNDATION,
     PHASE_APPLICATION,
     PHASE_INTENSIVE,
@@ -28,6 +31,9 @@ __all__ = [
     'TOUKEI_GOAL_HOURS',
     'STUDY_START_DATE',
     'TWEET_CHAR_LIMIT',
+    'TWEET_WEIGHTED_LIMIT',
+    'TWEET_URL_WEIGHT',
+    'CHART_MAX_POINTS',
     'PHASE_FOUNDATION',
     'PHASE_APPLICATION',
     'PHASE_INTENSIVE',
@@ -19,6 +19,11 @@ STUDY_START_DATE = date(2025, 10, 12)  # Day番号計算の基準日
 
 # ==================== X投稿設定 ====================
 TWEET_CHAR_LIMIT = 140  # X投稿の文字数制限（日本語短文）
+TWEET_WEIGHTED_LIMIT = 280  # X投稿の重み付き文字数上限（日本語などは1文字2、半角英数は1）
+TWEET_URL_WEIGHT = 23       # URLは長さによらずこの重みで数える
+
+# ==================== グラフ設定 ====================
+CHART_MAX_POINTS = 500  # 時系列グラフ1系列あたりの最大点数（超える分はサーバー側で間引く）
 
 # ==================== 学習フェーズ ====================
 PHASE_FOUNDATION = "基礎固め期"        # 1月-3月
@@ -0,0 +1,91 @@
+"""
+同期元Obsidian Vaultの設定
+~/study_app/vaults.json で複数のVaultを指定できる（ファイルがなければ既定のVaultのみ）
+
+設定例:
+    {
+        "vaults": [
+            {"name": "home", "path": "~/02_Knowledge/Obsidian", "priority": 10},
+            {"name": "work", "path": "~/work/Obsidian", "daily_notes_subdir": "Daily"}
+        ]
+    }
+"""
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+# 既定のVault
+DEFAULT_VAULT_NAME = "default"
+DEFAULT_VAULT_PATH = Path.home() / "02_Knowledge" / "Obsidian"
+DEFAULT_DAILY_NOTES_SUBDIR = "21_資格学習統合支援システム/10_Daily"
+
+# Vault設定ファイル
+VAULTS_CONFIG_PATH = Path.home() / "study_app" / "vaults.json"
+
+
+@dataclass(frozen=True)
+class VaultSource:
+    """同期元のVault
+
+    同じ日付のノートが複数のVaultにある場合は priority が大きいもの、
+    同じなら更新時刻が新しいもの、それも同じなら name の昇順で先のものを採用する
+    """
+    name: str
+    path: Path
+    daily_notes_subdir: str = DEFAULT_DAILY_NOTES_SUBDIR
+    priority: int = 0
+
+    @property
+    def daily_notes_path(self) -> Path:
+        """デイリーノートフォルダ"""
+        return self.path / self.daily_notes_subdir
+
+
+def default_vault_sources() -> List[VaultSource]:
+    """既定のVaultのみの設定"""
+    return [VaultSource(name=DEFAULT_VAULT_NAME, path=DEFAULT_VAULT_PATH)]
+
+
+def load_vault_sources(config_path: Optional[Path] = None) -> List[VaultSource]:
+    """Vault設定を読み込む
+
+    Args:
+        config_path: 設定ファイル（省略時は ~/study_app/vaults.json）
+
+    Returns:
+        VaultSourceのリスト（設定ファイルがなければ既定のVaultのみ）
+
+    Raises:
+        ValueError: 設定ファイルの形式が不正な場合
+    """
+    config_path = config_path or VAULTS_CONFIG_PATH
+    if not config_path.exists():
+        return default_vault_sources()
+
+    try:
+        config = json.loads(config_path.read_text(encoding='utf-8'))
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Vault設定ファイルを読み込めません: {config_path}: {e}")
+
+    entries = config.get('vaults') if isinstance(config, dict) else None
+    if not entries:
+        raise ValueError(f"Vault設定に vaults がありません: {config_path}")
+
+    sources = []
+    names = set()
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get('name') or not entry.get('path'):
+            raise ValueError(f"Vault設定には name と path が必要です: {entry}")
+        if entry['name'] in names:
+            raise ValueError(f"Vault名が重複しています: {entry['name']}")
+        names.add(entry['name'])
+
+        sources.append(VaultSource(
+            name=entry['name'],
+            path=Path(entry['path']).expanduser(),
+            daily_notes_subdir=entry.get('daily_notes_subdir', DEFAULT_DAILY_NOTES_SUBDIR),
+            priority=int(entry.get('priority', 0)),
+        ))
+
+    return sources
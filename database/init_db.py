@@ -6,6 +6,9 @@ from pathlib import Path
 
 DB_PATH = Path.home() / "study_app" / "study_records.db"
 
+# 書き込むとデータの変更カウンタ（data_version）が増えるテーブル
+DATA_VERSION_TABLES = ('records', 'study_sessions', 'subjects')
+
 def init_database():
     """データベースとテーブルを初期化"""
 
@@ -13,6 +16,20 @@ def init_database():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
+    create_schema(cursor)
+
+    conn.commit()
+    conn.close()
+
+    print(f"✅ データベース初期化完了: {DB_PATH}")
+
+
+def create_schema(cursor) -> None:
+    """テーブル・インデックス・トリガーを作成し、既存データを現在のスキーマに合わせる
+
+    すべて IF NOT EXISTS・冪等な更新のため、既存のデータベースに何度実行してもよい
+    （DatabaseService も接続先ごとに初回接続時に実行する）
+    """
     # 学習記録テーブル
     cursor.execute('''
     CREATE TABLE IF NOT EXISTS records (
@@ -72,10 +89,187 @@ def init_database():
         VALUES (?, ?, ?, ?, ?, ?)
     ''', subjects)
 
-    conn.commit()
-    conn.close()
+    # 学習セッションテーブル（1日の複数科目をそのまま保持）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS study_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        date DATE NOT NULL,
+        subject TEXT NOT NULL,
+        hours REAL NOT NULL DEFAULT 0,
+        source TEXT NOT NULL DEFAULT 'manual',  -- manual / obsidian / api
+        ordinal INTEGER NOT NULL DEFAULT 0,     -- その日の中での順番
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE (date, ordinal)
+    )
+    ''')
+
+    # 科目別集計用インデックス
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_study_sessions_subject_date
+    ON study_sessions (subject, date)
+    ''')
+
+    # Obsidian一括同期ジョブ（進捗と再開位置）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sync_jobs (
+        job_id TEXT PRIMARY KEY,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        status TEXT NOT NULL,
+        files_scanned INTEGER DEFAULT 0,
+        files_parsed INTEGER DEFAULT 0,
+        records_written INTEGER DEFAULT 0,
+        failed_count INTEGER DEFAULT 0,
+        last_committed_date DATE,   -- ここまで処理済み（再開時は翌日から）
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Obsidian出力済みノートの内容ハッシュ（変更のないノートは書き込まない）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS obsidian_exports (
+        date DATE PRIMARY KEY,
+        path TEXT NOT NULL,
+        content_hash TEXT NOT NULL,
+        exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # Vault内ノートのインデックス（パス → 日付・更新時刻・フロントマター）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS vault_index (
+        path TEXT PRIMARY KEY,
+        date DATE,
+        mtime REAL NOT NULL,
+        frontmatter TEXT,          -- JSON
+        indexed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    cursor.execute('''
+    CREATE INDEX IF NOT EXISTS idx_vault_index_date
+    ON vault_index (date)
+    ''')
+
+    # 同期元Vaultごとのマニフェスト（前回読み込んだノートの更新時刻・サイズ・学習ログ）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS vault_manifests (
+        vault_name TEXT NOT NULL,
+        path TEXT NOT NULL,
+        date DATE NOT NULL,
+        mtime REAL NOT NULL,
+        size INTEGER NOT NULL,
+        logs TEXT,                 -- JSON
+        scanned_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (vault_name, path)
+    )
+    ''')
+
+    # 同期の状態（照合の基準時刻など、キー → 値）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value TEXT,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''')
+
+    # X投稿文のキャッシュ（期間ごと、入力となる記録が保存されると削除）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS tweet_cache (
+        period_type TEXT NOT NULL,     -- daily / weekly / monthly
+        period_key TEXT NOT NULL,
+        start_date DATE NOT NULL,
+        end_date DATE NOT NULL,
+        version TEXT NOT NULL,         -- 生成時の記録の updated_at など
+        text TEXT NOT NULL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (period_type, period_key)
+    )
+    ''')
+
+    # データの変更カウンタ（キャッシュの無効化用、下記トリガーで書き込みのたびに増える）
+    cursor.execute('''
+    CREATE TABLE IF NOT EXISTS data_version (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL DEFAULT 0
+    )
+    ''')
+    cursor.execute('INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)')
+
+    for table in DATA_VERSION_TABLES:
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_data_version
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE data_version SET version = version + 1 WHERE id = 1;
+            END
+            ''')
+
+    # 既存の記録からセッションを補完（セッションが1件もない日のみ）
+    backfill_study_sessions(cursor)
+
+    # 既定値（UTC）のまま残っている更新日時をアプリと同じローカル時刻に揃える
+    normalize_record_timestamps(cursor)
+
+def normalize_record_timestamps(cursor) -> int:
+    """records.updated_at をローカル時刻の ISO 形式（datetime.now().isoformat()）に揃える
+
+    アプリは保存時に datetime.now()（ローカル時刻）を書き込むが、列の既定値
+    CURRENT_TIMESTAMP は UTC の "YYYY-MM-DD HH:MM:SS" 形式になる。
+    既定値の形式（"T" を含まない）の値だけを変換するため、何度実行してもよい
+
+    Returns:
+        変換した記録数
+    """
+    cursor.execute('''
+        UPDATE records
+        SET updated_at = strftime('%Y-%m-%dT%H:%M:%S', updated_at, 'localtime')
+        WHERE updated_at IS NOT NULL AND instr(updated_at, 'T') = 0
+    ''')
+    return cursor.rowcount
+
+
+def backfill_study_sessions(cursor) -> int:
+    """セッションのない記録から study_sessions を補完
+
+    records には代表科目しか残っていないため、診断士は shindan_subject に、
+    統計検定は「統計検定2級」にそれぞれ1セッションとして登録する
+
+    Returns:
+        追加したセッション数
+    """
+    cursor.execute('''
+        CREATE TEMP TABLE _dates_without_sessions AS
+        SELECT date FROM records r
+        WHERE NOT EXISTS (SELECT 1 FROM study_sessions s WHERE s.date = r.date)
+    ''')
+
+    cursor.execute('''
+        INSERT INTO study_sessions (date, subject, hours, source, ordinal)
+        SELECT date, shindan_subject, shindan_time, 'manual', 0
+        FROM records
+        WHERE date IN (SELECT date FROM _dates_without_sessions)
+          AND shindan_time > 0 AND COALESCE(shindan_subject, '') != ''
+    ''')
+    added = cursor.rowcount
+
+    cursor.execute('''
+        INSERT INTO study_sessions (date, subject, hours, source, ordinal)
+        SELECT date, '統計検定2級', toukei_time, 'manual',
+               CASE WHEN shindan_time > 0 AND COALESCE(shindan_subject, '') != '' THEN 1 ELSE 0 END
+        FROM records
+        WHERE date IN (SELECT date FROM _dates_without_sessions)
+          AND toukei_time > 0
+    ''')
+    added += cursor.rowcount
+
+    cursor.execute('DROP TABLE _dates_without_sessions')
+    return added
 
-    print(f"✅ データベース初期化完了: {DB_PATH}")
 
 if __name__ == "__main__":
     init_database()
@@ -2,7 +2,7 @@
 学習記録データモデル
 """
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
 @dataclass
@@ -22,8 +22,9 @@ class StudyRecord:
     toukei_content: str = ""
     toukei_issue: str = ""
 
-    # ID（DBから取得時のみ）
+    # ID・更新日時（DBから取得時のみ）
     id: Optional[int] = None
+    updated_at: Optional[datetime] = None
 
     def to_dict(self):
         """辞書形式に変換"""
@@ -2,18 +2,42 @@
 データベース操作サービス
 """
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import date, datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 
+from database.init_db import create_schema
 from models.record import StudyRecord, CumulativeStats
+from utils.cumulative import CumulativeIndex
+from utils.perf import instrument_methods
+from utils.phase import get_phase_for_date
 
 DB_PATH = Path.home() / "study_app" / "study_records.db"
 
+# スキーマを作成・更新済みのデータベース（init_database() を実行していない既存DBでも新しいテーブルを使えるよう、
+# 接続先ごとにプロセス内で初回接続時に1回だけ create_schema() を実行する）
+_schema_ready = set()
+_schema_lock = threading.Lock()
 
+# 統計検定の科目名（セッションの診断士/統計判定に使用）
+TOUKEI_SUBJECT = "統計検定2級"
+
+# 履歴の絞り込みで検索する列
+RECORD_TEXT_COLUMNS = (
+    'phase',
+    'shindan_subject',
+    'shindan_content',
+    'shindan_issue',
+    'toukei_content',
+    'toukei_issue',
+)
+
+
+@instrument_methods('db', exclude=('get_connection',))
 class DatabaseService:
-    """データベース操作クラス"""
+    """データベース操作クラス（計測が有効なら公開メソッドの所要時間と件数を記録）"""
 
     def __init__(self):
         self.db_path = DB_PATH
@@ -29,6 +53,8 @@ class DatabaseService:
         """
         conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
         conn.row_factory = sqlite3.Row
+        if self.db_path not in _schema_ready:
+            self._ensure_schema(conn)
         try:
             yield conn
             conn.commit()
@@ -38,8 +64,38 @@ class DatabaseService:
         finally:
             conn.close()
 
-    def save_record(self, record: StudyRecord) -> int:
-        """学習記録を保存"""
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        """接続先のスキーマを作成・更新（プロセス内で初回のみ）"""
+        with _schema_lock:
+            if self.db_path in _schema_ready:
+                return
+            try:
+                create_schema(conn.cursor())
+                conn.commit()
+            except Exception:
+                conn.close()
+                raise
+            _schema_ready.add(self.db_path)
+
+    def save_record(
+        self,
+        record: StudyRecord,
+        sessions: Optional[List[Dict]] = None,
+        source: str = 'manual'
+    ) -> int:
+        """学習記録を保存
+
+        同じトランザクションでその日の study_sessions も置き換える
+
+        Args:
+            record: 学習記録
+            sessions: 科目別セッション [{'subject': str, 'duration_hours': float}, ...]
+                      （Noneなら記録の診断士科目・統計検定から生成）
+            source: セッションの登録元（manual / obsidian）
+        """
+        if sessions is None:
+            sessions = self.sessions_from_record(record)
+
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
@@ -60,8 +116,236 @@ class DatabaseService:
                 record.toukei_issue,
                 datetime.now().isoformat()
             ))
+            record_id = cursor.lastrowid
+
+            self._replace_sessions(cursor, record.date, sessions, source)
+            self._invalidate_tweet_cache(cursor, record.date)
+
+            return record_id
+
+    def append_sessions(
+        self,
+        sessions_by_date: Dict[date, List[Dict]],
+        source: str = 'api'
+    ) -> Dict[date, Tuple[float, float]]:
+        """科目別セッションを既存の記録に追加（複数日を1トランザクションで保存）
+
+        その日の既存セッションは残したまま後ろに追加し、記録の学習時間に加算する。
+        内容・課題は変更しない。記録がなければ新規作成する
+
+        Args:
+            sessions_by_date: {日付: [{'subject': str, 'duration_hours': float}, ...]}
+            source: セッションの登録元
+
+        Returns:
+            {日付: (診断士の学習時間, 統計の学習時間)}（追加後）
+        """
+        totals = {}
 
-            return cursor.lastrowid
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            for target_date, sessions in sessions_by_date.items():
+                if not sessions:
+                    continue
+                key = target_date.isoformat()
+
+                cursor.execute('SELECT * FROM records WHERE date = ?', (key,))
+                row = cursor.fetchone()
+                if row is not None:
+                    record = self._record_from_row(row)
+                else:
+                    record = StudyRecord(date=target_date, phase=get_phase_for_date(target_date))
+
+                # 丸め済みの記録の合計に足し続けると丸め誤差が積み上がるため、
+                # セッションの合計が記録と一致する（記録の時間をすべて裏付けている）場合は
+                # 丸めていないセッションの合計に加算してから最後に1回だけ丸める。
+                # 一致しない場合（科目なしの旧記録など）は記録の時間に加算し、取りこぼさない
+                cursor.execute('''
+                    SELECT COALESCE(SUM(CASE WHEN subject != ? THEN hours END), 0) AS shindan,
+                           COALESCE(SUM(CASE WHEN subject = ? THEN hours END), 0) AS toukei
+                    FROM study_sessions WHERE date = ?
+                ''', (TOUKEI_SUBJECT, TOUKEI_SUBJECT, key))
+                existing = cursor.fetchone()
+                shindan_time, toukei_time = record.shindan_time, record.toukei_time
+                if round(existing['shindan'], 2) == shindan_time:
+                    shindan_time = existing['shindan']
+                if round(existing['toukei'], 2) == toukei_time:
+                    toukei_time = existing['toukei']
+
+                for session in sessions:
+                    if session['subject'] == TOUKEI_SUBJECT:
+                        toukei_time += session['duration_hours']
+                    else:
+                        shindan_time += session['duration_hours']
+                        if not record.shindan_subject:
+                            record.shindan_subject = session['subject']
+                record.shindan_time = round(shindan_time, 2)
+                record.toukei_time = round(toukei_time, 2)
+
+                cursor.execute('''
+                    INSERT INTO records
+                    (date, phase, shindan_time, shindan_subject, shindan_content, shindan_issue,
+                     toukei_time, toukei_content, toukei_issue, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(date) DO UPDATE SET
+                        shindan_time = excluded.shindan_time,
+                        shindan_subject = excluded.shindan_subject,
+                        toukei_time = excluded.toukei_time,
+                        updated_at = excluded.updated_at
+                ''', (
+                    key,
+                    record.phase,
+                    record.shindan_time,
+                    record.shindan_subject,
+                    record.shindan_content,
+                    record.shindan_issue,
+                    record.toukei_time,
+                    record.toukei_content,
+                    record.toukei_issue,
+                    datetime.now().isoformat()
+                ))
+
+                cursor.execute(
+                    'SELECT COALESCE(MAX(ordinal) + 1, 0) AS next_ordinal FROM study_sessions WHERE date = ?',
+                    (key,)
+                )
+                first_ordinal = cursor.fetchone()['next_ordinal']
+                cursor.executemany('''
+                    INSERT INTO study_sessions (date, subject, hours, source, ordinal)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [
+                    (key, session['subject'], session['duration_hours'], source, first_ordinal + offset)
+                    for offset, session in enumerate(sessions)
+                ])
+
+                self._invalidate_tweet_cache(cursor, target_date)
+                totals[target_date] = (record.shindan_time, record.toukei_time)
+
+        return totals
+
+    @staticmethod
+    def sessions_from_record(record: StudyRecord) -> List[Dict]:
+        """記録の代表科目からセッションを生成（入力フォーム用）"""
+        sessions = []
+        if record.shindan_time > 0 and record.shindan_subject:
+            sessions.append({'subject': record.shindan_subject, 'duration_hours': record.shindan_time})
+        if record.toukei_time > 0:
+            sessions.append({'subject': TOUKEI_SUBJECT, 'duration_hours': record.toukei_time})
+        return sessions
+
+    @staticmethod
+    def _replace_sessions(cursor, target_date: date, sessions: List[Dict], source: str) -> None:
+        """指定日のセッションを置き換え"""
+        cursor.execute('DELETE FROM study_sessions WHERE date = ?', (target_date.isoformat(),))
+        cursor.executemany('''
+            INSERT INTO study_sessions (date, subject, hours, source, ordinal)
+            VALUES (?, ?, ?, ?, ?)
+        ''', [
+            (target_date.isoformat(), session['subject'], session['duration_hours'], source, ordinal)
+            for ordinal, session in enumerate(sessions)
+        ])
+
+    @staticmethod
+    def _invalidate_tweet_cache(cursor, target_date: date) -> None:
+        """指定日の保存で内容が変わる投稿文キャッシュを削除
+
+        日次・月次は累計を含むため指定日以降のものすべて、週次は指定日を含む週のみ
+        """
+        target = target_date.isoformat()
+        cursor.execute('''
+            DELETE FROM tweet_cache
+            WHERE (period_type IN ('daily', 'monthly') AND end_date >= ?)
+               OR (period_type = 'weekly' AND start_date <= ? AND end_date >= ?)
+        ''', (target, target, target))
+
+    def get_subject_hours(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_toukei: bool = False
+    ) -> Dict[str, float]:
+        """科目別の学習時間を集計（関連資格の学習記録を除外）
+
+        study_sessions の (subject, date) インデックスを使う1回の GROUP BY
+
+        Args:
+            start_date: 集計開始日（含む、Noneなら制限なし）
+            end_date: 集計終了日（含む、Noneなら制限なし）
+            include_toukei: Trueなら統計検定のセッションも含める
+
+        Returns:
+            {'科目名': 合計時間, ...}（時間の多い順）
+        """
+        conditions = ["r.phase != '関連資格'"]
+        params = []
+        if start_date is not None:
+            conditions.append('s.date >= ?')
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append('s.date <= ?')
+            params.append(end_date.isoformat())
+        if not include_toukei:
+            conditions.append('s.subject != ?')
+            params.append(TOUKEI_SUBJECT)
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+
+            cursor.execute(f'''
+                SELECT s.subject, SUM(s.hours) as hours
+                FROM study_sessions s
+                JOIN records r ON r.date = s.date
+                WHERE {' AND '.join(conditions)}
+                GROUP BY s.subject
+                ORDER BY hours DESC
+            ''', params)
+
+            return {row['subject']: round(row['hours'], 2) for row in cursor.fetchall()}
+
+    def get_subject_hours_by_date(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        include_toukei: bool = False
+    ) -> Dict[date, Dict[str, float]]:
+        """日付別・科目別の学習時間を1回のクエリで取得（関連資格の学習記録を除外）
+
+        Args:
+            start_date: 開始日（含む、Noneなら制限なし）
+            end_date: 終了日（含む、Noneなら制限なし）
+            include_toukei: Trueなら統計検定のセッションも含める
+
+        Returns:
+            {日付: {'科目名': 合計時間, ...}, ...}
+        """
+        conditions = ["r.phase != '関連資格'"]
+        params = []
+        if start_date is not None:
+            conditions.append('s.date >= ?')
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append('s.date <= ?')
+            params.append(end_date.isoformat())
+        if not include_toukei:
+            conditions.append('s.subject != ?')
+            params.append(TOUKEI_SUBJECT)
+
+        hours_by_date: Dict[date, Dict[str, float]] = {}
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT s.date, s.subject, SUM(s.hours) as hours
+                FROM study_sessions s
+                JOIN records r ON r.date = s.date
+                WHERE {' AND '.join(conditions)}
+                GROUP BY s.date, s.subject
+            ''', params)
+
+            for row in cursor:
+                hours_by_date.setdefault(date.fromisoformat(row['date']), {})[row['subject']] = row['hours']
+
+        return hours_by_date
 
     def get_record_by_date(self, target_date: date) -> Optional[StudyRecord]:
         """指定日の記録を取得"""
@@ -75,32 +359,31 @@ class DatabaseService:
             row = cursor.fetchone()
 
             if row:
-                return StudyRecord(
-                    id=row['id'],
-                    date=date.fromisoformat(row['date']),
-                    phase=row['phase'],
-                    shindan_time=row['shindan_time'],
-                    shindan_subject=row['shindan_subject'] or '',
-                    shindan_content=row['shindan_content'] or '',
-                    shindan_issue=row['shindan_issue'] or '',
-                    toukei_time=row['toukei_time'],
-                    toukei_content=row['toukei_content'] or '',
-                    toukei_issue=row['toukei_issue'] or '',
-                )
+                return self._record_from_row(row)
             return None
 
-    def get_cumulative_stats(self) -> CumulativeStats:
-        """累計統計を取得（関連資格の学習記録を除外）"""
+    def get_cumulative_stats(self, as_of: Optional[date] = None) -> CumulativeStats:
+        """累計統計を取得（関連資格の学習記録を除外）
+
+        Args:
+            as_of: この日時点（その日を含む）の累計を取得する（Noneなら全期間）
+        """
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
-            cursor.execute('''
+            params = []
+            date_condition = ''
+            if as_of is not None:
+                date_condition = 'AND date <= ?'
+                params.append(as_of.isoformat())
+
+            cursor.execute(f'''
                 SELECT
                     COALESCE(SUM(shindan_time), 0) as shindan_total,
                     COALESCE(SUM(toukei_time), 0) as toukei_total
                 FROM records
-                WHERE phase != '関連資格'
-            ''')
+                WHERE phase != '関連資格' {date_condition}
+            ''', params)
 
             row = cursor.fetchone()
 
@@ -113,6 +396,10 @@ class DatabaseService:
 
             return stats
 
+    def get_cumulative_index(self) -> CumulativeIndex:
+        """日付別の累計インデックスを取得（記録を日付順に1回走査）"""
+        return CumulativeIndex.from_records(self.iter_records())
+
     def get_all_records(self) -> List[StudyRecord]:
         """全記録を取得"""
         with self.get_connection() as conn:
@@ -126,18 +413,7 @@ class DatabaseService:
 
             records = []
             for row in rows:
-                records.append(StudyRecord(
-                    id=row['id'],
-                    date=date.fromisoformat(row['date']),
-                    phase=row['phase'],
-                    shindan_time=row['shindan_time'],
-                    shindan_subject=row['shindan_subject'] or '',
-                    shindan_content=row['shindan_content'] or '',
-                    shindan_issue=row['shindan_issue'] or '',
-                    toukei_time=row['toukei_time'],
-                    toukei_content=row['toukei_content'] or '',
-                    toukei_issue=row['toukei_issue'] or '',
-                ))
+                records.append(self._record_from_row(row))
 
             return records
 
@@ -157,21 +433,199 @@ class DatabaseService:
 
             records = []
             for row in rows:
-                records.append(StudyRecord(
-                    id=row['id'],
-                    date=date.fromisoformat(row['date']),
-                    phase=row['phase'],
-                    shindan_time=row['shindan_time'],
-                    shindan_subject=row['shindan_subject'] or '',
-                    shindan_content=row['shindan_content'] or '',
-                    shindan_issue=row['shindan_issue'] or '',
-                    toukei_time=row['toukei_time'],
-                    toukei_content=row['toukei_content'] or '',
-                    toukei_issue=row['toukei_issue'] or '',
-                ))
+                records.append(self._record_from_row(row))
 
             return records
 
+    def get_records_page(
+        self,
+        before: Optional[date] = None,
+        limit: int = 20,
+        text_filter: str = ''
+    ) -> Tuple[List[StudyRecord], Optional[date]]:
+        """記録を新しい順に1ページ分取得（日付をカーソルにしたキーセット方式）
+
+        OFFSET を使わず date の索引から直接ページ先頭に移るため、どのページでも
+        1ページ分の行しか読まない
+
+        Args:
+            before: この日付より前の記録から取得（Noneなら最新から）
+            limit: 1ページの件数
+            text_filter: 科目（その日のすべてのセッション）・内容・課題・フェーズの部分一致で絞り込む文字列
+
+        Returns:
+            (記録のリスト, 次のページのカーソル（最後のページならNone）)
+        """
+        conditions = []
+        params = []
+        if before is not None:
+            conditions.append('date < ?')
+            params.append(before.isoformat())
+        if text_filter:
+            pattern = '%' + text_filter.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            # records には代表科目しかないため、2つ目以降の科目はセッションから探す
+            conditions.append('(' + ' OR '.join(
+                [f"{column} LIKE ? ESCAPE '\\'" for column in RECORD_TEXT_COLUMNS]
+                + ["EXISTS (SELECT 1 FROM study_sessions s WHERE s.date = records.date"
+                   " AND s.subject LIKE ? ESCAPE '\\')"]
+            ) + ')')
+            params.extend([pattern] * (len(RECORD_TEXT_COLUMNS) + 1))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # 次のページの有無を知るため1件多く取得
+            cursor.execute(
+                f'SELECT * FROM records {where} ORDER BY date DESC LIMIT ?',
+                params + [limit + 1]
+            )
+            rows = cursor.fetchall()
+
+        records = [self._record_from_row(row) for row in rows[:limit]]
+        next_cursor = records[-1].date if len(rows) > limit else None
+        return records, next_cursor
+
+    def iter_records(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Iterator[StudyRecord]:
+        """記録を日付の昇順で1件ずつ取得（全件をメモリに載せない）
+
+        Args:
+            start_date: 開始日（含む、Noneなら制限なし）
+            end_date: 終了日（含む、Noneなら制限なし）
+        """
+        conditions = []
+        params = []
+        if start_date is not None:
+            conditions.append('date >= ?')
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            conditions.append('date <= ?')
+            params.append(end_date.isoformat())
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT * FROM records {where} ORDER BY date', params)
+
+            for row in cursor:
+                yield self._record_from_row(row)
+
+    def get_export_hashes(self) -> Dict[str, Tuple[str, str]]:
+        """Obsidian出力済みノートの内容ハッシュを取得
+
+        Returns:
+            {'YYYY-MM-DD': (ファイルパス, 内容ハッシュ), ...}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT date, path, content_hash FROM obsidian_exports')
+            return {row['date']: (row['path'], row['content_hash']) for row in cursor.fetchall()}
+
+    def save_export_hashes(self, exports: List[Tuple[date, str, str]]) -> None:
+        """Obsidian出力済みノートの内容ハッシュを保存
+
+        Args:
+            exports: [(日付, ファイルパス, 内容ハッシュ), ...]
+        """
+        if not exports:
+            return
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO obsidian_exports (date, path, content_hash, exported_at)
+                VALUES (?, ?, ?, ?)
+            ''', [
+                (export_date.isoformat(), path, content_hash, datetime.now().isoformat())
+                for export_date, path, content_hash in exports
+            ])
+
+    def get_records_updated_since(self, since: Optional[datetime] = None) -> Dict[date, datetime]:
+        """指定日時より後に更新された記録の日付を取得
+
+        Args:
+            since: 基準日時（Noneなら全件）
+
+        Returns:
+            {日付: 更新日時}
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if since is None:
+                cursor.execute('SELECT date, updated_at FROM records')
+            else:
+                # updated_at はローカル時刻の ISO 形式（既定値の UTC は init_database が変換済み）。
+                # 秒の小数部の有無で文字列比較がずれないよう julianday で比較
+                cursor.execute(
+                    'SELECT date, updated_at FROM records WHERE julianday(updated_at) > julianday(?)',
+                    (since.isoformat(),)
+                )
+            return {
+                date.fromisoformat(row['date']): self._parse_timestamp(row['updated_at'])
+                for row in cursor.fetchall()
+            }
+
+    def get_data_version(self) -> int:
+        """データの変更カウンタ（records / study_sessions / subjects に書き込むたびに増える）
+
+        キャッシュのキーに使う（値が同じなら前回の読み込み結果をそのまま使える）
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT version FROM data_version WHERE id = 1')
+            row = cursor.fetchone()
+            return row['version'] if row else 0
+
+    def get_sync_state(self, key: str) -> Optional[str]:
+        """同期の状態を取得"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT value FROM sync_state WHERE key = ?', (key,))
+            row = cursor.fetchone()
+            return row['value'] if row else None
+
+    def set_sync_state(self, key: str, value: Optional[str]) -> None:
+        """同期の状態を保存（Noneなら削除）"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            if value is None:
+                cursor.execute('DELETE FROM sync_state WHERE key = ?', (key,))
+            else:
+                cursor.execute(
+                    'INSERT OR REPLACE INTO sync_state (key, value, updated_at) VALUES (?, ?, ?)',
+                    (key, value, datetime.now().isoformat())
+                )
+
+    @classmethod
+    def _record_from_row(cls, row: sqlite3.Row) -> StudyRecord:
+        """records テーブルの行を StudyRecord に変換"""
+        return StudyRecord(
+            id=row['id'],
+            date=date.fromisoformat(row['date']),
+            phase=row['phase'],
+            shindan_time=row['shindan_time'],
+            shindan_subject=row['shindan_subject'] or '',
+            shindan_content=row['shindan_content'] or '',
+            shindan_issue=row['shindan_issue'] or '',
+            toukei_time=row['toukei_time'],
+            toukei_content=row['toukei_content'] or '',
+            toukei_issue=row['toukei_issue'] or '',
+            updated_at=cls._parse_timestamp(row['updated_at']),
+        )
+
+    @staticmethod
+    def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+        """DBの日時文字列を変換（不正な値はNone）"""
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
     def get_subjects(self) -> List[tuple]:
         """科目リストを取得"""
         with self.get_connection() as conn:
@@ -0,0 +1,184 @@
+"""
+Obsidian出力の書き込み遅延（write-behind）キュー
+保存処理はDBコミットだけで戻り、Obsidianへの出力はバックグラウンドで行う
+"""
+import atexit
+import threading
+import time
+from datetime import date, datetime
+from typing import Dict, Optional
+
+from services.database import DatabaseService
+from services.obsidian import ObsidianService
+from services.registry import get_database_service, get_obsidian_service
+from services.tweet_cache import TweetCache
+
+# 出力失敗時の再試行回数と初回の待ち時間（秒、以降は倍々）
+MAX_EXPORT_RETRIES = 3
+EXPORT_RETRY_DELAY = 2.0
+
+# 保存から出力までの待ち時間（秒）。この間に同じ日付が再保存されたら1回の出力にまとめる
+EXPORT_DEBOUNCE_DELAY = 1.0
+# 保存が続いても最初の予約からこれ以上は出力を遅らせない（秒）
+EXPORT_MAX_DELAY = 10.0
+
+# プロセス終了時に未出力の予約を書き出すまで待つ時間（秒）
+EXPORT_FLUSH_TIMEOUT = 30.0
+
+
+class ExportQueue:
+    """Obsidian出力キュー
+
+    保存から debounce_delay 秒待ってから出力し、その間に同じ日付が何度保存されても
+    1回の出力にまとめる（出力時点のDBの内容を使う）。保存が続く場合も最初の予約から
+    max_delay 秒以内に出力する。失敗した出力は間隔を空けて再試行する。
+    """
+
+    def __init__(
+        self,
+        db_service: Optional[DatabaseService] = None,
+        obsidian_service: Optional[ObsidianService] = None,
+        max_retries: int = MAX_EXPORT_RETRIES,
+        retry_delay: float = EXPORT_RETRY_DELAY,
+        debounce_delay: float = EXPORT_DEBOUNCE_DELAY,
+        max_delay: float = EXPORT_MAX_DELAY
+    ):
+        self.db_service = db_service or get_database_service()
+        self.obsidian_service = obsidian_service or get_obsidian_service()
+        self.tweet_cache = TweetCache(self.db_service)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.debounce_delay = debounce_delay
+        self.max_delay = max_delay
+
+        # 日付 → (出力予定時刻, 失敗回数, 最初に予約した時刻)
+        self._pending: Dict[date, tuple] = {}
+        self._in_progress: Optional[date] = None
+        self._condition = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+        # 状態
+        self.exported_count = 0
+        self.coalesced_count = 0
+        self.last_exported_date: Optional[date] = None
+        self.last_exported_at: Optional[datetime] = None
+        self.failures: Dict[date, str] = {}
+
+    def enqueue(self, target_date: date) -> None:
+        """指定日の出力を予約（すでに予約済みならまとめる）"""
+        with self._condition:
+            now = time.monotonic()
+            first_at = now
+            if target_date in self._pending:
+                self.coalesced_count += 1
+                first_at = self._pending[target_date][2]
+            due = min(now + self.debounce_delay, first_at + self.max_delay)
+            self._pending[target_date] = (due, 0, first_at)
+            self.failures.pop(target_date, None)
+            self._ensure_worker()
+            self._condition.notify_all()
+
+    def status(self) -> Dict[str, any]:
+        """キューの状態を取得"""
+        with self._condition:
+            return {
+                'pending': len(self._pending) + (1 if self._in_progress else 0),
+                'exported_count': self.exported_count,
+                'coalesced_count': self.coalesced_count,
+                'last_exported_date': self.last_exported_date,
+                'last_exported_at': self.last_exported_at,
+                'failures': dict(self.failures),
+                'worker_alive': self._worker is not None and self._worker.is_alive(),
+            }
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """待ち時間を打ち切って予約をすぐに出力し、キューが空になるまで待つ
+
+        Returns:
+            空になったらTrue、タイムアウトしたらFalse
+        """
+        with self._condition:
+            if not self._pending and self._in_progress is None:
+                return True
+            now = time.monotonic()
+            for target_date, (due, attempts, first_at) in list(self._pending.items()):
+                self._pending[target_date] = (min(due, now), attempts, first_at)
+            self._ensure_worker()
+            self._condition.notify_all()
+            return self._condition.wait_for(
+                lambda: not self._pending and self._in_progress is None,
+                timeout
+            )
+
+    def _ensure_worker(self) -> None:
+        """ワーカースレッドを起動（ロック取得中に呼ぶ）"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, name="obsidian-export-queue", daemon=True)
+            self._worker.start()
+
+    def _next_item(self) -> tuple:
+        """出力予定時刻を過ぎた項目を取り出す（ロック取得中に呼ぶ）"""
+        while True:
+            if self._pending:
+                target_date, (due, attempts, _) = min(self._pending.items(), key=lambda item: item[1][0])
+                wait = due - time.monotonic()
+                if wait <= 0:
+                    del self._pending[target_date]
+                    return target_date, attempts
+                self._condition.wait(wait)
+            else:
+                self._condition.wait()
+
+    def _run(self) -> None:
+        """ワーカー本体"""
+        while True:
+            with self._condition:
+                target_date, attempts = self._next_item()
+                self._in_progress = target_date
+
+            error = None
+            try:
+                self._export(target_date)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+
+            with self._condition:
+                self._in_progress = None
+                if error is None:
+                    self.exported_count += 1
+                    self.last_exported_date = target_date
+                    self.last_exported_at = datetime.now()
+                elif target_date not in self._pending:
+                    # 出力中に再保存されていなければ再試行を予約
+                    if attempts + 1 < self.max_retries:
+                        now = time.monotonic()
+                        due = now + self.retry_delay * (2 ** attempts)
+                        self._pending[target_date] = (due, attempts + 1, now)
+                    else:
+                        self.failures[target_date] = error
+                self._condition.notify_all()
+
+    def _export(self, target_date: date) -> None:
+        """指定日の記録をDBから読み込んで出力"""
+        record = self.db_service.get_record_by_date(target_date)
+        if record is None:
+            return
+        # その日時点の累計（過去日の再出力に今日の累計を書き込まない）
+        stats = self.db_service.get_cumulative_stats(as_of=target_date)
+        self.obsidian_service.export_to_obsidian(record, stats)
+        # 日次投稿文も生成しておく（投稿文の表示はキャッシュの読み込みのみ）
+        self.tweet_cache.get_daily_tweet(record, stats)
+
+
+_queue: Optional[ExportQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_export_queue() -> ExportQueue:
+    """プロセス共有の出力キューを取得（プロセス終了時に未出力の予約を書き出す）"""
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportQueue()
+            atexit.register(_queue.flush, EXPORT_FLUSH_TIMEOUT)
+        return _queue
@@ -0,0 +1,387 @@
+"""
+学習セッション登録用のHTTP/JSON API（Streamlitを経由しない書き込み口）
+タイマー・スマホのショートカット・スクリプトから学習セッションを送信する
+
+    python -m services.ingest_api [--host 127.0.0.1] [--port 8765]
+
+エンドポイント:
+    POST /sessions        1件   {"subject": "財務", "minutes": 25, "date": "2026-01-05"}
+    POST /sessions/batch  複数件 {"sessions": [{...}, {...}]}
+    GET  /health          書き込みキューの状態
+
+書き込みは1本のライタースレッドがまとめて行う。短い間隔で届いた送信は
+1トランザクションにまとめ、同じ日付の送信は1回の記録更新に合算する
+"""
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from services.database import DatabaseService
+from services.export_queue import ExportQueue, get_export_queue
+from services.registry import ensure_database, get_database_service
+from utils.subjects import normalize_subject_name
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+
+# 設定されていれば Authorization: Bearer <token> を必須にする
+TOKEN_ENV = 'STUDY_APP_INGEST_TOKEN'
+
+# リクエストの制限
+MAX_BODY_BYTES = 1024 * 1024
+MAX_BATCH_SIZE = 1000
+MAX_SESSION_HOURS = 24.0
+MAX_PAST_DAYS = 3650
+
+# ライターが1回にまとめる送信数と、最初の送信から書き込みまでの最大待ち時間（秒）
+WRITER_MAX_BATCH = 500
+WRITER_MAX_DELAY = 0.002
+
+# 書き込み完了を待つ最大時間（秒）
+COMMIT_TIMEOUT = 30.0
+
+# 終了時に書き込み待ちのセッションとObsidian出力を書き出すまで待つ時間（秒）
+SHUTDOWN_TIMEOUT = 30.0
+
+# セッションの登録元
+INGEST_SOURCE = 'api'
+
+
+def validate_session(payload: Dict, today: Optional[date] = None) -> Tuple[Optional[Dict], Optional[str]]:
+    """送信されたセッションを検証して正規化
+
+    Args:
+        payload: {'subject': 科目名（略称可）, 'minutes' | 'hours': 学習時間, 'date': 'YYYY-MM-DD'（省略時は今日）}
+        today: 今日の日付（テスト用）
+
+    Returns:
+        ({'date': date, 'subject': 正式名称, 'duration_hours': float}, None) または (None, エラーメッセージ)
+    """
+    today = today or date.today()
+
+    if not isinstance(payload, dict):
+        return None, "セッションはJSONオブジェクトで指定してください"
+
+    subject = payload.get('subject')
+    if not isinstance(subject, str) or not subject.strip():
+        return None, "subject を指定してください"
+    normalized = normalize_subject_name(subject.strip())
+    if normalized is None:
+        return None, f"不明な科目です: {subject}"
+
+    has_minutes = 'minutes' in payload
+    has_hours = 'hours' in payload
+    if has_minutes == has_hours:
+        return None, "minutes か hours のどちらか一方を指定してください"
+    value = payload['minutes'] if has_minutes else payload['hours']
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None, "学習時間は数値で指定してください"
+    hours = value / 60.0 if has_minutes else float(value)
+    if not 0 < hours <= MAX_SESSION_HOURS:
+        return None, f"学習時間は0より大きく{MAX_SESSION_HOURS:.0f}時間以下で指定してください"
+
+    target_date = today
+    if payload.get('date') is not None:
+        try:
+            target_date = date.fromisoformat(payload['date'])
+        except (TypeError, ValueError):
+            return None, "date は YYYY-MM-DD 形式で指定してください"
+        if target_date > today or target_date < today - timedelta(days=MAX_PAST_DAYS):
+            return None, f"date が範囲外です: {target_date.isoformat()}"
+
+    # 丸めない（1分単位の投稿を丸めると合計が大きくずれる）
+    return {'date': target_date, 'subject': normalized, 'duration_hours': hours}, None
+
+
+class IngestWriter:
+    """単一ライターの書き込みキュー
+
+    複数のリクエストスレッドから submit() されたセッションを1本のスレッドで書き込む。
+    キューにたまっている送信（最大 max_batch 件、最初の送信から max_delay 秒まで待つ）を
+    まとめ、日付ごとに合算して DatabaseService.append_sessions() で1トランザクションで保存する
+    """
+
+    def __init__(
+        self,
+        db_service: Optional[DatabaseService] = None,
+        export_queue: Optional[ExportQueue] = None,
+        max_batch: int = WRITER_MAX_BATCH,
+        max_delay: float = WRITER_MAX_DELAY
+    ):
+        """
+        Args:
+            db_service: DatabaseService
+            export_queue: 書き込んだ日付のObsidian出力を予約するキュー（Noneなら出力しない）
+            max_batch: 1回にまとめる送信数
+            max_delay: 最初の送信から書き込みまでの最大待ち時間（秒）
+        """
+        self.db_service = db_service or get_database_service()
+        self.export_queue = export_queue
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # 状態
+        self.submitted_count = 0
+        self.written_sessions = 0
+        self.transactions = 0
+        self.failed_count = 0
+
+    def submit(self, sessions: List[Dict]) -> Future:
+        """検証済みのセッションを書き込みキューに追加
+
+        Returns:
+            書き込み完了で {日付: (診断士, 統計)} を返す Future
+        """
+        future: Future = Future()
+        with self._lock:
+            self.submitted_count += 1
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name="ingest-writer", daemon=True)
+                self._worker.start()
+        self._queue.put((sessions, future))
+        return future
+
+    def status(self) -> Dict[str, int]:
+        """キューの状態を取得"""
+        return {
+            'pending': self._queue.qsize(),
+            'submitted': self.submitted_count,
+            'written_sessions': self.written_sessions,
+            'transactions': self.transactions,
+            'failed': self.failed_count,
+        }
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """受け付けた送信がすべて書き込まれるまで待つ
+
+        Returns:
+            書き込みが終わったらTrue、タイムアウトしたらFalse
+        """
+        with self._queue.all_tasks_done:
+            return self._queue.all_tasks_done.wait_for(lambda: self._queue.unfinished_tasks == 0, timeout)
+
+    def _next_batch(self) -> List[Tuple[List[Dict], Future]]:
+        """最初の送信を待ち、すでに届いている送信と max_delay 秒以内に届いた送信をまとめて取り出す
+
+        書き込み中に届いた送信は次のバッチにまとまるため、負荷が高いほど1回の書き込みが大きくなる
+        """
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """ライター本体"""
+        while True:
+            batch = self._next_batch()
+            try:
+                self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch: List[Tuple[List[Dict], Future]]) -> None:
+        """1バッチ分のセッションを書き込み、送信ごとの Future に結果を設定"""
+        # 日付ごとに合算（同じ日付への送信は1回の更新になる）
+        sessions_by_date: Dict[date, List[Dict]] = {}
+        for sessions, _ in batch:
+            for session in sessions:
+                sessions_by_date.setdefault(session['date'], []).append(session)
+
+        try:
+            totals = self.db_service.append_sessions(sessions_by_date, source=INGEST_SOURCE)
+        except Exception as e:
+            self.failed_count += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        self.transactions += 1
+        self.written_sessions += sum(len(sessions) for sessions in sessions_by_date.values())
+
+        # 保存済みなので、出力の予約より先に結果を返す
+        for sessions, future in batch:
+            future.set_result({
+                session['date']: totals[session['date']] for session in sessions
+            })
+
+        if self.export_queue is not None:
+            try:
+                for target_date in totals:
+                    self.export_queue.enqueue(target_date)
+            except Exception as e:
+                print(f"⚠️ Obsidianへの出力を予約できませんでした: {e}", file=sys.stderr)
+
+
+class IngestRequestHandler(BaseHTTPRequestHandler):
+    """HTTPリクエストの処理（server.writer / server.token を使用）"""
+
+    server_version = 'StudyIngest/1.0'
+
+    def do_GET(self) -> None:
+        if self.path.rstrip('/') == '/health':
+            self._send_json(HTTPStatus.OK, {'status': 'ok', 'writer': self.server.writer.status()})
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "見つかりません")
+
+    def do_POST(self) -> None:
+        path = self.path.rstrip('/')
+        if path not in ('/sessions', '/sessions/batch'):
+            self._send_error(HTTPStatus.NOT_FOUND, "見つかりません")
+            return
+        if not self._authorized():
+            self._send_error(HTTPStatus.UNAUTHORIZED, "認証が必要です")
+            return
+
+        payload, error = self._read_json()
+        if error:
+            self._send_error(HTTPStatus.BAD_REQUEST, error)
+            return
+
+        if path == '/sessions':
+            items = [payload]
+        else:
+            items = payload.get('sessions') if isinstance(payload, dict) else None
+            if not isinstance(items, list) or not items:
+                self._send_error(HTTPStatus.BAD_REQUEST, "sessions に1件以上の配列を指定してください")
+                return
+            if len(items) > MAX_BATCH_SIZE:
+                self._send_error(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"1回に送信できるのは{MAX_BATCH_SIZE}件までです")
+                return
+
+        # 1件でも不正なら全体を受け付けない
+        sessions = []
+        errors = []
+        for index, item in enumerate(items):
+            session, message = validate_session(item)
+            if message:
+                errors.append({'index': index, 'error': message})
+            else:
+                sessions.append(session)
+        if errors:
+            self._send_json(HTTPStatus.UNPROCESSABLE_ENTITY, {'error': "不正なセッションがあります", 'details': errors})
+            return
+
+        future = self.server.writer.submit(sessions)
+        try:
+            totals = future.result(timeout=COMMIT_TIMEOUT)
+        except Exception as e:
+            self._send_error(HTTPStatus.SERVICE_UNAVAILABLE, f"保存に失敗しました: {type(e).__name__}")
+            return
+
+        self._send_json(HTTPStatus.CREATED, {
+            'accepted': len(sessions),
+            'records': {
+                target_date.isoformat(): {'shindan_time': shindan_time, 'toukei_time': toukei_time}
+                for target_date, (shindan_time, toukei_time) in sorted(totals.items())
+            }
+        })
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        return not token or self.headers.get('Authorization', '') == f'Bearer {token}'
+
+    def _read_json(self) -> Tuple[Optional[object], Optional[str]]:
+        """リクエスト本文をJSONとして読み込む"""
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            return None, "Content-Length が不正です"
+        if length <= 0:
+            return None, "本文が空です"
+        if length > MAX_BODY_BYTES:
+            return None, "本文が大きすぎます"
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8')), None
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            return None, "本文がJSONではありません"
+
+    def _send_json(self, status: HTTPStatus, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send_json(status, {'error': message})
+
+
+def create_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    writer: Optional[IngestWriter] = None,
+    token: Optional[str] = None,
+    verbose: bool = False
+) -> ThreadingHTTPServer:
+    """APIサーバーを作成（serve_forever() で開始）"""
+    server = ThreadingHTTPServer((host, port), IngestRequestHandler)
+    server.daemon_threads = True
+    server.writer = writer or IngestWriter(export_queue=get_export_queue())
+    server.token = token
+    server.verbose = verbose
+    return server
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """コマンドライン実行"""
+    parser = argparse.ArgumentParser(description="学習セッション登録API")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"待ち受けアドレス（既定: {DEFAULT_HOST}）")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"ポート（既定: {DEFAULT_PORT}）")
+    parser.add_argument('--no-export', action='store_true', help="Obsidianへの出力を行わない")
+    parser.add_argument('-v', '--verbose', action='store_true', help="リクエストをログに出力")
+    args = parser.parse_args(argv)
+
+    ensure_database()
+    writer = IngestWriter(export_queue=None if args.no_export else get_export_queue())
+    server = create_server(args.host, args.port, writer, os.environ.get(TOKEN_ENV), args.verbose)
+
+    print(f"🚀 学習セッション登録API: http://{args.host}:{args.port} ({datetime.now():%Y-%m-%d %H:%M:%S})", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # 受付を止めてから、書き込み待ちのセッションと未出力のObsidianノートを書き出す
+        server.shutdown()
+        server.server_close()
+        flushed = writer.flush(SHUTDOWN_TIMEOUT)
+        if writer.export_queue is not None:
+            flushed = writer.export_queue.flush(timeout=SHUTDOWN_TIMEOUT) and flushed
+        if not flushed:
+            print("⚠️ 終了までに書き込み・出力が完了しませんでした", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,271 @@
+"""
+複数Vaultからの同期
+Vaultごとのマニフェストと比べて変更のあったノートだけを読み込み（Vaultごとに並行して走査）、
+日付ごとに優先順位に従って1つのノートを採用してDBに書き込む
+"""
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from config.vaults import VaultSource, load_vault_sources
+from services.database import DatabaseService
+from services.obsidian_sync import ObsidianSyncService, DAILY_NOTE_PATTERN, SYNC_WRITTEN, SYNC_EMPTY
+
+
+@dataclass
+class VaultNote:
+    """Vault内のデイリーノート"""
+    source: VaultSource
+    path: str
+    date: date
+    mtime: float
+    size: int
+    logs: List[Dict]
+    changed: bool = False  # 前回の同期以降に変更されたか
+
+
+@dataclass
+class VaultScan:
+    """1つのVaultの走査結果"""
+    source: VaultSource
+    notes: Dict[date, VaultNote] = field(default_factory=dict)
+    removed: Dict[str, date] = field(default_factory=dict)  # 削除されたノート（パス → 日付）
+    failures: Dict[str, str] = field(default_factory=dict)  # 読み込めなかったノート（パス → エラー）
+    error: str = ''
+
+    @property
+    def parsed_count(self) -> int:
+        return sum(1 for note in self.notes.values() if note.changed)
+
+
+def pick_note(candidates: List[VaultNote]) -> VaultNote:
+    """同じ日付のノートから採用するものを選ぶ
+
+    priority が大きいもの → 更新時刻が新しいもの → Vault名の昇順
+    """
+    return min(candidates, key=lambda note: (-note.source.priority, -note.mtime, note.source.name))
+
+
+class MultiVaultSyncService:
+    """複数Vaultからの差分同期"""
+
+    def __init__(
+        self,
+        sources: Optional[List[VaultSource]] = None,
+        db_service: Optional[DatabaseService] = None,
+        section_only: bool = False
+    ):
+        """
+        Args:
+            sources: 同期元Vault（省略時は同期のたびに vaults.json から読み込む）
+            db_service: DatabaseService
+            section_only: Trueなら「## 学習ログ」セクション内のみを抽出対象にする
+        """
+        self.sources = sources
+        self.db_service = db_service or DatabaseService()
+        self.sync_service = ObsidianSyncService(section_only=section_only, db_service=self.db_service)
+
+    def get_sources(self) -> List[VaultSource]:
+        """同期元Vaultの一覧"""
+        return self.sources if self.sources is not None else load_vault_sources()
+
+    def sync(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, any]:
+        """全Vaultを差分同期
+
+        Args:
+            start_date: 対象期間の開始日（省略時は制限なし）
+            end_date: 対象期間の終了日（省略時は制限なし）
+
+        Returns:
+            {'success_count': int, 'failed_count': int, 'messages': [str, ...],
+             'conflicts': [{'date', 'winner', 'others'}, ...],
+             'vaults': {Vault名: {'notes', 'parsed', 'removed', 'failed', 'error'}}}
+        """
+        sources = self.get_sources()
+        manifests = self._load_manifests()
+
+        # 科目正規化の初期化を走査前に済ませる（各スレッドで共有）
+        self.sync_service.normalizer
+
+        # Vaultごとに並行して走査（全体の所要時間は最も遅いVault程度）
+        with ThreadPoolExecutor(max_workers=max(len(sources), 1)) as executor:
+            scans = list(executor.map(
+                lambda source: self._scan(source, manifests.get(source.name, {}), start_date, end_date),
+                sources
+            ))
+
+        results = {
+            'success_count': 0,
+            'failed_count': 0,
+            'messages': [],
+            'conflicts': [],
+            'vaults': {},
+        }
+
+        # 変更・削除のあった日付だけを統合して書き込む
+        target_dates: Set[date] = set()
+        removed_dates: Set[date] = set()
+        for scan in scans:
+            target_dates.update(note.date for note in scan.notes.values() if note.changed)
+            removed_dates.update(scan.removed.values())
+        target_dates |= removed_dates
+
+        failed_dates: Set[date] = set()
+        for target_date in sorted(target_dates):
+            candidates = [scan.notes[target_date] for scan in scans
+                          if target_date in scan.notes and scan.notes[target_date].logs]
+            if not candidates:
+                continue
+
+            winner = pick_note(candidates)
+
+            others = [note for note in candidates if note is not winner and note.logs != winner.logs]
+            if others:
+                results['conflicts'].append({
+                    'date': target_date,
+                    'winner': winner.source.name,
+                    'others': [note.source.name for note in others],
+                })
+
+            # 採用ノートが変わらず、削除もなければ書き込み不要（他Vaultの変更のみ）
+            if not winner.changed and target_date not in removed_dates:
+                continue
+
+            status, message = self.sync_service.save_logs(target_date, winner.logs)
+            results['messages'].append(f"{target_date.isoformat()} [{winner.source.name}]: {message}")
+            if status == SYNC_WRITTEN:
+                results['success_count'] += 1
+            elif status != SYNC_EMPTY:
+                results['failed_count'] += 1
+                failed_dates.add(target_date)
+
+        # 書き込みに失敗した日付のノートはマニフェストを更新しない（次回再試行）
+        self._save_manifests(scans, failed_dates)
+
+        for scan in scans:
+            results['vaults'][scan.source.name] = {
+                'notes': len(scan.notes),
+                'parsed': scan.parsed_count,
+                'removed': len(scan.removed),
+                'failed': len(scan.failures),
+                'error': scan.error,
+            }
+            for path, error in scan.failures.items():
+                results['failed_count'] += 1
+                results['messages'].append(f"{path} [{scan.source.name}]: {error}")
+
+        return results
+
+    def _scan(
+        self,
+        source: VaultSource,
+        manifest: Dict[str, Dict],
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> VaultScan:
+        """1つのVaultを走査（更新時刻かサイズが変わったノートだけ読み込む）"""
+        scan = VaultScan(source=source)
+
+        def in_range(note_date: date) -> bool:
+            return (start_date is None or note_date >= start_date) and (end_date is None or note_date <= end_date)
+
+        try:
+            with os.scandir(source.daily_notes_path) as it:
+                entries = list(it)
+        except OSError as e:
+            # Vaultが見つからない（未マウントなど）場合は前回の内容のまま扱う
+            scan.error = f"デイリーノートフォルダを読み込めません: {e}"
+            for path, row in manifest.items():
+                if in_range(row['date']):
+                    scan.notes[row['date']] = VaultNote(source, path, row['date'], row['mtime'], row['size'], row['logs'])
+            return scan
+
+        seen = set()
+        for entry in entries:
+            match = DAILY_NOTE_PATTERN.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            try:
+                note_date = date.fromisoformat(match.group(1))
+            except ValueError:
+                continue
+
+            seen.add(entry.path)
+            if not in_range(note_date):
+                continue
+
+            stat = entry.stat()
+            previous = manifest.get(entry.path)
+            if previous is not None and previous['mtime'] == stat.st_mtime and previous['size'] == stat.st_size:
+                scan.notes[note_date] = VaultNote(
+                    source, entry.path, note_date, stat.st_mtime, stat.st_size, previous['logs']
+                )
+                continue
+
+            try:
+                logs = self.sync_service.parse_study_log_file(Path(entry.path))
+            except Exception as e:
+                scan.failures[entry.path] = f"エラー: {str(e)}"
+                continue
+
+            scan.notes[note_date] = VaultNote(
+                source, entry.path, note_date, stat.st_mtime, stat.st_size, logs, changed=True
+            )
+
+        for path, row in manifest.items():
+            if path not in seen and in_range(row['date']):
+                scan.removed[path] = row['date']
+
+        return scan
+
+    def _load_manifests(self) -> Dict[str, Dict[str, Dict]]:
+        """全Vaultのマニフェストを読み込む
+
+        Returns:
+            {Vault名: {パス: {'date', 'mtime', 'size', 'logs'}}}
+        """
+        manifests: Dict[str, Dict[str, Dict]] = {}
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT vault_name, path, date, mtime, size, logs FROM vault_manifests')
+            for row in cursor.fetchall():
+                manifests.setdefault(row['vault_name'], {})[row['path']] = {
+                    'date': date.fromisoformat(row['date']),
+                    'mtime': row['mtime'],
+                    'size': row['size'],
+                    'logs': json.loads(row['logs'] or '[]'),
+                }
+        return manifests
+
+    def _save_manifests(self, scans: List[VaultScan], failed_dates: Set[date]) -> None:
+        """読み込んだノート・削除されたノートをマニフェストに反映"""
+        now = datetime.now().isoformat()
+        upserts = []
+        deletes = []
+
+        for scan in scans:
+            for note in scan.notes.values():
+                if note.changed and note.date not in failed_dates:
+                    upserts.append((
+                        scan.source.name, note.path, note.date.isoformat(), note.mtime, note.size,
+                        json.dumps(note.logs, ensure_ascii=False), now
+                    ))
+            for path, note_date in scan.removed.items():
+                if note_date not in failed_dates:
+                    deletes.append((scan.source.name, path))
+
+        if not upserts and not deletes:
+            return
+
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO vault_manifests
+                (vault_name, path, date, mtime, size, logs, scanned_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', upserts)
+            cursor.executemany('DELETE FROM vault_manifests WHERE vault_name = ? AND path = ?', deletes)
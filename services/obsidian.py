@@ -1,23 +1,51 @@
 """
 Obsidianファイル出力サービス
 """
+import hashlib
+import os
+import stat
+import tempfile
 from datetime import date
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from models.record import StudyRecord, CumulativeStats
+from services.vault_index import VaultIndex
+from utils.cumulative import CumulativeIndex
+from utils.frontmatter import parse_frontmatter_lines, read_frontmatter
 
 # Obsidian Vault パス
 OBSIDIAN_VAULT = Path.home() / "Documents" / "01_Knowledge" / "obsidian-vault" / "03_Projects" / "診断士2026_一発合格" / "09_学習記録"
 
+# 新規ノートの権限（open() で作成した場合と同じく umask を適用）
+# umask は取得と同時に設定し直す必要があるため、スレッドが動き出す前の読み込み時に1回だけ取得する
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+NEW_NOTE_MODE = 0o666 & ~_UMASK
+
+# export_dates() で日付ごとに累計を集計する上限（これより多ければ記録を1回走査する）
+PER_DATE_EXPORT_LIMIT = 16
+
 
 class ObsidianService:
     """Obsidianファイル出力クラス"""
 
-    def __init__(self):
+    def __init__(self, db_service=None):
+        """
+        Args:
+            db_service: DatabaseService（指定すると出力した内容のハッシュを記録する）
+        """
         self.vault_path = OBSIDIAN_VAULT
-        # ディレクトリが存在しない場合は作成
-        self.vault_path.mkdir(parents=True, exist_ok=True)
+        self.db_service = db_service
+        self._index: Optional[VaultIndex] = None
+        # 出力先ディレクトリは初回書き込み時に作成（生成時はファイルシステムに触れない）
+        self._vault_ready = False
+
+    def _ensure_vault_dir(self) -> None:
+        """出力先ディレクトリを作成（インスタンスごとに初回のみ）"""
+        if not self._vault_ready:
+            self.vault_path.mkdir(parents=True, exist_ok=True)
+            self._vault_ready = True
 
     def generate_frontmatter(self, record: StudyRecord, stats: CumulativeStats) -> str:
         """YAMLフロントマターを生成"""
@@ -79,53 +107,196 @@ tags:
 
         return "\n".join(body_parts)
 
+    def render_note(self, record: StudyRecord, stats: CumulativeStats) -> str:
+        """ノート全体（フロントマター + ボディ）を生成"""
+        return self.generate_frontmatter(record, stats) + "\n" + self.generate_markdown_body(record, stats)
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        """ノート内容のハッシュ"""
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _atomic_write(file_path: Path, content: str) -> None:
+        """一時ファイルに書き込んでから置き換える（書き込み途中のノートを残さない）"""
+        fd, tmp_path = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+            # mkstemp は 0600 で作成するため、既存ノートの権限（新規なら open() と同じ権限）に合わせる
+            try:
+                mode = stat.S_IMODE(os.stat(file_path).st_mode)
+            except FileNotFoundError:
+                mode = NEW_NOTE_MODE
+            os.chmod(tmp_path, mode)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
     def export_to_obsidian(self, record: StudyRecord, stats: CumulativeStats) -> Path:
         """Obsidianファイルとして出力"""
         # ファイル名: YYYY-MM-DD.md
         filename = f"{record.date.isoformat()}.md"
         file_path = self.vault_path / filename
 
-        # フロントマター生成
-        frontmatter = self.generate_frontmatter(record, stats)
+        content = self.render_note(record, stats)
 
-        # ボディ生成
-        body = self.generate_markdown_body(record, stats)
+        # ファイル書き込み（一時ファイル + os.replace）
+        self._ensure_vault_dir()
+        self._atomic_write(file_path, content)
 
-        # ファイル書き込み
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(frontmatter)
-            f.write("\n")
-            f.write(body)
+        if self.db_service is not None:
+            self.db_service.save_export_hashes([(record.date, str(file_path), self.content_hash(content))])
+            self.index.update_entry(file_path, parse_frontmatter_lines(content.splitlines()) or {})
 
         return file_path
 
-    def read_existing_record(self, target_date: date) -> Optional[dict]:
-        """既存のObsidianファイルから記録を読み込み"""
-        filename = f"{target_date.isoformat()}.md"
-        file_path = self.vault_path / filename
-
-        if not file_path.exists():
+    def export_all(self, db_service) -> Dict[str, int]:
+        """全記録をObsidianへ一括出力
+
+        記録をDBから日付順に1件ずつ読み込み、累計をその場で積み上げながら
+        各ノートをその日時点の累計で生成する。前回出力時の内容ハッシュと
+        一致するノート（ファイルが存在するもの）は書き込まない
+
+        Args:
+            db_service: DatabaseService
+
+        Returns:
+            {'total': 記録数, 'written': 書き込んだ数, 'skipped': 変更なしで省略した数}
+        """
+        previous = db_service.get_export_hashes()
+        results = {'total': 0, 'written': 0, 'skipped': 0}
+        exported = []
+        indexed = []
+        cumulative = CumulativeIndex()
+        self._ensure_vault_dir()
+
+        for record in db_service.iter_records():
+            results['total'] += 1
+            cumulative.add(record)
+
+            written = self._write_if_changed(record, cumulative.stats_as_of(record.date), previous, indexed)
+            if written is None:
+                results['skipped'] += 1
+            else:
+                exported.append(written)
+                results['written'] += 1
+
+        db_service.save_export_hashes(exported)
+
+        # 書き込みがあればインデックスを更新（フォルダを走査し、更新時刻が変わったノートだけ読み直す）
+        if exported and self.index is not None:
+            self.index.update_entries(indexed)
+            self.index.refresh()
+
+        return results
+
+    def export_dates(self, db_service, dates) -> Dict[str, int]:
+        """指定日の記録だけをObsidianへ出力（内容が変わらないノートは書き込まない）
+
+        日付が少なければ日付ごとにその日時点の累計を集計し、多ければ記録を
+        1回走査して累計インデックスを作る
+
+        Args:
+            db_service: DatabaseService
+            dates: 出力する日付
+
+        Returns:
+            {'total': 記録数, 'written': 書き込んだ数, 'skipped': 変更なしで省略した数}
+        """
+        results = {'total': 0, 'written': 0, 'skipped': 0}
+        dates = sorted(set(dates))
+        if not dates:
+            return results
+
+        previous = db_service.get_export_hashes()
+        if len(dates) <= PER_DATE_EXPORT_LIMIT:
+            records = [record for record in map(db_service.get_record_by_date, dates) if record is not None]
+            stats_as_of = lambda target_date: db_service.get_cumulative_stats(as_of=target_date)
+        else:
+            cumulative = db_service.get_cumulative_index()
+            records = (record for record in db_service.iter_records(dates[0], dates[-1]) if record.date in dates)
+            stats_as_of = cumulative.stats_as_of
+        exported = []
+        indexed = []
+        self._ensure_vault_dir()
+
+        for record in records:
+            results['total'] += 1
+
+            written = self._write_if_changed(record, stats_as_of(record.date), previous, indexed)
+            if written is None:
+                results['skipped'] += 1
+            else:
+                exported.append(written)
+                results['written'] += 1
+
+        db_service.save_export_hashes(exported)
+
+        # 書き込んだノートだけインデックスを更新（フォルダは走査しない）
+        if exported and self.index is not None:
+            self.index.update_entries(indexed)
+
+        return results
+
+    def _write_if_changed(
+        self,
+        record: StudyRecord,
+        stats: CumulativeStats,
+        previous: Dict[str, Tuple[str, str]],
+        indexed: List[Tuple[Path, Dict[str, str]]]
+    ) -> Optional[Tuple[date, str, str]]:
+        """前回出力時から内容が変わっていればノートを書き込む
+
+        前回と同じ内容でも、ノートが削除されたりフロントマターが書き換えられて
+        いれば書き直す（ノートの確認はインデックス経由）
+
+        Args:
+            indexed: 書き込んだノートのパスとフロントマターを追加する（記録の読み込み中は
+                     DBに書き込めないため、インデックスへの反映は呼び出し側で読み込み後にまとめて行う）
+
+        Returns:
+            書き込んだ場合は (日付, ファイルパス, 内容ハッシュ)、省略した場合はNone
+        """
+        file_path = self.vault_path / f"{record.date.isoformat()}.md"
+        content = self.render_note(record, stats)
+        new_hash = self.content_hash(content)
+        fields = parse_frontmatter_lines(content.splitlines()) or {}
+
+        old = previous.get(record.date.isoformat())
+        if old is not None and old == (str(file_path), new_hash) and self.read_existing_record(record.date) == fields:
             return None
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        self._atomic_write(file_path, content)
+        indexed.append((file_path, fields))
+        return record.date, str(file_path), new_hash
 
-        # YAMLフロントマターをパース（簡易版）
-        if not content.startswith('---'):
+    @property
+    def index(self) -> Optional[VaultIndex]:
+        """出力先ディレクトリのノートインデックス（db_service指定時のみ）"""
+        if self.db_service is None:
             return None
+        if self._index is None:
+            self._index = VaultIndex(self.vault_path, self.db_service)
+        return self._index
 
-        # フロントマター部分を抽出
-        parts = content.split('---', 2)
-        if len(parts) < 3:
-            return None
+    def read_existing_record(self, target_date: date) -> Optional[dict]:
+        """既存のObsidianファイルから記録（フロントマター）を読み込み
 
-        frontmatter_text = parts[1]
+        インデックスにあり更新時刻が一致すればそれを返し、なければ
+        ファイルのフロントマター部分だけを読み込む
 
-        # 簡易的なYAMLパース
-        record_data = {}
-        for line in frontmatter_text.strip().split('\n'):
-            if ':' in line and not line.strip().startswith('-'):
-                key, value = line.split(':', 1)
-                record_data[key.strip()] = value.strip()
+        Returns:
+            {'key': 'value', ...}（ノートやフロントマターがない場合はNone）
+        """
+        if self.index is not None:
+            record_data = self.index.lookup(target_date)
+            if record_data is not None:
+                return record_data
 
-        return record_data
+        filename = f"{target_date.isoformat()}.md"
+        return read_frontmatter(self.vault_path / filename)
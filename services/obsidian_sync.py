@@ -2,31 +2,67 @@
 Obsidian自動連携サービス
 日次ノートから学習記録を抽出してデータベースに同期
 """
+import os
 import re
+import sqlite3
 from datetime import date, datetime
 from pathlib import Path
 from typing import List, Dict, Optional, Tuple
 
+from config.vaults import DEFAULT_VAULT_PATH, DEFAULT_DAILY_NOTES_SUBDIR
 from models.record import StudyRecord
 from services.database import DatabaseService
-from utils.phase import get_current_phase
-from utils.subjects import normalize_subject_name
+from utils.phase import get_phase_for_date
+from utils.study_log import parse_study_log, parse_study_log_file
+from utils.subjects import SubjectNormalizer
 
+# sync_daily_note_with_status() のステータス
+SYNC_MISSING = 'missing'    # ノートが存在しない
+SYNC_EMPTY = 'empty'        # ノートに学習ログがない
+SYNC_WRITTEN = 'written'    # DBに書き込んだ
+SYNC_ERROR = 'error'        # 読み込み・書き込みエラー
+
+# デイリーノートのファイル名: YYYY-MM-DD.md
+DAILY_NOTE_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})\.md$')
 
 class ObsidianSyncService:
     """Obsidian Vaultとの同期を管理"""
 
-    def __init__(self, vault_path: Optional[Path] = None):
+    def __init__(
+        self,
+        vault_path: Optional[Path] = None,
+        section_only: bool = False,
+        db_service: Optional[DatabaseService] = None,
+        daily_notes_subdir: str = DEFAULT_DAILY_NOTES_SUBDIR
+    ):
         """
         Args:
             vault_path: Obsidian Vaultのパス（デフォルト: ~/02_Knowledge/Obsidian/）
+            section_only: Trueなら「## 学習ログ」セクション内のみを抽出対象にする
+            db_service: DatabaseService（省略時は新規作成）
+            daily_notes_subdir: Vault内のデイリーノートフォルダ
         """
         if vault_path is None:
-            vault_path = Path.home() / "02_Knowledge" / "Obsidian"
+            vault_path = DEFAULT_VAULT_PATH
 
         self.vault_path = vault_path
-        self.daily_notes_path = vault_path / "21_資格学習統合支援システム" / "10_Daily"
-        self.db_service = DatabaseService()
+        self.daily_notes_path = vault_path / daily_notes_subdir
+        self.section_only = section_only
+        self.db_service = db_service or DatabaseService()
+        self._normalizer: Optional[SubjectNormalizer] = None
+        # (ディレクトリの更新時刻, ノートの日付リスト)
+        self._available_cache: Optional[Tuple[float, List[date]]] = None
+
+    @property
+    def normalizer(self) -> SubjectNormalizer:
+        """科目名の正規化（別名・略称 + DBの科目マスタ、初回アクセス時に構築）"""
+        if self._normalizer is None:
+            try:
+                self._normalizer = SubjectNormalizer.from_database(self.db_service)
+            except sqlite3.Error:
+                # DB未初期化の場合は別名・略称のみで正規化
+                self._normalizer = SubjectNormalizer()
+        return self._normalizer
 
     def parse_study_log(self, content: str) -> List[Dict[str, any]]:
         """学習ログセクションから記録を抽出
@@ -37,44 +73,20 @@ class ObsidianSyncService:
         Returns:
             [{'subject': '科目名', 'duration_hours': 1.5, 'type': 'shindan'|'toukei'}, ...]
         """
-        logs = []
-
-        # dur:: と subject:: パターンを検索
-        # 例: "dur:: 25m subject:: 財務会計" または "dur:: 1h subject:: 統計検定"
-        pattern = r'dur::\s*(\d+(?:\.\d+)?)\s*(h|m)\s+subject::\s*([^\n|#]+)'
-        matches = re.finditer(pattern, content, re.IGNORECASE)
-
-        for match in matches:
-            value = float(match.group(1))
-            unit = match.group(2).lower()
-            subject_raw = match.group(3).strip()
+        return parse_study_log(content, section_only=self.section_only, normalizer=self.normalizer)
 
-            # 科目名を正規化（略称や別名を正式名称に変換）
-            subject = normalize_subject_name(subject_raw)
+    def parse_study_log_file(self, daily_file: Path) -> List[Dict[str, any]]:
+        """デイリーノートファイルから記録をストリーミングで抽出
 
-            # 正規化に失敗した場合（未知の科目名）はスキップ
-            if subject is None:
-                continue
-
-            # 時間に変換
-            if unit == 'm':
-                hours = value / 60.0
-            else:
-                hours = value
+        大きなノートはmmapで読み込む（utils.study_log.MMAP_THRESHOLD_BYTES 以上）
 
-            # 科目タイプを判定（統計検定 or 診断士科目）
-            if '統計検定' in subject or subject == '統計検定2級':
-                study_type = 'toukei'
-            else:
-                study_type = 'shindan'
-
-            logs.append({
-                'subject': subject,
-                'duration_hours': round(hours, 2),
-                'type': study_type
-            })
+        Args:
+            daily_file: デイリーノートのパス
 
-        return logs
+        Returns:
+            parse_study_log() と同じ形式
+        """
+        return parse_study_log_file(daily_file, section_only=self.section_only, normalizer=self.normalizer)
 
     def aggregate_logs_by_type(self, logs: List[Dict]) -> Tuple[float, str, float]:
         """ログを診断士/統計検定で集計
@@ -108,28 +120,67 @@ class ObsidianSyncService:
         Returns:
             (成功/失敗, メッセージ)
         """
+        status, message = self.sync_daily_note_with_status(target_date)
+        return status == SYNC_WRITTEN, message
+
+    def sync_daily_note_with_status(self, target_date: date) -> Tuple[str, str]:
+        """指定日のデイリーノートを同期し、詳細なステータスを返す
+
+        Args:
+            target_date: 同期対象の日付
+
+        Returns:
+            (SYNC_MISSING | SYNC_EMPTY | SYNC_WRITTEN | SYNC_ERROR, メッセージ)
+        """
+        status, logs, message = self.read_daily_logs(target_date)
+        if status is not None:
+            return status, message
+
+        return self.save_logs(target_date, logs)
+
+    def read_daily_logs(self, target_date: date) -> Tuple[Optional[str], List[Dict], str]:
+        """指定日のデイリーノートから学習ログを抽出（DBには保存しない）
+
+        Args:
+            target_date: 対象の日付
+
+        Returns:
+            (ステータス, 学習ログ, メッセージ)
+            読み込めた場合のステータスはNone、読み込めなければ SYNC_MISSING | SYNC_ERROR
+        """
         # ファイル名: YYYY-MM-DD.md
         daily_file = self.daily_notes_path / f"{target_date.isoformat()}.md"
 
         if not daily_file.exists():
-            return False, f"ファイルが見つかりません: {daily_file}"
+            return SYNC_MISSING, [], f"ファイルが見つかりません: {daily_file}"
 
         try:
-            # ファイル読み込み
-            with open(daily_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            # 学習ログを抽出（1行ずつストリーミング）
+            logs = self.parse_study_log_file(daily_file)
+        except Exception as e:
+            return SYNC_ERROR, [], f"エラー: {str(e)}"
 
-            # 学習ログを抽出
-            logs = self.parse_study_log(content)
+        return None, logs, ""
 
-            if not logs:
-                return False, "学習記録が見つかりませんでした"
+    def save_logs(self, target_date: date, logs: List[Dict]) -> Tuple[str, str]:
+        """抽出済みの学習ログを指定日の記録としてDBに保存
 
+        Args:
+            target_date: 記録の日付
+            logs: parse_study_log() の結果
+
+        Returns:
+            (SYNC_EMPTY | SYNC_WRITTEN | SYNC_ERROR, メッセージ)
+        """
+        if not logs:
+            return SYNC_EMPTY, "学習記録が見つかりませんでした"
+
+        try:
             # 診断士/統計検定で集計
             shindan_time, shindan_subject, toukei_time = self.aggregate_logs_by_type(logs)
 
-            # フェーズ判定（現在日付ベース）
-            phase = get_current_phase()
+            # フェーズ判定（ノートの日付ベース）
+            phase = get_phase_for_date(target_date)
 
             # 既存レコードを確認
             existing_record = self.db_service.get_record_by_date(target_date)
@@ -162,13 +213,13 @@ class ObsidianSyncService:
                     toukei_issue=''
                 )
 
-            # 保存
-            self.db_service.save_record(record)
+            # 保存（科目別セッションもそのまま記録）
+            self.db_service.save_record(record, sessions=logs, source='obsidian')
 
-            return True, f"同期完了: 診断士 {shindan_time}h, 統計検定 {toukei_time}h"
+            return SYNC_WRITTEN, f"同期完了: 診断士 {shindan_time}h, 統計検定 {toukei_time}h"
 
         except Exception as e:
-            return False, f"エラー: {str(e)}"
+            return SYNC_ERROR, f"エラー: {str(e)}"
 
     def sync_date_range(self, start_date: date, end_date: date) -> Dict[str, any]:
         """期間内のデイリーノートを一括同期
@@ -206,22 +257,32 @@ class ObsidianSyncService:
     def get_available_daily_notes(self) -> List[date]:
         """利用可能なデイリーノートの日付リストを取得
 
+        ディレクトリの更新時刻が前回と同じ（ノートの追加・削除がない）場合は
+        前回の結果を返す
+
         Returns:
             [date, ...] ソート済み
         """
-        if not self.daily_notes_path.exists():
+        try:
+            dir_mtime = self.daily_notes_path.stat().st_mtime
+        except OSError:
+            self._available_cache = None
             return []
 
+        if self._available_cache is not None and self._available_cache[0] == dir_mtime:
+            return list(self._available_cache[1])
+
         dates = []
-        pattern = re.compile(r'(\d{4}-\d{2}-\d{2})\.md')
-
-        for file in self.daily_notes_path.glob('*.md'):
-            match = pattern.match(file.name)
-            if match:
-                try:
-                    date_obj = date.fromisoformat(match.group(1))
-                    dates.append(date_obj)
-                except ValueError:
-                    continue
-
-        return sorted(dates)
+        with os.scandir(self.daily_notes_path) as it:
+            for entry in it:
+                match = DAILY_NOTE_PATTERN.match(entry.name)
+                if match:
+                    try:
+                        date_obj = date.fromisoformat(match.group(1))
+                        dates.append(date_obj)
+                    except ValueError:
+                        continue
+
+        dates.sort()
+        self._available_cache = (dir_mtime, dates)
+        return list(dates)
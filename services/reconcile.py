@@ -0,0 +1,215 @@
+"""
+DBとVaultの双方向照合
+前回照合した時刻（基準時刻）以降に変更された側だけを反映する
+- DBの記録が更新された日付 → Obsidianへ出力（push）
+- デイリーノートが更新された日付 → DBへ取り込み（pull）
+- 両方が更新された日付 → 衝突として報告し、解決されるまでどちらも変更しない
+"""
+import json
+import os
+from datetime import date, datetime
+from typing import Dict, Optional, Tuple
+
+from services.database import DatabaseService
+from services.obsidian import ObsidianService
+from services.obsidian_sync import ObsidianSyncService, DAILY_NOTE_PATTERN, SYNC_WRITTEN, SYNC_ERROR
+
+# sync_state のキー
+WATERMARK_KEY = 'reconcile_watermark'
+CONFLICTS_KEY = 'reconcile_conflicts'
+PULLED_KEY = 'reconcile_pulled'
+
+# 衝突の解決方法
+PREFER_DB = 'db'
+PREFER_NOTE = 'note'
+
+
+class ReconcileService:
+    """DBとVaultの照合"""
+
+    def __init__(
+        self,
+        db_service: Optional[DatabaseService] = None,
+        obsidian_service: Optional[ObsidianService] = None,
+        sync_service: Optional[ObsidianSyncService] = None
+    ):
+        self.db_service = db_service or DatabaseService()
+        self.obsidian_service = obsidian_service or ObsidianService(self.db_service)
+        self.sync_service = sync_service or ObsidianSyncService(db_service=self.db_service)
+
+    def get_watermark(self) -> Optional[datetime]:
+        """前回照合した時刻（未照合ならNone）"""
+        value = self.db_service.get_sync_state(WATERMARK_KEY)
+        return datetime.fromisoformat(value) if value else None
+
+    def get_conflicts(self) -> Dict[date, Dict[str, str]]:
+        """未解決の衝突
+
+        Returns:
+            {日付: {'db_updated_at': ISO日時, 'note_mtime': ISO日時}}
+        """
+        value = self.db_service.get_sync_state(CONFLICTS_KEY)
+        if not value:
+            return {}
+        return {date.fromisoformat(key): detail for key, detail in json.loads(value).items()}
+
+    def reconcile(self) -> Dict[str, any]:
+        """前回の照合以降の変更を反映
+
+        初回（基準時刻なし）はDBにある日付をDB優先で出力し、DBにない日付だけ
+        ノートから取り込む。エラーがあった場合は基準時刻を進めない（次回再試行）
+
+        Returns:
+            {'pulled': [取り込んだ日付], 'pushed': 出力したノート数, 'unchanged': 内容が同じで省略した数,
+             'conflicts': {日付: 詳細}, 'failed_count': int, 'messages': [str, ...]}
+        """
+        started_at = datetime.now()
+        watermark = self.get_watermark()
+        conflicts = self.get_conflicts()
+        pulled = self._get_pulled()
+
+        db_changed = self.db_service.get_records_updated_since(watermark)
+        note_changed = self._notes_modified_since(watermark)
+
+        # 照合での取り込みによる更新（その後DB側で変更されていないもの）はDBの変更として扱わない
+        db_changed = {
+            d: updated_at for d, updated_at in db_changed.items()
+            if not (updated_at is not None and pulled.get(d) == updated_at)
+        }
+
+        if watermark is None:
+            note_changed = {d: mtime for d, mtime in note_changed.items() if d not in db_changed}
+
+        # 両側が変更された日付は衝突（未解決の衝突も解決まで触らない）
+        for target_date in set(db_changed) & set(note_changed):
+            conflicts[target_date] = {
+                'db_updated_at': db_changed[target_date].isoformat() if db_changed[target_date] else '',
+                'note_mtime': note_changed[target_date].isoformat(),
+            }
+
+        results = {
+            'pulled': [],
+            'pushed': 0,
+            'unchanged': 0,
+            'conflicts': conflicts,
+            'failed_count': 0,
+            'messages': [],
+        }
+
+        pull_dates = sorted(d for d in note_changed if d not in conflicts)
+        push_dates = [d for d in db_changed if d not in conflicts]
+
+        for target_date in pull_dates:
+            status, message = self.sync_service.sync_daily_note_with_status(target_date)
+            if status == SYNC_WRITTEN:
+                results['pulled'].append(target_date)
+                self._remember_pulled(pulled, target_date)
+                # 取り込んだ内容で出力ノートも更新
+                push_dates.append(target_date)
+            elif status == SYNC_ERROR:
+                results['failed_count'] += 1
+            results['messages'].append(f"{target_date.isoformat()} ← {message}")
+
+        try:
+            exported = self.obsidian_service.export_dates(self.db_service, push_dates)
+            results['pushed'] = exported['written']
+            results['unchanged'] = exported['skipped']
+        except OSError as e:
+            results['failed_count'] += 1
+            results['messages'].append(f"出力エラー: {str(e)}")
+
+        self._save_conflicts(conflicts)
+        if results['failed_count'] == 0:
+            watermark = started_at
+            self.db_service.set_sync_state(WATERMARK_KEY, started_at.isoformat())
+        self._save_pulled(pulled, watermark)
+
+        return results
+
+    def resolve_conflict(self, target_date: date, prefer: str) -> Tuple[bool, str]:
+        """衝突を解決
+
+        Args:
+            target_date: 衝突している日付
+            prefer: PREFER_DB（DBの内容を出力）または PREFER_NOTE（ノートの内容を取り込む）
+
+        Returns:
+            (成功/失敗, メッセージ)
+        """
+        if prefer not in (PREFER_DB, PREFER_NOTE):
+            return False, f"不正な解決方法です: {prefer}"
+
+        conflicts = self.get_conflicts()
+        if target_date not in conflicts:
+            return False, f"{target_date.isoformat()} は衝突していません"
+
+        if prefer == PREFER_NOTE:
+            status, message = self.sync_service.sync_daily_note_with_status(target_date)
+            if status != SYNC_WRITTEN:
+                return False, message
+            pulled = self._get_pulled()
+            self._remember_pulled(pulled, target_date)
+            self._save_pulled(pulled, self.get_watermark())
+
+        try:
+            self.obsidian_service.export_dates(self.db_service, [target_date])
+        except OSError as e:
+            return False, f"出力エラー: {str(e)}"
+
+        del conflicts[target_date]
+        self._save_conflicts(conflicts)
+        side = 'DB' if prefer == PREFER_DB else 'ノート'
+        return True, f"{target_date.isoformat()} を{side}の内容で解決しました"
+
+    def _notes_modified_since(self, since: Optional[datetime]) -> Dict[date, datetime]:
+        """基準時刻より後に更新されたデイリーノート
+
+        Returns:
+            {日付: 更新時刻}
+        """
+        threshold = since.timestamp() if since is not None else None
+        modified = {}
+
+        try:
+            with os.scandir(self.sync_service.daily_notes_path) as it:
+                entries = list(it)
+        except OSError:
+            return modified
+
+        for entry in entries:
+            match = DAILY_NOTE_PATTERN.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            mtime = entry.stat().st_mtime
+            if threshold is not None and mtime <= threshold:
+                continue
+            try:
+                modified[date.fromisoformat(match.group(1))] = datetime.fromtimestamp(mtime)
+            except ValueError:
+                continue
+
+        return modified
+
+    def _get_pulled(self) -> Dict[date, datetime]:
+        """照合で取り込んだ日付と、取り込みで書き込まれた記録の updated_at"""
+        value = self.db_service.get_sync_state(PULLED_KEY)
+        if not value:
+            return {}
+        return {date.fromisoformat(key): datetime.fromisoformat(ts) for key, ts in json.loads(value).items()}
+
+    def _remember_pulled(self, pulled: Dict[date, datetime], target_date: date) -> None:
+        """取り込み直後の記録の updated_at を控える"""
+        record = self.db_service.get_record_by_date(target_date)
+        if record is not None and record.updated_at is not None:
+            pulled[target_date] = record.updated_at
+
+    def _save_pulled(self, pulled: Dict[date, datetime], watermark: Optional[datetime]) -> None:
+        """取り込みの記録を保存（基準時刻以前の更新は次回の照合対象にならないため捨てる）"""
+        pulled = {d: ts for d, ts in pulled.items() if watermark is None or ts > watermark}
+        value = json.dumps({d.isoformat(): ts.isoformat() for d, ts in sorted(pulled.items())}) if pulled else None
+        self.db_service.set_sync_state(PULLED_KEY, value)
+
+    def _save_conflicts(self, conflicts: Dict[date, Dict[str, str]]) -> None:
+        """未解決の衝突を保存"""
+        value = json.dumps({d.isoformat(): detail for d, detail in sorted(conflicts.items())}) if conflicts else None
+        self.db_service.set_sync_state(CONFLICTS_KEY, value)
@@ -0,0 +1,123 @@
+"""
+サービスのプロセス共有インスタンス
+Streamlitのセッション作成・再実行のたびにサービスを作り直さないよう、
+各サービスはプロセス内で1つだけ生成して共有する
+"""
+import threading
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, List
+
+from config.vaults import VaultSource
+from database.init_db import init_database
+from services.database import DatabaseService
+from services.multi_vault_sync import MultiVaultSyncService
+from services.obsidian import ObsidianService
+from services.obsidian_sync import ObsidianSyncService
+from services.reconcile import ReconcileService
+from services.tweet import TweetService
+from services.tweet_cache import TweetCache
+
+_database_ready = False
+_database_lock = threading.Lock()
+
+# 同期モーダルの表示内容（再実行のたびにVault設定・ノートフォルダ・ジョブ一覧を読まない）
+# 同期ジョブの開始・終了時と、画面の再読み込みボタンで invalidate_sync_views() により破棄する
+_sync_views: Dict[str, Any] = {}
+_sync_views_lock = threading.Lock()
+
+
+def ensure_database() -> None:
+    """データベースを初期化（プロセス内で初回のみ実行）"""
+    global _database_ready
+    if _database_ready:
+        return
+    with _database_lock:
+        if not _database_ready:
+            init_database()
+            _database_ready = True
+
+
+@lru_cache(maxsize=None)
+def get_database_service() -> DatabaseService:
+    """共有のDatabaseServiceを取得"""
+    return DatabaseService()
+
+
+@lru_cache(maxsize=None)
+def get_obsidian_service() -> ObsidianService:
+    """共有のObsidianServiceを取得（出力先ディレクトリは初回書き込み時に作成）"""
+    return ObsidianService(get_database_service())
+
+
+@lru_cache(maxsize=None)
+def get_sync_service() -> ObsidianSyncService:
+    """共有のObsidianSyncServiceを取得"""
+    return ObsidianSyncService(db_service=get_database_service())
+
+
+@lru_cache(maxsize=None)
+def get_multi_vault_sync_service() -> MultiVaultSyncService:
+    """共有のMultiVaultSyncServiceを取得（Vault設定は同期のたびに読み込む）"""
+    return MultiVaultSyncService(db_service=get_database_service())
+
+
+@lru_cache(maxsize=None)
+def get_reconcile_service() -> ReconcileService:
+    """共有のReconcileServiceを取得"""
+    return ReconcileService(get_database_service(), get_obsidian_service(), get_sync_service())
+
+
+@lru_cache(maxsize=None)
+def get_tweet_service() -> TweetService:
+    """共有のTweetServiceを取得"""
+    return TweetService()
+
+
+@lru_cache(maxsize=None)
+def get_tweet_cache() -> TweetCache:
+    """共有のTweetCacheを取得"""
+    return TweetCache(get_database_service())
+
+
+def _get_sync_view(key: str, load: Callable[[], Any]) -> Any:
+    """同期モーダルの表示内容を取得（初回または破棄後のみ load() を呼ぶ。例外も保持する）"""
+    with _sync_views_lock:
+        if key in _sync_views:
+            value = _sync_views[key]
+        else:
+            try:
+                value = load()
+            except ValueError as e:
+                value = e
+            _sync_views[key] = value
+    if isinstance(value, Exception):
+        raise value
+    return value
+
+
+def get_vault_sources() -> List[VaultSource]:
+    """同期元Vaultの一覧（vaults.json の内容を保持）
+
+    Raises:
+        ValueError: 設定ファイルの形式が不正な場合
+    """
+    return list(_get_sync_view('vault_sources', get_multi_vault_sync_service().get_sources))
+
+
+def get_available_daily_notes() -> List[date]:
+    """既定のVaultのデイリーノートの日付（ソート済み）"""
+    return list(_get_sync_view('available_daily_notes', get_sync_service().get_available_daily_notes))
+
+
+def get_resumable_sync_jobs() -> list:
+    """再開可能な一括同期ジョブ（新しい順）"""
+    from services.sync_job import get_sync_job_manager  # sync_job がこのモジュールを読み込むため
+
+    return list(_get_sync_view('resumable_sync_jobs', get_sync_job_manager().get_resumable_jobs))
+
+
+def invalidate_sync_views() -> None:
+    """同期モーダルの表示内容を破棄（次の表示で読み直す）"""
+    with _sync_views_lock:
+        _sync_views.clear()
@@ -0,0 +1,286 @@
+"""
+Obsidian一括同期ジョブ
+期間同期をバックグラウンドスレッドで実行し、進捗カウンタ・キャンセル・再開に対応
+"""
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from services.database import DatabaseService
+from services.obsidian_sync import (
+    ObsidianSyncService,
+    SYNC_MISSING,
+    SYNC_EMPTY,
+    SYNC_WRITTEN,
+)
+from services.registry import get_database_service, get_sync_service, invalidate_sync_views
+
+# ジョブの状態
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_CANCELLED = 'cancelled'
+JOB_COMPLETED = 'completed'
+JOB_FAILED = 'failed'
+
+# 詳細ログとして保持する最大件数
+MAX_JOB_MESSAGES = 500
+
+
+@dataclass
+class SyncJob:
+    """一括同期ジョブの進捗"""
+    job_id: str
+    start_date: date
+    end_date: date
+    status: str = JOB_PENDING
+
+    # 進捗カウンタ
+    files_scanned: int = 0    # 存在したノート数
+    files_parsed: int = 0     # 学習ログを含んでいたノート数
+    records_written: int = 0  # DBに書き込んだ記録数
+    failed_count: int = 0     # エラーになったノート数
+
+    # ここまでコミット済み（再開時は翌日から）
+    last_committed_date: Optional[date] = None
+    error: str = ''
+    messages: List[str] = field(default_factory=list)
+
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def total_days(self) -> int:
+        """対象日数"""
+        return (self.end_date - self.start_date).days + 1
+
+    @property
+    def processed_days(self) -> int:
+        """処理済み日数"""
+        if self.last_committed_date is None:
+            return 0
+        return (self.last_committed_date - self.start_date).days + 1
+
+    @property
+    def progress(self) -> float:
+        """進捗率（0.0〜1.0）"""
+        return min(self.processed_days / self.total_days, 1.0) if self.total_days > 0 else 1.0
+
+    @property
+    def is_active(self) -> bool:
+        """実行中（または開始待ち）か"""
+        return self.status in (JOB_PENDING, JOB_RUNNING)
+
+    @property
+    def resume_date(self) -> Optional[date]:
+        """再開する日付（再開不要ならNone）"""
+        if self.status == JOB_COMPLETED:
+            return None
+        next_date = self.start_date if self.last_committed_date is None else self.last_committed_date + timedelta(days=1)
+        return next_date if next_date <= self.end_date else None
+
+
+class SyncJobManager:
+    """一括同期ジョブの管理クラス（プロセス内で共有）
+
+    ジョブの状態は sync_jobs テーブルにも保存するため、キャンセル・失敗・
+    プロセス再起動で中断したジョブを最後にコミットした日付の翌日から再開できる
+    """
+
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        self.db_service = db_service or get_database_service()
+        self._jobs: Dict[str, SyncJob] = {}
+        self._lock = threading.Lock()
+
+    def start(self, start_date: date, end_date: date, sync_service: Optional[ObsidianSyncService] = None) -> SyncJob:
+        """期間同期ジョブを開始
+
+        Args:
+            start_date: 開始日
+            end_date: 終了日
+            sync_service: 同期サービス（省略時は既定のVault）
+
+        Returns:
+            開始したジョブ
+        """
+        job = SyncJob(job_id=uuid.uuid4().hex[:12], start_date=start_date, end_date=end_date)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        self._save(job)
+        self._launch(job, sync_service)
+        return job
+
+    def resume(self, job_id: str, sync_service: Optional[ObsidianSyncService] = None) -> Optional[SyncJob]:
+        """中断したジョブを最後にコミットした日付の翌日から再開
+
+        Returns:
+            再開したジョブ（見つからない・実行中・完了済みならNone）
+        """
+        job = self.get(job_id)
+        if job is None or job.is_active or job.resume_date is None:
+            return None
+
+        job.cancel_event = threading.Event()
+        job.status = JOB_PENDING
+        job.error = ''
+        self._save(job)
+        self._launch(job, sync_service)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """ジョブのキャンセルを要求（処理中の日付の書き込み完了後に停止）"""
+        job = self.get(job_id)
+        if job is None or not job.is_active:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        """ジョブを取得（メモリにない場合はDBから復元）"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        job = self._load(job_id)
+        if job is not None:
+            with self._lock:
+                job = self._jobs.setdefault(job_id, job)
+        return job
+
+    def get_resumable_jobs(self) -> List[SyncJob]:
+        """再開可能なジョブの一覧（新しい順）"""
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT job_id FROM sync_jobs
+                WHERE status != ?
+                ORDER BY updated_at DESC
+            ''', (JOB_COMPLETED,))
+            job_ids = [row['job_id'] for row in cursor.fetchall()]
+
+        jobs = [self.get(job_id) for job_id in job_ids]
+        return [job for job in jobs if job is not None and not job.is_active and job.resume_date is not None]
+
+    def _launch(self, job: SyncJob, sync_service: Optional[ObsidianSyncService]) -> None:
+        """ワーカースレッドを起動"""
+        thread = threading.Thread(
+            target=self._run,
+            args=(job, sync_service or get_sync_service()),
+            name=f"obsidian-sync-{job.job_id}",
+            daemon=True
+        )
+        thread.start()
+        # 再開可能なジョブの一覧が変わる
+        invalidate_sync_views()
+
+    def _run(self, job: SyncJob, sync_service: ObsidianSyncService) -> None:
+        """ジョブ本体（ワーカースレッド）"""
+        job.status = JOB_RUNNING
+        self._save(job)
+
+        try:
+            current = job.resume_date
+            while current is not None and current <= job.end_date:
+                if job.cancel_event.is_set():
+                    job.status = JOB_CANCELLED
+                    break
+
+                # 読み込みと保存を分けて、学習ログを含むノート数を書き込み結果と別に数える
+                status, logs, message = sync_service.read_daily_logs(current)
+                if status is None:
+                    if logs:
+                        job.files_parsed += 1
+                    status, message = sync_service.save_logs(current, logs)
+
+                if status != SYNC_MISSING:
+                    job.files_scanned += 1
+                if status == SYNC_WRITTEN:
+                    job.records_written += 1
+                elif status not in (SYNC_MISSING, SYNC_EMPTY):
+                    job.failed_count += 1
+
+                if status != SYNC_MISSING:
+                    job.messages.append(f"{current.isoformat()}: {message}")
+                    del job.messages[:-MAX_JOB_MESSAGES]
+
+                # 1日分の処理が終わった時点で再開位置を確定
+                job.last_committed_date = current
+                self._save(job)
+
+                current += timedelta(days=1)
+            else:
+                job.status = JOB_COMPLETED
+
+        except Exception as e:
+            job.status = JOB_FAILED
+            job.error = str(e)
+
+        self._save(job)
+        invalidate_sync_views()
+
+    def _save(self, job: SyncJob) -> None:
+        """ジョブの状態を保存"""
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO sync_jobs
+                (job_id, start_date, end_date, status, files_scanned, files_parsed,
+                 records_written, failed_count, last_committed_date, error, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                job.job_id,
+                job.start_date.isoformat(),
+                job.end_date.isoformat(),
+                job.status,
+                job.files_scanned,
+                job.files_parsed,
+                job.records_written,
+                job.failed_count,
+                job.last_committed_date.isoformat() if job.last_committed_date else None,
+                job.error,
+                datetime.now().isoformat()
+            ))
+
+    def _load(self, job_id: str) -> Optional[SyncJob]:
+        """DBからジョブを復元"""
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM sync_jobs WHERE job_id = ?', (job_id,))
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+
+        job = SyncJob(
+            job_id=row['job_id'],
+            start_date=date.fromisoformat(row['start_date']),
+            end_date=date.fromisoformat(row['end_date']),
+            status=row['status'],
+            files_scanned=row['files_scanned'],
+            files_parsed=row['files_parsed'],
+            records_written=row['records_written'],
+            failed_count=row['failed_count'],
+            last_committed_date=date.fromisoformat(row['last_committed_date']) if row['last_committed_date'] else None,
+            error=row['error'] or '',
+        )
+
+        # このプロセスで実行していない「実行中」ジョブは中断扱い
+        if job.is_active:
+            job.status = JOB_FAILED
+            job.error = job.error or 'プロセス終了により中断'
+
+        return job
+
+
+_manager: Optional[SyncJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_sync_job_manager() -> SyncJobManager:
+    """プロセス共有のジョブマネージャーを取得"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SyncJobManager()
+        return _manager
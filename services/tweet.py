@@ -2,13 +2,30 @@
 X投稿文生成サービス
 """
 import random
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from config.constants import TWEET_WEIGHTED_LIMIT
 from models.record import StudyRecord, CumulativeStats
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from utils.cumulative import CumulativeIndex
+from utils.phase import get_phase_for_date
 from utils.subjects import SUBJECT_EMOJI_MAP
+from utils.tweet_length import truncate_weighted, weighted_length
 
 # 学習開始日（Day番号計算用）
 STUDY_START_DATE = date(2025, 10, 12)  # 最初の記録日
 
+# 可変部分の重み付き文字数の上限（日本語は1文字2）
+INSIGHT_WEIGHT = 100  # 全角50文字相当
+CONTENT_WEIGHT = 60   # 全角30文字相当
+ISSUE_WEIGHT = 40     # 全角20文字相当
+
+# 一括生成の期間の種類
+PERIOD_DAILY = 'daily'
+PERIOD_WEEKLY = 'weekly'
+PERIOD_MONTHLY = 'monthly'
+ALL_PERIODS = (PERIOD_DAILY, PERIOD_WEEKLY, PERIOD_MONTHLY)
+
 # 論語の引用リスト
 RONGO_QUOTES = [
     "学びて時に之を習う、亦た説ばしからずや",
@@ -39,18 +56,14 @@ class TweetService:
             insight = record.shindan_issue.strip()
             # 改行を除去して1行に
             insight = insight.replace('\n', ' ')
-            # 長すぎる場合は切り詰め（50文字まで）
-            if len(insight) > 50:
-                insight = insight[:47] + "..."
-            return insight
+            # 長すぎる場合は切り詰め（全角50文字相当まで）
+            return truncate_weighted(insight, INSIGHT_WEIGHT)
 
         # contentから抽出
         if record.shindan_content and record.shindan_content.strip():
             content = record.shindan_content.strip()
             content = content.replace('\n', ' ')
-            if len(content) > 50:
-                content = content[:47] + "..."
-            return content
+            return truncate_weighted(content, INSIGHT_WEIGHT)
 
         # どちらもない場合のデフォルト
         return "着実に知識を積み上げ中"
@@ -62,8 +75,15 @@ class TweetService:
 
     @staticmethod
     def generate_daily_tweet(record: StudyRecord, stats: CumulativeStats) -> str:
-        """日次投稿文を生成（140文字制限対応）"""
+        """日次投稿文を生成（X の重み付き文字数の上限に収める）"""
         lines = []
+        # 上限を超えたときに短くする行: [(行番号, 接頭辞, 元の文字列), ...]
+        flexible = []
+
+        def add_flexible(prefix: str, text: str, limit: int) -> None:
+            text = text.strip().replace('\n', '、')
+            flexible.append((len(lines), prefix, text))
+            lines.append(prefix + truncate_weighted(text, limit))
 
         # Day番号を計算
         day_num = TweetService._calculate_day_number(record.date)
@@ -84,13 +104,9 @@ class TweetService:
             # 統計検定
             lines.append(f"📊 統計検定 {record.toukei_time}h")
 
-            # 気づき（簡潔に）
+            # 気づき（簡潔に、全角20文字相当まで）
             if record.shindan_issue and record.shindan_issue.strip():
-                issue = record.shindan_issue.strip().replace('\n', '、')
-                # 20文字以内に収める
-                if len(issue) > 20:
-                    issue = issue[:17] + "..."
-                lines.append(f"💡{issue}")
+                add_flexible("💡", record.shindan_issue, ISSUE_WEIGHT)
 
             lines.append("")
             lines.append(f"累計 {stats.shindan_total}h/{stats.shindan_goal}h")
@@ -101,21 +117,13 @@ class TweetService:
             subject_text = record.shindan_subject if record.shindan_subject else "診断士学習"
             lines.append(f"{emoji} {subject_text} {record.shindan_time}h")
 
-            # 学習内容を簡潔に表示（contentから、長すぎる場合は省略）
+            # 学習内容を簡潔に表示（全角30文字相当まで）
             if record.shindan_content and record.shindan_content.strip():
-                content = record.shindan_content.strip().replace('\n', '、')
-                # 30文字以内に収める
-                if len(content) > 30:
-                    content = content[:27] + "..."
-                lines.append(f"└ {content}")
+                add_flexible("└ ", record.shindan_content, CONTENT_WEIGHT)
 
             # 気づき（issueがある場合）
             if record.shindan_issue and record.shindan_issue.strip():
-                issue = record.shindan_issue.strip().replace('\n', '、')
-                # 20文字以内に収める
-                if len(issue) > 20:
-                    issue = issue[:17] + "..."
-                lines.append(f"💡{issue}")
+                add_flexible("💡", record.shindan_issue, ISSUE_WEIGHT)
 
             lines.append("")
             lines.append(f"累計 {stats.shindan_total}h/{stats.shindan_goal}h")
@@ -126,19 +134,11 @@ class TweetService:
 
             # 学習内容（簡潔に）
             if record.toukei_content and record.toukei_content.strip():
-                content = record.toukei_content.strip().replace('\n', '、')
-                # 30文字以内に収める
-                if len(content) > 30:
-                    content = content[:27] + "..."
-                lines.append(f"└ {content}")
+                add_flexible("└ ", record.toukei_content, CONTENT_WEIGHT)
 
             # 気づき（issueがある場合）
             if record.toukei_issue and record.toukei_issue.strip():
-                issue = record.toukei_issue.strip().replace('\n', '、')
-                # 20文字以内に収める
-                if len(issue) > 20:
-                    issue = issue[:17] + "..."
-                lines.append(f"💡{issue}")
+                add_flexible("💡", record.toukei_issue, ISSUE_WEIGHT)
 
             lines.append("")
             lines.append(f"累計 {stats.toukei_total}h/{stats.toukei_goal}h")
@@ -157,7 +157,35 @@ class TweetService:
 
         lines.append(" ".join(hashtags))
 
-        return "\n".join(lines)
+        return TweetService._fit_lines(lines, flexible)
+
+    @staticmethod
+    def _fit_lines(lines: List[str], flexible: List[Tuple[int, str, str]]) -> str:
+        """上限を超えた分だけ可変の行（学習内容・気づき）を後ろから短くする
+
+        超過分を一度計算し、各行を必要な分だけ1回ずつ切り詰める（試行の繰り返しはしない）
+        """
+        text = "\n".join(lines)
+        overflow = weighted_length(text) - TWEET_WEIGHTED_LIMIT
+        if overflow <= 0:
+            return text
+
+        removed = set()
+        for index, prefix, original in reversed(flexible):
+            if overflow <= 0:
+                break
+            current = weighted_length(lines[index])
+            budget = current - weighted_length(prefix) - overflow
+            shortened = truncate_weighted(original, budget) if budget > 0 else ""
+            if shortened:
+                lines[index] = prefix + shortened
+                overflow -= current - weighted_length(lines[index])
+            else:
+                # 行ごと削除（改行1文字分も減る）
+                removed.add(index)
+                overflow -= current + 1
+
+        return "\n".join(line for i, line in enumerate(lines) if i not in removed)
 
     @staticmethod
     def generate_weekly_tweet(
@@ -225,7 +253,8 @@ class TweetService:
         cumulative_shindan: float,
         shindan_goal: float,
         progress: float,
-        phase: str
+        phase: str,
+        month: Optional[int] = None
     ) -> str:
         """月次投稿文を生成
 
@@ -237,12 +266,12 @@ class TweetService:
             shindan_goal: 診断士目標時間
             progress: 進捗率
             phase: 学習フェーズ
+            month: 対象月（省略時は今月）
         """
         lines = []
 
         # 月名を取得（例: "1月"）
-        from datetime import date
-        month_name = f"{date.today().month}月"
+        month_name = f"{month or date.today().month}月"
 
         # タイトル
         lines.append(f"{month_name}の積み上げ({phase})")
@@ -289,3 +318,130 @@ class TweetService:
         lines.append("#中小企業診断士")
 
         return "\n".join(lines)
+
+    @staticmethod
+    def generate_batch(
+        records: Iterable[StudyRecord],
+        subject_hours_by_date: Dict[date, Dict[str, float]],
+        start_date: date,
+        end_date: date,
+        periods: Sequence[str] = ALL_PERIODS
+    ) -> Iterator[Dict[str, any]]:
+        """期間内の日次・週次・月次投稿文を一括生成
+
+        記録を1回走査しながら累計を積み上げる（日ごとに累計を集計し直さない）
+
+        Args:
+            records: 日付の昇順に並んだ記録（累計のため start_date より前の記録も含める。
+                     end_date を含む週・月の末日までの記録があれば十分）
+            subject_hours_by_date: 日付別・科目別の学習時間（DatabaseService.get_subject_hours_by_date）
+            start_date: 開始日
+            end_date: 終了日
+            periods: 生成する期間の種類（daily / weekly / monthly）
+
+        Yields:
+            {'period': 期間の種類, 'key': キー, 'start_date': date, 'end_date': date, 'text': 投稿文}
+            （各期間が終わった順。週は月曜始まり、週・月は start_date〜end_date と重なるもの）
+        """
+        cumulative = CumulativeIndex()
+        weekly = _PeriodTotals(PERIOD_WEEKLY) if PERIOD_WEEKLY in periods else None
+        monthly = _PeriodTotals(PERIOD_MONTHLY) if PERIOD_MONTHLY in periods else None
+        first_week = start_date - timedelta(days=start_date.weekday())
+        first_month = start_date.replace(day=1)
+
+        for record in records:
+            # 終わった週・月を出力
+            for totals in (weekly, monthly):
+                if totals is not None and totals.start is not None and record.date > totals.end:
+                    yield totals.entry(cumulative)
+                    totals.reset()
+
+            cumulative.add(record)
+
+            if PERIOD_DAILY in periods and start_date <= record.date <= end_date and record.phase != '関連資格':
+                yield {
+                    'period': PERIOD_DAILY,
+                    'key': record.date.isoformat(),
+                    'start_date': record.date,
+                    'end_date': record.date,
+                    'text': TweetService.generate_daily_tweet(record, cumulative.stats_as_of(record.date)),
+                }
+
+            if record.phase == '関連資格':
+                continue
+            if weekly is not None and record.date >= first_week and record.date <= TweetService._week_end(end_date):
+                weekly.add(record, subject_hours_by_date.get(record.date, {}))
+            if monthly is not None and record.date >= first_month and record.date <= TweetService._month_end(end_date):
+                monthly.add(record, subject_hours_by_date.get(record.date, {}))
+
+        for totals in (weekly, monthly):
+            if totals is not None and totals.start is not None:
+                yield totals.entry(cumulative)
+
+    @staticmethod
+    def _week_end(target_date: date) -> date:
+        """指定日を含む週（月曜始まり）の日曜日"""
+        return target_date + timedelta(days=6 - target_date.weekday())
+
+    @staticmethod
+    def _month_end(target_date: date) -> date:
+        """指定日を含む月の末日"""
+        next_month = (target_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return next_month - timedelta(days=1)
+
+
+class _PeriodTotals:
+    """一括生成中の週・月の集計"""
+
+    def __init__(self, period: str):
+        self.period = period
+        self.reset()
+
+    def reset(self) -> None:
+        self.start: Optional[date] = None
+        self.end: Optional[date] = None
+        self.total_shindan = 0.0
+        self.total_toukei = 0.0
+        self.subject_hours: Dict[str, float] = {}
+
+    def add(self, record: StudyRecord, subject_hours: Dict[str, float]) -> None:
+        if self.start is None:
+            if self.period == PERIOD_WEEKLY:
+                self.start = record.date - timedelta(days=record.date.weekday())
+                self.end = TweetService._week_end(record.date)
+            else:
+                self.start = record.date.replace(day=1)
+                self.end = TweetService._month_end(record.date)
+
+        self.total_shindan += record.shindan_time
+        self.total_toukei += record.toukei_time
+        for subject, hours in subject_hours.items():
+            self.subject_hours[subject] = self.subject_hours.get(subject, 0.0) + hours
+
+    def entry(self, cumulative: CumulativeIndex) -> Dict[str, any]:
+        """期間の投稿文"""
+        subject_hours = {
+            subject: round(hours, 2)
+            for subject, hours in sorted(self.subject_hours.items(), key=lambda item: item[1], reverse=True)
+        }
+        total_shindan = round(self.total_shindan, 2)
+        total_toukei = round(self.total_toukei, 2)
+        phase = get_phase_for_date(self.end)
+
+        if self.period == PERIOD_WEEKLY:
+            text = TweetService.generate_weekly_tweet(subject_hours, total_shindan, total_toukei, phase)
+        else:
+            stats = cumulative.stats_as_of(self.end)
+            text = TweetService.generate_monthly_tweet(
+                subject_hours, total_shindan, total_toukei,
+                stats.shindan_total, stats.shindan_goal, stats.shindan_progress,
+                phase, month=self.start.month
+            )
+
+        return {
+            'period': self.period,
+            'key': f"{self.start.isoformat()}_{self.end.isoformat()}",
+            'start_date': self.start,
+            'end_date': self.end,
+            'text': text,
+        }
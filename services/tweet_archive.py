@@ -0,0 +1,112 @@
+"""
+X投稿文アーカイブの一括生成
+期間内の日次・週次・月次投稿文を生成して JSONL / CSV に書き出す
+
+Usage:
+    python -m services.tweet_archive --start 2025-10-12 --end 2026-10-25 -o tweets.jsonl
+    python -m services.tweet_archive --start 2026-01-01 --end 2026-03-31 --periods weekly,monthly --format csv
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Sequence, TextIO
+
+from services.database import DatabaseService
+from services.tweet import TweetService, ALL_PERIODS
+
+# 出力形式
+FORMAT_JSONL = 'jsonl'
+FORMAT_CSV = 'csv'
+ARCHIVE_FIELDS = ['period', 'key', 'start_date', 'end_date', 'text']
+
+
+def iter_archive(
+    db_service: DatabaseService,
+    start_date: date,
+    end_date: date,
+    periods: Sequence[str] = ALL_PERIODS
+) -> Iterator[Dict[str, any]]:
+    """期間内の投稿文を生成（記録は1回だけ読み込み、科目別時間も1回のクエリで取得）
+
+    Args:
+        db_service: DatabaseService
+        start_date: 開始日
+        end_date: 終了日
+        periods: 生成する期間の種類
+
+    Yields:
+        TweetService.generate_batch() と同じ形式
+    """
+    # end_date を含む週・月の末日まで読む（累計のため開始日より前の記録も読む）
+    upper = max(TweetService._week_end(end_date), TweetService._month_end(end_date))
+    lower = min(start_date - timedelta(days=start_date.weekday()), start_date.replace(day=1))
+
+    subject_hours_by_date = db_service.get_subject_hours_by_date(lower, upper)
+    records = db_service.iter_records(end_date=upper)
+
+    yield from TweetService.generate_batch(records, subject_hours_by_date, start_date, end_date, periods)
+
+
+def write_archive(entries: Iterator[Dict[str, any]], output: TextIO, output_format: str = FORMAT_JSONL) -> int:
+    """投稿文を1件ずつ書き出す
+
+    Returns:
+        書き出した件数
+    """
+    count = 0
+    writer = None
+    if output_format == FORMAT_CSV:
+        writer = csv.DictWriter(output, fieldnames=ARCHIVE_FIELDS)
+        writer.writeheader()
+
+    for entry in entries:
+        row = dict(entry, start_date=entry['start_date'].isoformat(), end_date=entry['end_date'].isoformat())
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            output.write(json.dumps(row, ensure_ascii=False) + "\n")
+        count += 1
+
+    return count
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """コマンドライン実行"""
+    parser = argparse.ArgumentParser(description="X投稿文アーカイブを一括生成")
+    parser.add_argument('--start', type=date.fromisoformat, required=True, help="開始日 (YYYY-MM-DD)")
+    parser.add_argument('--end', type=date.fromisoformat, default=date.today(), help="終了日 (YYYY-MM-DD、既定: 今日)")
+    parser.add_argument('--periods', default=','.join(ALL_PERIODS), help="daily,weekly,monthly のカンマ区切り")
+    parser.add_argument('--format', choices=[FORMAT_JSONL, FORMAT_CSV], help="出力形式（既定: 出力ファイルの拡張子、なければ jsonl）")
+    parser.add_argument('-o', '--output', type=Path, help="出力ファイル（省略時は標準出力）")
+    args = parser.parse_args(argv)
+
+    periods = [period.strip() for period in args.periods.split(',') if period.strip()]
+    unknown = [period for period in periods if period not in ALL_PERIODS]
+    if unknown:
+        parser.error(f"不明な期間: {', '.join(unknown)}")
+    if args.start > args.end:
+        parser.error("開始日は終了日より前の日付を指定してください")
+
+    output_format = args.format
+    if output_format is None:
+        output_format = FORMAT_CSV if args.output and args.output.suffix == '.csv' else FORMAT_JSONL
+
+    started = time.perf_counter()
+    entries = iter_archive(DatabaseService(), args.start, args.end, periods)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as f:
+            count = write_archive(entries, f, output_format)
+    else:
+        count = write_archive(entries, sys.stdout, output_format)
+
+    print(f"✅ {count}件の投稿文を生成しました（{time.perf_counter() - started:.2f}秒）", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
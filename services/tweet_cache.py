@@ -0,0 +1,182 @@
+"""
+X投稿文のキャッシュ
+生成した日次・週次・月次の投稿文を tweet_cache テーブルに保存し、再表示はキー1件の読み込みで済ませる
+（入力となる記録が保存されると DatabaseService.save_record() が該当するキャッシュを削除する）
+"""
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional
+
+from models.record import StudyRecord, CumulativeStats
+from services.database import DatabaseService
+from services.tweet import TweetService
+from utils.phase import get_phase_for_date
+
+# 期間の種類
+PERIOD_DAILY = 'daily'
+PERIOD_WEEKLY = 'weekly'
+PERIOD_MONTHLY = 'monthly'
+
+# 投稿文の書式を変えたら上げる（古い書式のキャッシュを使わない）
+FORMAT_VERSION = 2
+
+
+class TweetCache:
+    """投稿文のキャッシュ"""
+
+    def __init__(self, db_service: Optional[DatabaseService] = None):
+        self.db_service = db_service or DatabaseService()
+
+    def get_daily_tweet(self, record: StudyRecord, stats: Optional[CumulativeStats] = None) -> str:
+        """日次投稿文を取得（累計はその日時点）
+
+        Args:
+            record: DBから取得した記録（updated_at をキャッシュのバージョンに使う）
+            stats: その日時点の累計（計算済みの場合）
+        """
+        version = f"{FORMAT_VERSION}:{record.updated_at.isoformat()}" if record.updated_at else None
+        period_key = record.date.isoformat()
+
+        if version is not None:
+            cached = self._read(PERIOD_DAILY, period_key, version)
+            if cached is not None:
+                return cached
+
+        if stats is None:
+            stats = self.db_service.get_cumulative_stats(as_of=record.date)
+        text = TweetService.generate_daily_tweet(record, stats)
+
+        if version is not None:
+            self._write(PERIOD_DAILY, period_key, record.date, record.date, version, text)
+        return text
+
+    def fill_daily(self, target_date: date) -> Optional[str]:
+        """保存直後の記録の日次投稿文を生成してキャッシュ
+
+        Returns:
+            投稿文（記録がなければNone）
+        """
+        record = self.db_service.get_record_by_date(target_date)
+        if record is None:
+            return None
+        return self.get_daily_tweet(record)
+
+    def get_weekly_tweet(self, start_date: date, end_date: date) -> str:
+        """週次投稿文を取得（フェーズは期間最終日のもの）"""
+        period_key = f"{start_date.isoformat()}_{end_date.isoformat()}"
+        cached = self._read(PERIOD_WEEKLY, period_key, f"{FORMAT_VERSION}:{period_key}")
+        if cached is not None:
+            return cached
+
+        total_shindan, total_toukei = self._period_totals(start_date, end_date)
+        text = TweetService.generate_weekly_tweet(
+            weekly_stats=self.db_service.get_subject_hours(start_date, end_date),
+            total_shindan=total_shindan,
+            total_toukei=total_toukei,
+            phase=get_phase_for_date(end_date)
+        )
+
+        self._write(PERIOD_WEEKLY, period_key, start_date, end_date, f"{FORMAT_VERSION}:{period_key}", text)
+        return text
+
+    def get_monthly_tweet(self, start_date: date, end_date: date) -> str:
+        """月次投稿文を取得（累計は期間最終日時点、フェーズは期間最終日のもの）"""
+        period_key = f"{start_date.isoformat()}_{end_date.isoformat()}"
+        cached = self._read(PERIOD_MONTHLY, period_key, f"{FORMAT_VERSION}:{period_key}")
+        if cached is not None:
+            return cached
+
+        total_shindan, total_toukei = self._period_totals(start_date, end_date)
+        stats = self.db_service.get_cumulative_stats(as_of=end_date)
+        text = TweetService.generate_monthly_tweet(
+            monthly_stats=self.db_service.get_subject_hours(start_date, end_date),
+            total_shindan=total_shindan,
+            total_toukei=total_toukei,
+            cumulative_shindan=stats.shindan_total,
+            shindan_goal=stats.shindan_goal,
+            progress=stats.shindan_progress,
+            phase=get_phase_for_date(end_date),
+            month=start_date.month
+        )
+
+        self._write(PERIOD_MONTHLY, period_key, start_date, end_date, f"{FORMAT_VERSION}:{period_key}", text)
+        return text
+
+    def store_batch(self, entries: Iterable[Dict[str, any]], updated_at_by_date: Dict[date, datetime]) -> int:
+        """一括生成した投稿文をまとめてキャッシュに保存（1トランザクション）
+
+        Args:
+            entries: TweetService.generate_batch() の結果（読み込み中の接続と書き込みがぶつからないよう、読み切ったもの）
+            updated_at_by_date: 記録の更新日時（日次のキャッシュのバージョンに使う。ない日付は保存しない）
+
+        Returns:
+            保存した件数
+        """
+        rows = []
+        for entry in entries:
+            if entry['period'] == PERIOD_DAILY:
+                updated_at = updated_at_by_date.get(entry['start_date'])
+                if updated_at is None:
+                    continue
+                version = f"{FORMAT_VERSION}:{updated_at.isoformat()}"
+            else:
+                version = f"{FORMAT_VERSION}:{entry['key']}"
+            rows.append((
+                entry['period'], entry['key'],
+                entry['start_date'].isoformat(), entry['end_date'].isoformat(),
+                version, entry['text']
+            ))
+
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO tweet_cache
+                (period_type, period_key, start_date, end_date, version, text)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+        return len(rows)
+
+    def _period_totals(self, start_date: date, end_date: date) -> tuple:
+        """期間内の合計時間（関連資格を除く）
+
+        Returns:
+            (診断士合計, 統計合計)
+        """
+        total_shindan = 0.0
+        total_toukei = 0.0
+        for record in self.db_service.iter_records(start_date, end_date):
+            if record.phase != '関連資格':
+                total_shindan += record.shindan_time
+                total_toukei += record.toukei_time
+        return round(total_shindan, 2), round(total_toukei, 2)
+
+    def _read(self, period_type: str, period_key: str, version: str) -> Optional[str]:
+        """キャッシュを読み込む（バージョンが一致する場合のみ）
+
+        週次・月次は保存時に削除されるため、バージョンは書式のバージョンとキーのみ
+        """
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT text FROM tweet_cache
+                WHERE period_type = ? AND period_key = ? AND version = ?
+            ''', (period_type, period_key, version))
+            row = cursor.fetchone()
+            return row['text'] if row else None
+
+    def _write(
+        self,
+        period_type: str,
+        period_key: str,
+        start_date: date,
+        end_date: date,
+        version: str,
+        text: str
+    ) -> None:
+        """キャッシュを保存"""
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT OR REPLACE INTO tweet_cache
+                (period_type, period_key, start_date, end_date, version, text)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (period_type, period_key, start_date.isoformat(), end_date.isoformat(), version, text))
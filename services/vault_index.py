@@ -0,0 +1,209 @@
+"""
+Vaultノートのインデックス
+ノートのパス → 日付・更新時刻・フロントマターをDBに保持し、差分だけ更新する
+"""
+import json
+import os
+import re
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from utils.frontmatter import read_frontmatter
+
+# ファイル名: YYYY-MM-DD.md
+NOTE_FILENAME_PATTERN = re.compile(r'(\d{4}-\d{2}-\d{2})\.md$')
+
+
+class VaultIndex:
+    """Vaultディレクトリ内ノートのインデックス
+
+    lookup() はノートを1回 stat() し、更新時刻がインデックスと一致すれば
+    保持しているフロントマターを返す（ノートは読まない）。ディスクとの同期は
+    refresh() で行い、更新時刻が変わったノートだけフロントマターを読み直す。
+    出力時は update_entry() で書き込んだ内容を反映する。
+    """
+
+    def __init__(self, directory: Path, db_service):
+        """
+        Args:
+            directory: インデックス対象のディレクトリ
+            db_service: DatabaseService
+        """
+        self.directory = directory
+        self.db_service = db_service
+
+        # パス → {'date': date|None, 'mtime': float, 'frontmatter': dict}
+        self._entries: Optional[Dict[str, Dict]] = None
+        self._by_date: Dict[date, str] = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, target_date: date) -> Optional[Dict[str, str]]:
+        """指定日のノートのフロントマターを取得
+
+        インデックスにない、またはノートの更新時刻がインデックスと異なる
+        （出力後に編集・削除された）場合はNone
+
+        Args:
+            target_date: ノートの日付
+
+        Returns:
+            {'key': 'value', ...}
+        """
+        with self._lock:
+            self._load()
+            path = self._by_date.get(target_date)
+            if path is None:
+                return None
+            entry = self._entries[path]
+
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return None
+        if mtime != entry['mtime']:
+            return None
+        return dict(entry['frontmatter'])
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._load()
+            return len(self._entries)
+
+    def refresh(self) -> Dict[str, int]:
+        """ディスクの状態をインデックスに反映（変更されたノートのみ読み込み）
+
+        Returns:
+            {'scanned': ノート数, 'updated': 読み直した数, 'removed': 削除した数}
+        """
+        results = {'scanned': 0, 'updated': 0, 'removed': 0}
+
+        with self._lock:
+            self._load()
+
+            seen = set()
+            upserts = []
+
+            if self.directory.exists():
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if not entry.is_file() or not entry.name.endswith('.md'):
+                            continue
+
+                        results['scanned'] += 1
+                        seen.add(entry.path)
+                        mtime = entry.stat().st_mtime
+
+                        current = self._entries.get(entry.path)
+                        if current is not None and current['mtime'] == mtime:
+                            continue
+
+                        fields = read_frontmatter(Path(entry.path)) or {}
+                        upserts.append(self._set_entry(entry.path, mtime, fields))
+                        results['updated'] += 1
+
+            removed = [path for path in self._entries if path not in seen]
+            for path in removed:
+                self._remove_entry(path)
+            results['removed'] = len(removed)
+
+            self._persist(upserts, removed)
+
+        return results
+
+    def update_entry(self, file_path: Path, fields: Dict[str, str]) -> None:
+        """書き込んだノートをインデックスに反映（フロントマターは読み直さない）
+
+        Args:
+            file_path: 書き込んだノートのパス
+            fields: 書き込んだフロントマター
+        """
+        self.update_entries([(file_path, fields)])
+
+    def update_entries(self, written: List[Tuple[Path, Dict[str, str]]]) -> None:
+        """書き込んだノートをまとめてインデックスに反映（1トランザクション）
+
+        Args:
+            written: [(書き込んだノートのパス, 書き込んだフロントマター), ...]
+        """
+        if not written:
+            return
+        mtimes = [file_path.stat().st_mtime for file_path, _ in written]
+        with self._lock:
+            self._load()
+            rows = [
+                self._set_entry(str(file_path), mtime, fields)
+                for (file_path, fields), mtime in zip(written, mtimes)
+            ]
+            self._persist(rows, [])
+
+    def _load(self) -> None:
+        """DBからインデックスを読み込む（初回のみ、ロック取得中に呼ぶ）"""
+        if self._entries is not None:
+            return
+
+        self._entries = {}
+        self._by_date = {}
+
+        prefix = str(self.directory) + os.sep
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT path, mtime, frontmatter FROM vault_index WHERE substr(path, 1, ?) = ?',
+                (len(prefix), prefix)
+            )
+            for row in cursor.fetchall():
+                self._set_entry(row['path'], row['mtime'], json.loads(row['frontmatter'] or '{}'))
+
+    def _set_entry(self, path: str, mtime: float, fields: Dict[str, str]) -> tuple:
+        """メモリ上のエントリを更新し、DB保存用の行を返す"""
+        old = self._entries.get(path)
+        if old is not None and old['date'] is not None:
+            self._by_date.pop(old['date'], None)
+
+        note_date = self._note_date(path, fields)
+        self._entries[path] = {'date': note_date, 'mtime': mtime, 'frontmatter': fields}
+        if note_date is not None:
+            self._by_date[note_date] = path
+
+        return (
+            path,
+            note_date.isoformat() if note_date else None,
+            mtime,
+            json.dumps(fields, ensure_ascii=False),
+            datetime.now().isoformat()
+        )
+
+    def _remove_entry(self, path: str) -> None:
+        """メモリ上のエントリを削除"""
+        old = self._entries.pop(path)
+        if old['date'] is not None and self._by_date.get(old['date']) == path:
+            del self._by_date[old['date']]
+
+    def _persist(self, upserts: list, removed: list) -> None:
+        """変更分をDBに保存"""
+        if not upserts and not removed:
+            return
+
+        with self.db_service.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                INSERT OR REPLACE INTO vault_index (path, date, mtime, frontmatter, indexed_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', upserts)
+            cursor.executemany('DELETE FROM vault_index WHERE path = ?', [(path,) for path in removed])
+
+    @staticmethod
+    def _note_date(path: str, fields: Dict[str, str]) -> Optional[date]:
+        """ノートの日付（ファイル名を優先し、なければフロントマターの date）"""
+        match = NOTE_FILENAME_PATTERN.search(os.path.basename(path))
+        candidates = [match.group(1)] if match else []
+        candidates.append(fields.get('date', ''))
+
+        for candidate in candidates:
+            try:
+                return date.fromisoformat(candidate)
+            except ValueError:
+                continue
+        return None
@@ -0,0 +1,70 @@
+"""
+時系列グラフの間引きのテスト
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+from utils.downsample import (
+    downsample_indices,
+    lttb_indices,
+    minmax_indices,
+    to_numeric_dates,
+    METHOD_MINMAX,
+)
+
+
+def test_lttb_keeps_shape():
+    print("=== LTTB ===")
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[400] = 10.0  # 1点だけの山
+    indices = lttb_indices(x, y, 50)
+    print(f"   1000点 → {len(indices)}点")
+    assert len(indices) == 50
+    assert indices[0] == 0 and indices[-1] == 999
+    assert np.all(np.diff(indices) > 0)
+    assert 400 in indices
+
+    # 点数が少なければそのまま
+    assert list(lttb_indices(x[:10], y[:10], 50)) == list(range(10))
+    print("   ✅ 正常\n")
+
+
+def test_minmax_keeps_extremes():
+    print("=== min/max バケット ===")
+    rng = np.random.default_rng(0)
+    y = rng.random(10000)
+    y[1234] = -5.0
+    y[8765] = 5.0
+    indices = minmax_indices(y, 100)
+    print(f"   10000点 → {len(indices)}点")
+    assert len(indices) <= 202
+    assert 1234 in indices and 8765 in indices
+    assert indices[0] == 0 and indices[-1] == 9999
+    print("   ✅ 正常\n")
+
+
+def test_downsample_multiple_series():
+    print("=== 複数系列・日付 ===")
+    start = date(2024, 1, 1)
+    dates = [start + timedelta(days=i) for i in range(3 * 365)]
+    x = to_numeric_dates(dates)
+    assert x[1] - x[0] == 1.0
+
+    shindan = np.sin(np.arange(len(dates)) / 10.0)
+    toukei = np.cos(np.arange(len(dates)) / 7.0)
+    for method in ('lttb', METHOD_MINMAX):
+        indices = downsample_indices(x, [shindan, toukei], max_points=300, method=method)
+        print(f"   {method}: {len(dates)}点 → {len(indices)}点")
+        assert len(indices) <= 300
+        assert np.all(np.diff(indices) > 0)
+
+    assert len(downsample_indices(x[:100], [shindan[:100]], max_points=300)) == 100
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_lttb_keeps_shape()
+    test_minmax_keeps_extremes()
+    test_downsample_multiple_series()
@@ -0,0 +1,111 @@
+"""
+学習セッション登録APIのテスト
+"""
+import tempfile
+from datetime import date
+from pathlib import Path
+
+from database import init_db
+from models.record import StudyRecord
+from services.database import DatabaseService
+from services.ingest_api import IngestWriter, validate_session
+
+TODAY = date(2026, 1, 10)
+
+
+def test_validate_session():
+    print("=== セッションの検証 ===")
+    session, error = validate_session({'subject': '財務', 'minutes': 45}, today=TODAY)
+    assert error is None
+    assert session == {'date': TODAY, 'subject': '財務会計', 'duration_hours': 0.75}
+
+    session, error = validate_session({'subject': '統計', 'hours': 1.5, 'date': '2026-01-09'}, today=TODAY)
+    assert error is None
+    assert session['date'] == date(2026, 1, 9) and session['subject'] == '統計検定2級'
+
+    invalid = [
+        {'minutes': 30},                                        # 科目なし
+        {'subject': '存在しない科目', 'minutes': 30},
+        {'subject': '財務'},                                    # 時間なし
+        {'subject': '財務', 'minutes': 30, 'hours': 1},         # 両方指定
+        {'subject': '財務', 'minutes': '30'},                   # 文字列
+        {'subject': '財務', 'minutes': 0},
+        {'subject': '財務', 'hours': 25},
+        {'subject': '財務', 'minutes': 30, 'date': '2026/01/09'},
+        {'subject': '財務', 'minutes': 30, 'date': '2026-01-11'},  # 未来
+        ['財務', 30],
+    ]
+    for payload in invalid:
+        session, error = validate_session(payload, today=TODAY)
+        print(f"   {payload} → {error}")
+        assert session is None and error
+    print("   ✅ 正常\n")
+
+
+class RecordingDatabase:
+    """append_sessions の呼び出しを記録する"""
+
+    def __init__(self):
+        self.calls = []
+        self.totals = {}
+
+    def append_sessions(self, sessions_by_date, source):
+        self.calls.append({d: len(s) for d, s in sessions_by_date.items()})
+        for target_date, sessions in sessions_by_date.items():
+            shindan, toukei = self.totals.get(target_date, (0.0, 0.0))
+            self.totals[target_date] = (shindan + sum(s['duration_hours'] for s in sessions), toukei)
+        return dict(self.totals)
+
+
+def test_writer_coalesces_submissions():
+    print("=== 書き込みのまとめ ===")
+    db = RecordingDatabase()
+    writer = IngestWriter(db_service=db, max_delay=0.2)
+
+    sessions = [
+        {'date': TODAY, 'subject': '財務会計', 'duration_hours': 0.5},
+        {'date': TODAY, 'subject': '経済学', 'duration_hours': 0.25},
+        {'date': date(2026, 1, 9), 'subject': '財務会計', 'duration_hours': 1.0},
+    ]
+    futures = [writer.submit([session]) for session in sessions]
+    results = [future.result(timeout=5) for future in futures]
+
+    print(f"   トランザクション: {db.calls}")
+    assert db.calls == [{TODAY: 2, date(2026, 1, 9): 1}]
+    assert results[0] == {TODAY: (0.75, 0.0)}
+    assert results[2] == {date(2026, 1, 9): (1.0, 0.0)}
+    assert writer.status()['written_sessions'] == 3
+    print("   ✅ 正常\n")
+
+
+def test_append_keeps_unbacked_record_hours():
+    print("=== セッションのない記録の時間に追加 ===")
+    db_path = Path(tempfile.mkdtemp()) / "study_records.db"
+    original = init_db.DB_PATH
+    init_db.DB_PATH = db_path
+    try:
+        init_db.init_database()
+    finally:
+        init_db.DB_PATH = original
+    db = DatabaseService()
+    db.db_path = db_path
+
+    # 科目なしの旧記録（診断士の2.0hはセッションで裏付けられていない）
+    db.save_record(StudyRecord(date=TODAY, phase='基礎固め期', shindan_time=2.0, shindan_subject='', toukei_time=1.0))
+    totals = db.append_sessions({TODAY: [{'subject': '財務会計', 'duration_hours': 0.5}]})
+    print(f"   追加後: {totals[TODAY]}")
+    assert totals[TODAY] == (2.5, 1.0)
+
+    # セッションで裏付けられた時間は丸めずに積み上げる
+    for _ in range(3):
+        totals = db.append_sessions({TODAY: [{'subject': '統計検定2級', 'duration_hours': 1 / 60}]})
+    assert totals[TODAY] == (2.5, 1.05)
+    record = db.get_record_by_date(TODAY)
+    assert (record.shindan_time, record.toukei_time) == (2.5, 1.05)
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_validate_session()
+    test_writer_coalesces_submissions()
+    test_append_keeps_unbacked_record_hours()
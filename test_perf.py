@@ -0,0 +1,146 @@
+"""
+所要時間の計測（utils.perf）のテスト
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from utils import perf
+
+
+def _run_with_trace(func):
+    """一時ファイルにトレースを書き出して計測を実行"""
+    trace_path = Path(tempfile.mkdtemp()) / "perf_trace.jsonl"
+    original = perf.PERF_TRACE_PATH, perf.is_enabled()
+    perf.PERF_TRACE_PATH = trace_path
+    perf.set_enabled(True)
+    try:
+        func()
+    finally:
+        perf.PERF_TRACE_PATH = original[0]
+        perf.set_enabled(original[1])
+    return [json.loads(line) for line in trace_path.read_text(encoding='utf-8').splitlines()]
+
+
+@perf.instrument_methods('db', exclude=('skipped',))
+class FakeService:
+    def get_rows(self, n):
+        return list(range(n))
+
+    def iter_rows(self, n):
+        for i in range(n):
+            yield i
+
+    def iter_pages(self, n):
+        for i in range(n):
+            yield self.get_rows(i + 1)
+
+    def get_page(self):
+        return self.get_rows(3), None
+
+    def skipped(self):
+        return [1]
+
+
+def test_nested_spans():
+    print("=== 区間の入れ子とDB呼び出しの件数 ===")
+    service = FakeService()
+
+    def render():
+        with perf.timed('render'):
+            with perf.timed('section'):
+                service.get_rows(5)
+                assert sum(1 for _ in service.iter_rows(4)) == 4
+            service.get_page()
+            service.skipped()
+
+    runs = _run_with_trace(render)
+    assert len(runs) == 1
+    run = runs[0]
+    print(perf.format_run(run))
+    names = [(span['name'], span['depth'], span.get('rows')) for span in run['spans']]
+    assert names == [
+        ('render', 0, None),
+        ('section', 1, None),
+        ('db.get_rows', 2, 5),
+        ('db.iter_rows', 2, 4),
+        ('db.get_page', 1, 3),
+        ('db.get_rows', 2, 3),
+    ], names
+
+    # 入れ子のDB呼び出しは外側だけを数える
+    summary = {entry['name']: entry for entry in perf.summarize_calls(run, 'db.')}
+    assert summary['db.get_rows']['calls'] == 1 and summary['db.get_rows']['rows'] == 5
+    assert summary['db.get_page']['calls'] == 1
+    assert perf.recent_runs('render')[0]['ts'] == run['ts']
+    print("   ✅ 正常\n")
+
+
+def test_disabled_is_noop():
+    print("=== 無効時は記録しない ===")
+    perf.set_enabled(False)
+    before = len(perf.recent_runs())
+    with perf.timed('render') as span:
+        span['rows'] = 1
+    assert FakeService().get_rows(2) == [0, 1]
+    assert list(FakeService().iter_rows(2)) == [0, 1]
+    assert len(perf.recent_runs()) == before
+    print("   ✅ 正常\n")
+
+
+def test_decorator_and_top_level_call():
+    print("=== デコレーターと単独の呼び出し ===")
+
+    @perf.timed('analytics')
+    def show():
+        return FakeService().get_rows(1)
+
+    def calls():
+        assert show() == [0]
+        FakeService().get_rows(2)  # 外側に区間がなければそれ自体が1回の実行
+
+    runs = _run_with_trace(calls)
+    assert [run['name'] for run in runs] == ['analytics', 'db.get_rows']
+    assert runs[1]['spans'][0]['rows'] == 2
+    print("   ✅ 正常\n")
+
+
+def test_generator_excludes_consumer_time():
+    print("=== ジェネレーターは取り出している間だけを計測 ===")
+    service = FakeService()
+
+    def render():
+        with perf.timed('render'):
+            for _ in service.iter_rows(3):
+                time.sleep(0.02)  # 呼び出し側の処理
+                service.get_rows(2)
+            pages = service.iter_pages(2)
+            next(pages)
+            pages.close()  # 途中で閉じても記録する
+
+    runs = _run_with_trace(render)
+    assert len(runs) == 1
+    run = runs[0]
+    print(perf.format_run(run))
+    names = [(span['name'], span['depth'], span.get('rows')) for span in run['spans']]
+    assert names == [
+        ('render', 0, None),
+        ('db.iter_rows', 1, 3),
+        ('db.get_rows', 1, 2),
+        ('db.get_rows', 1, 2),
+        ('db.get_rows', 1, 2),
+        ('db.iter_pages', 1, 1),
+        ('db.get_rows', 2, 1),
+    ], names
+    assert run['spans'][1]['ms'] < 20, run['spans'][1]
+    summary = {entry['name']: entry for entry in perf.summarize_calls(run, 'db.')}
+    assert summary['db.get_rows']['calls'] == 3
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_nested_spans()
+    test_disabled_is_noop()
+    test_decorator_and_top_level_call()
+    test_generator_excludes_consumer_time()
@@ -0,0 +1,40 @@
+"""
+学習フェーズ判定のテスト
+"""
+from datetime import date
+
+from utils.phase import get_phase_for_date, get_phases_for_dates
+
+
+def test_phase_for_date():
+    print("=== 日付別フェーズ判定 ===")
+    cases = [
+        (date(2026, 1, 1), "基礎固め期"),
+        (date(2026, 3, 15), "基礎固め期"),
+        (date(2026, 3, 31), "基礎固め期"),
+        (date(2026, 4, 1), "応用力強化期"),
+        (date(2026, 8, 5), "直前追い込み期"),   # 1次試験日まで
+        (date(2026, 8, 6), "2次試験対策期"),
+        (date(2026, 10, 25), "2次試験対策期"),
+        (date(2025, 10, 12), "2次試験対策期"),  # ロードマップ期間外は月で判定
+        (date(2025, 12, 1), "基礎固め期"),
+        (date(2026, 11, 1), "基礎固め期"),
+    ]
+    for target_date, expected in cases:
+        actual = get_phase_for_date(target_date)
+        print(f"   {target_date.isoformat()} → {actual}")
+        assert actual == expected, f"{target_date}: 期待 {expected}, 実際 {actual}"
+    print("   ✅ 正常\n")
+
+
+def test_phases_for_dates_matches_scalar():
+    print("=== フェーズ一括判定 ===")
+    dates = [date(2026, 8, 6), date(2025, 11, 3), date(2026, 3, 31), date(2026, 8, 6), date(2026, 6, 1)]
+    assert get_phases_for_dates(dates) == [get_phase_for_date(d) for d in dates]
+    assert get_phases_for_dates([]) == []
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_phase_for_date()
+    test_phases_for_dates_matches_scalar()
@@ -0,0 +1,59 @@
+"""
+学習ログパーサーのテスト
+"""
+import tempfile
+from pathlib import Path
+
+from utils.study_log import parse_study_log, parse_study_log_file
+
+NOTE = """# 2026-01-05
+## 日記
+- 昨日の振り返り dur:: 2h subject:: 経済学
+
+## 学習ログ
+- dur:: 2h subject:: 財務会計
+- dur:: 30m subject:: 統計検定
+### 補足
+- dur:: 1h subject:: 企業経営理論
+
+## メモ
+- dur:: 15m subject:: 運営管理
+"""
+
+
+def test_parse_study_log_text():
+    print("=== 学習ログパーサー（文字列） ===")
+    logs = parse_study_log(NOTE)
+    subjects = [log['subject'] for log in logs]
+    print(f"   全体: {subjects}")
+    assert subjects == ['経済学', '財務会計', '統計検定2級', '企業経営理論', '運営管理']
+
+    logs = parse_study_log(NOTE, section_only=True)
+    subjects = [log['subject'] for log in logs]
+    print(f"   学習ログセクションのみ: {subjects}")
+    # 下位見出し（### 補足）はセクションに含まれ、次の ## で終了する
+    assert subjects == ['財務会計', '統計検定2級', '企業経営理論']
+    assert logs[1] == {'subject': '統計検定2級', 'duration_hours': 0.5, 'type': 'toukei'}
+    print("   ✅ 正常\n")
+
+
+def test_parse_study_log_file():
+    print("=== 学習ログパーサー（ファイル / mmap） ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        note_path = Path(tmp) / "2026-01-05.md"
+        note_path.write_text(NOTE, encoding='utf-8')
+
+        expected = parse_study_log(NOTE, section_only=True)
+        assert parse_study_log_file(note_path, section_only=True, use_mmap=False) == expected
+        assert parse_study_log_file(note_path, section_only=True, use_mmap=True) == expected
+
+        # 空ファイルは mmap でもエラーにならない
+        empty_path = Path(tmp) / "empty.md"
+        empty_path.write_text("", encoding='utf-8')
+        assert parse_study_log_file(empty_path, use_mmap=True) == []
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_parse_study_log_text()
+    test_parse_study_log_file()
@@ -0,0 +1,48 @@
+"""
+科目名正規化のテスト
+"""
+from utils.subjects import SubjectNormalizer, normalize_subject_name
+
+
+def test_normalize_aliases():
+    print("=== 科目名正規化（別名・表記ゆれ） ===")
+    cases = [
+        ("財務", "財務会計"),
+        ("財務会計", "財務会計"),  # 正式名称は別名（2次の財務）より優先
+        ("事例1", "事例I"),
+        ("事例１", "事例I"),      # 全角数字
+        ("事例Ⅲ", "事例III"),    # ローマ数字
+        ("事例iv", "事例IV"),     # 大文字小文字
+        (" 統計 ", "統計検定2級"),
+        ("未知の科目", None),
+        ("", None),
+    ]
+    for raw, expected in cases:
+        actual = normalize_subject_name(raw)
+        print(f"   '{raw}' → {actual}")
+        assert actual == expected, f"{raw}: 期待 {expected}, 実際 {actual}"
+    print("   ✅ 正常\n")
+
+
+def test_normalize_fuzzy_and_db_subjects():
+    print("=== 科目名正規化（タイプミス補正・科目マスタ） ===")
+    normalizer = SubjectNormalizer(db_subjects=[('事例I（組織・人事）', '事例I'), ('簿記2級', None)])
+
+    assert normalizer("運営管利") == "運営管理"
+    assert normalizer("企業経営理諭") == "企業経営理論"
+    # 同じ距離で複数の科目が候補になる場合は補正しない
+    assert normalizer("事例5") is None
+    # 科目マスタの名称・全角括弧の半角入力
+    assert normalizer("事例I(組織・人事)") == "事例I（組織・人事）"
+    assert normalizer("簿記２級") == "簿記2級"
+    # 略称は既存の正式名称を優先
+    assert normalizer("事例I") == "事例I"
+
+    normalizer("運営管利")
+    assert normalizer.cache_info().hits >= 1
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_normalize_aliases()
+    test_normalize_fuzzy_and_db_subjects()
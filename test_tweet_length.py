@@ -0,0 +1,70 @@
+"""
+X 重み付き文字数のテスト
+"""
+from datetime import date
+
+from config.constants import TWEET_WEIGHTED_LIMIT
+from models.record import StudyRecord, CumulativeStats
+from services.tweet import TweetService
+from utils.tweet_length import weighted_length, truncate_weighted
+
+
+def test_weighted_length():
+    print("=== 重み付き文字数 ===")
+    cases = [
+        ("abc", 3),
+        ("あいう", 6),
+        ("学習 2h", 7),
+        ("“quote” — ok", 12),          # 引用符・ダッシュは1
+        ("👍", 2),
+        ("👍🏽", 2),                      # 肌の色は数えない
+        ("👨‍👩‍👧", 2),                      # ZWJでつながった絵文字は1つ
+        ("見て https://example.com/a/very/long/path?q=1", 2 * 2 + 1 + 23),
+    ]
+    for text, expected in cases:
+        actual = weighted_length(text)
+        print(f"   {text!r} → {actual}")
+        assert actual == expected, f"{text!r}: 期待 {expected}, 実際 {actual}"
+    print("   ✅ 正常\n")
+
+
+def test_truncate_weighted():
+    print("=== 重み付き省略 ===")
+    assert truncate_weighted("あいう", 6) == "あいう"
+    assert truncate_weighted("あいうえおかきくけこ", 10) == "あいう..."
+    assert weighted_length(truncate_weighted("あいうえおかきくけこ" * 10, 41)) <= 41
+    # URLは途中で切らない
+    assert truncate_weighted("見て https://example.com/a です", 30) == "見て..."
+    assert truncate_weighted("abcd", 2) == ""
+    print("   ✅ 正常\n")
+
+
+def test_daily_tweet_fits_limit():
+    print("=== 日次投稿文が上限に収まる ===")
+    record = StudyRecord(
+        date=date(2026, 1, 5),
+        phase="基礎固め期",
+        shindan_time=2.0,
+        shindan_subject="財務会計",
+        shindan_content="キャッシュフロー計算書" * 30,
+        shindan_issue="営業CFの区分" * 30,
+    )
+    tweet = TweetService.generate_daily_tweet(record, CumulativeStats(shindan_total=100.0))
+    print(f"   {weighted_length(tweet)}/{TWEET_WEIGHTED_LIMIT}")
+    assert weighted_length(tweet) <= TWEET_WEIGHTED_LIMIT
+
+    # 固定部分が長いときは気づき（最後の可変行）から短くする
+    record.shindan_subject = "財務会計" * 12
+    tweet = TweetService.generate_daily_tweet(record, CumulativeStats(shindan_total=100.0))
+    print(f"   {weighted_length(tweet)}/{TWEET_WEIGHTED_LIMIT}")
+    assert weighted_length(tweet) <= TWEET_WEIGHTED_LIMIT
+    issue_line = next(line for line in tweet.splitlines() if line.startswith("💡"))
+    assert issue_line.endswith("...") and weighted_length(issue_line) < 2 + 40
+    assert tweet.endswith("#勉強垢")
+    print("   ✅ 正常\n")
+
+
+if __name__ == "__main__":
+    test_weighted_length()
+    test_truncate_weighted()
+    test_daily_tweet_fits_limit()
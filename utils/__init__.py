@@ -1,6 +1,6 @@
 """
 Utilities package
 """
-from .phase import get_current_phase
+from .phase import get_current_phase, get_phase_for_date, get_phases_for_dates
 
-__all__ = ['get_current_phase']
+__all__ = ['get_current_phase', 'get_phase_for_date', 'get_phases_for_dates']
@@ -0,0 +1,22 @@
+"""
+クリップボードへのコピー
+pyperclip はコピーするときに初めて読み込む（起動時には読み込まない）
+"""
+
+
+class ClipboardError(Exception):
+    """クリップボードへのアクセスに失敗した"""
+
+
+def copy_to_clipboard(text: str) -> None:
+    """テキストをクリップボードにコピー
+
+    Raises:
+        ClipboardError: クリップボードが使えない環境など
+    """
+    import pyperclip
+
+    try:
+        pyperclip.copy(text)
+    except pyperclip.PyperclipException as e:
+        raise ClipboardError(str(e)) from e
@@ -0,0 +1,77 @@
+"""
+累計学習時間の日付別インデックス
+記録を日付順に1回走査して累計（ランニングトータル）を作り、任意の日付時点の累計を二分探索で引く
+"""
+from bisect import bisect_right
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+from models.record import StudyRecord, CumulativeStats
+
+# 累計から除外するフェーズ
+EXCLUDED_PHASE = '関連資格'
+
+
+class CumulativeIndex:
+    """日付 → その日時点の累計時間
+
+    add() で日付の昇順に記録を追加しながら使うこともできる（一括出力など）
+    """
+
+    def __init__(self):
+        self._dates: List[date] = []
+        self._shindan: List[float] = []
+        self._toukei: List[float] = []
+        self._shindan_total = 0.0
+        self._toukei_total = 0.0
+
+    @classmethod
+    def from_records(cls, records: Iterable[StudyRecord]) -> 'CumulativeIndex':
+        """日付の昇順に並んだ記録から構築"""
+        index = cls()
+        for record in records:
+            index.add(record)
+        return index
+
+    def add(self, record: StudyRecord) -> None:
+        """記録を追加（日付の昇順で呼ぶこと）"""
+        if self._dates and record.date < self._dates[-1]:
+            raise ValueError(f"記録は日付の昇順で追加してください: {record.date} < {self._dates[-1]}")
+
+        if record.phase != EXCLUDED_PHASE:
+            self._shindan_total += record.shindan_time
+            self._toukei_total += record.toukei_time
+
+        if self._dates and self._dates[-1] == record.date:
+            self._shindan[-1] = self._shindan_total
+            self._toukei[-1] = self._toukei_total
+        else:
+            self._dates.append(record.date)
+            self._shindan.append(self._shindan_total)
+            self._toukei.append(self._toukei_total)
+
+    def totals_as_of(self, target_date: date) -> Tuple[float, float]:
+        """指定日時点（その日を含む）の累計
+
+        Returns:
+            (診断士累計, 統計累計)
+        """
+        position = bisect_right(self._dates, target_date) - 1
+        if position < 0:
+            return 0.0, 0.0
+        return round(self._shindan[position], 2), round(self._toukei[position], 2)
+
+    def stats_as_of(self, target_date: date) -> CumulativeStats:
+        """指定日時点の累計統計"""
+        shindan_total, toukei_total = self.totals_as_of(target_date)
+        stats = CumulativeStats(shindan_total=shindan_total, toukei_total=toukei_total)
+        stats.calculate_progress()
+        return stats
+
+    def latest_date(self) -> Optional[date]:
+        """最後に追加した日付"""
+        return self._dates[-1] if self._dates else None
+
+    def series(self) -> List[Tuple[date, float, float]]:
+        """[(日付, 診断士累計, 統計累計), ...]"""
+        return list(zip(self._dates, self._shindan, self._toukei))
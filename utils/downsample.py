@@ -0,0 +1,133 @@
+"""
+時系列グラフの間引き（サーバー側）
+履歴が何年分あっても、ブラウザに送る点数を系列あたり一定以下に抑える
+
+- LTTB（Largest-Triangle-Three-Buckets）: 見た目の形を保つ（折れ線向け）
+- min/max バケット: 各区間の最小・最大を残す（山・谷を落とさない）
+
+表示期間を絞った場合は同じ点数を狭い範囲に使うため、拡大するほど細かく表示される
+"""
+from datetime import date
+from typing import List, Sequence
+
+import numpy as np
+
+from config.constants import CHART_MAX_POINTS
+
+METHOD_LTTB = 'lttb'
+METHOD_MINMAX = 'minmax'
+
+
+def to_numeric_dates(dates: Sequence[date]) -> np.ndarray:
+    """日付の列を日数（エポックからの経過日数）の配列に変換"""
+    return np.asarray(dates, dtype='datetime64[D]').astype(np.int64).astype(np.float64)
+
+
+def lttb_indices(x: Sequence[float], y: Sequence[float], threshold: int) -> np.ndarray:
+    """LTTBで残す点のインデックス
+
+    Args:
+        x: X座標（昇順）
+        y: Y座標
+        threshold: 残す点数（先頭と末尾を含む）
+
+    Returns:
+        残す点のインデックス（昇順）
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # 先頭・末尾を除く点を threshold-2 個のバケットに分ける
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # 各バケットの「次のバケット」の平均（最後のバケットの次は末尾の点）
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    next_starts = np.append(starts[1:], n - 1)
+    next_ends = np.append(ends[1:], n)
+    counts = next_ends - next_starts
+    avg_x = (cum_x[next_ends] - cum_x[next_starts]) / counts
+    avg_y = (cum_y[next_ends] - cum_y[next_starts]) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # 直前に選んだ点に依存するためバケット単位のループは残るが、バケット内はベクトル演算
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = starts[i], ends[i]
+        px, py = x[previous], y[previous]
+        areas = np.abs(
+            (px - avg_x[i]) * (y[start:end] - py)
+            - (px - x[start:end]) * (avg_y[i] - py)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+
+    return selected
+
+
+def minmax_indices(y: Sequence[float], buckets: int) -> np.ndarray:
+    """各バケットの最小・最大の点のインデックス（先頭・末尾を含む）
+
+    Args:
+        y: Y座標
+        buckets: バケット数（残る点は最大 2 × buckets + 2）
+
+    Returns:
+        残す点のインデックス（昇順）
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if buckets < 1 or n <= 2 * buckets:
+        return np.arange(n)
+
+    bucket_of = np.arange(n) * buckets // n
+    # バケット → 値 の順に並べ、各バケットの先頭（最小）と末尾（最大）を取る
+    order = np.lexsort((y, bucket_of))
+    sorted_buckets = bucket_of[order]
+    boundary = sorted_buckets[1:] != sorted_buckets[:-1]
+    firsts = order[np.concatenate(([True], boundary))]
+    lasts = order[np.concatenate((boundary, [True]))]
+
+    return np.union1d(np.union1d(firsts, lasts), [0, n - 1])
+
+
+def downsample_indices(
+    x: Sequence[float],
+    series: List[Sequence[float]],
+    max_points: int = CHART_MAX_POINTS,
+    method: str = METHOD_LTTB
+) -> np.ndarray:
+    """同じX軸を持つ複数系列で共通に残す点のインデックス
+
+    系列ごとに選んだ点の和集合を返す（全系列で同じ行を残すため表形式のまま使える）
+
+    Args:
+        x: X座標（昇順）
+        series: Y座標の系列のリスト
+        max_points: 残す点数の上限（全系列の合計）
+        method: METHOD_LTTB または METHOD_MINMAX
+
+    Returns:
+        残す点のインデックス（昇順）
+    """
+    n = len(x)
+    if n <= max_points or not series:
+        return np.arange(n)
+
+    per_series = max(max_points // len(series), 3)
+    selected = np.empty(0, dtype=np.int64)
+    for y in series:
+        if method == METHOD_MINMAX:
+            indices = minmax_indices(y, max((per_series - 2) // 2, 1))
+        else:
+            indices = lttb_indices(x, y, per_series)
+        selected = np.union1d(selected, indices)
+
+    return selected
@@ -0,0 +1,54 @@
+"""
+YAMLフロントマター読み込みユーティリティ
+ノート全体ではなく、閉じ区切り（---）までの行だけを読む
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+FRONTMATTER_DELIMITER = '---'
+
+
+def parse_frontmatter_lines(lines: Iterable[str]) -> Optional[Dict[str, str]]:
+    """行のストリームからフロントマターを解析（簡易版）
+
+    1行目が `---` でなければNone。閉じ区切りに達した時点で読み込みを止める。
+    リスト項目（`  - タグ`）は無視し、`key: value` の行だけを取り出す。
+
+    Args:
+        lines: ノートの行
+
+    Returns:
+        {'key': 'value', ...}（フロントマターがない・閉じていない場合はNone）
+    """
+    iterator = iter(lines)
+    first = next(iterator, None)
+    if first is None or first.strip() != FRONTMATTER_DELIMITER:
+        return None
+
+    fields = {}
+    for line in iterator:
+        stripped = line.strip()
+        if stripped == FRONTMATTER_DELIMITER:
+            return fields
+        if ':' in stripped and not stripped.startswith('-'):
+            key, value = stripped.split(':', 1)
+            fields[key.strip()] = value.strip()
+
+    # 閉じ区切りがない
+    return None
+
+
+def read_frontmatter(file_path: Path) -> Optional[Dict[str, str]]:
+    """ノートファイルのフロントマターを読み込む
+
+    Args:
+        file_path: ノートのパス
+
+    Returns:
+        {'key': 'value', ...}（ファイルやフロントマターがない場合はNone）
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return parse_frontmatter_lines(f)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,289 @@
+"""
+描画・DB呼び出しの所要時間の計測（オプトイン）
+計測が有効なとき、timed() で囲んだ区間の所要時間をスレッドごとに記録する。
+最も外側の区間が終わるとそれを1回の実行（run）としてまとめ、直近の実行を
+メモリに保持して設定画面に表示し、JSONL のトレースファイルに追記する
+
+    STUDY_APP_PERF=1 streamlit run app_v3.py   （設定画面からも切り替え可能）
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# トレースの出力先（1行に1回の実行）
+PERF_TRACE_PATH = Path.home() / "study_app" / "perf_trace.jsonl"
+
+# 環境変数で起動時から計測を有効にする
+PERF_ENV = 'STUDY_APP_PERF'
+
+# メモリに保持する実行の数
+MAX_RECENT_RUNS = 50
+
+_enabled = os.environ.get(PERF_ENV) == '1'
+_local = threading.local()
+_recent_runs: deque = deque(maxlen=MAX_RECENT_RUNS)
+_runs_lock = threading.Lock()
+_trace_error: Optional[str] = None
+
+
+def is_enabled() -> bool:
+    """計測が有効か"""
+    return _enabled
+
+
+def set_enabled(enabled: bool) -> None:
+    """計測の有効・無効を切り替える（プロセス全体）"""
+    global _enabled
+    _enabled = enabled
+
+
+@contextmanager
+def timed(name: str, **fields) -> Iterator[Dict[str, Any]]:
+    """区間の所要時間を計測（コンテキストマネージャー・デコレーターとして使う）
+
+    計測中の区間の中で呼ぶと子区間として記録し、外側に区間がなければ
+    この区間を1回の実行として記録する。計測が無効なら何もしない
+
+    Usage:
+        with timed('analytics.prepare') as span:
+            ...
+            span['rows'] = len(records)
+
+        @timed('dashboard')
+        def show_dashboard(snapshot): ...
+
+    Args:
+        name: 区間名
+        **fields: 区間に付ける追加情報
+
+    Yields:
+        区間の記録（'rows' などを書き込める）
+    """
+    if not _enabled:
+        yield {}
+        return
+
+    stack = _get_stack()
+    if not stack:
+        _local.started = time.perf_counter()
+        _local.spans = []
+
+    span = dict(fields, name=name, depth=len(stack))
+    stack.append(span)
+    started = time.perf_counter()
+    span['start_ms'] = (started - _local.started) * 1000
+    try:
+        yield span
+    finally:
+        span['ms'] = (time.perf_counter() - started) * 1000
+        # 途中で破棄されたジェネレーターが後から閉じられても他の区間を壊さないよう、自分だけ取り除く
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is span:
+                del stack[i]
+                break
+        _local.spans.append(span)
+        if not stack:
+            _finish_run(span, _local.spans)
+
+
+def _get_stack() -> List[Dict[str, Any]]:
+    """このスレッドの計測中の区間"""
+    stack = getattr(_local, 'stack', None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+@contextmanager
+def _resumed(span: Dict[str, Any], run_started: float, run_spans: List[Dict[str, Any]]) -> Iterator[None]:
+    """ジェネレーターの区間を next() の間だけ計測中にする
+
+    中で呼ばれた区間はこの区間の子として、ジェネレーターを作った実行に記録される
+    """
+    stack = _get_stack()
+    saved = getattr(_local, 'started', None), getattr(_local, 'spans', None)
+    _local.started, _local.spans = run_started, run_spans
+    stack.append(span)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        span['ms'] += (time.perf_counter() - started) * 1000
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is span:
+                del stack[i]
+                break
+        _local.started, _local.spans = saved
+
+
+def count_rows(result: Any) -> Optional[int]:
+    """戻り値から件数を推定（件数と見なせない値はNone）"""
+    if result is None:
+        return 0
+    if isinstance(result, (list, dict, set, frozenset)):
+        return len(result)
+    if isinstance(result, tuple):
+        # (記録のリスト, 次ページのカーソル) のような戻り値
+        if result and isinstance(result[0], (list, dict)):
+            return len(result[0])
+        return None
+    if isinstance(result, (bool, int, float, str, bytes)):
+        return None
+    return 1
+
+
+def timed_call(name: str):
+    """関数呼び出しの所要時間と戻り値の件数を計測するデコレーター
+
+    ジェネレーター関数は値を取り出している間（next() の中）の時間だけを合計し、
+    読み終えるか閉じられた時点で取り出した件数とともに1つの区間として記録する。
+    取り出した値を呼び出し側が処理している時間や、その間の他の呼び出しは含めない
+    """
+    def decorator(func):
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                if not _enabled:
+                    yield from func(*args, **kwargs)
+                    return
+                stack = _get_stack()
+                own_run = not stack
+                run_started = time.perf_counter() if own_run else _local.started
+                run_spans = [] if own_run else _local.spans
+                span = {
+                    'name': name,
+                    'depth': len(stack),
+                    'start_ms': (time.perf_counter() - run_started) * 1000,
+                    'ms': 0.0,
+                    'rows': 0,
+                }
+                generator = func(*args, **kwargs)
+                try:
+                    while True:
+                        with _resumed(span, run_started, run_spans):
+                            try:
+                                item = next(generator)
+                            except StopIteration:
+                                return
+                        span['rows'] += 1
+                        yield item
+                finally:
+                    generator.close()
+                    run_spans.append(span)
+                    if own_run:
+                        _finish_run(span, run_spans)
+            return generator_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with timed(name) as span:
+                result = func(*args, **kwargs)
+                rows = count_rows(result)
+                if rows is not None:
+                    span['rows'] = rows
+                return result
+        return wrapper
+    return decorator
+
+
+def instrument_methods(prefix: str, exclude=()):
+    """クラスの公開メソッドすべてに timed_call を付けるクラスデコレーター
+
+    Args:
+        prefix: 区間名の接頭辞（例: 'db' → 'db.get_all_records'）
+        exclude: 計測しないメソッド名
+    """
+    def decorator(cls):
+        for attr, value in list(vars(cls).items()):
+            if attr.startswith('_') or attr in exclude or not inspect.isfunction(value):
+                continue
+            setattr(cls, attr, timed_call(f"{prefix}.{attr}")(value))
+        return cls
+    return decorator
+
+
+def _finish_run(root: Dict[str, Any], spans: List[Dict[str, Any]]) -> None:
+    """1回の実行をまとめて保持し、トレースに追記"""
+    global _trace_error
+    run = {
+        'ts': datetime.now().isoformat(timespec='milliseconds'),
+        'name': root['name'],
+        'thread': threading.current_thread().name,
+        'total_ms': round(root['ms'], 3),
+        'spans': [
+            dict(span, ms=round(span['ms'], 3), start_ms=round(span['start_ms'], 3))
+            for span in sorted(spans, key=lambda span: (span['start_ms'], span['depth']))
+        ],
+    }
+
+    with _runs_lock:
+        _recent_runs.append(run)
+        try:
+            PERF_TRACE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(PERF_TRACE_PATH, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run, ensure_ascii=False, default=str) + "\n")
+            _trace_error = None
+        except OSError as e:
+            _trace_error = str(e)
+
+
+def recent_runs(name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """直近の実行（新しい順）
+
+    Args:
+        name: 指定すると最も外側の区間名が一致する実行だけ
+    """
+    with _runs_lock:
+        runs = list(_recent_runs)
+    return [run for run in reversed(runs) if name is None or run['name'] == name]
+
+
+def trace_error() -> Optional[str]:
+    """直近のトレース書き込みエラー（成功していればNone）"""
+    return _trace_error
+
+
+def summarize_calls(run: Dict[str, Any], prefix: str) -> List[Dict[str, Any]]:
+    """実行内の区間を名前ごとに集計（DB呼び出しの集計などに使う）
+
+    入れ子になった同じ接頭辞の呼び出し（DB呼び出しから呼ばれるDB呼び出し）は
+    時間が二重に数えられないよう最も外側だけを数える
+
+    Returns:
+        [{'name', 'calls', 'ms', 'rows'}, ...]（時間の長い順）
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    counted_depth = None  # 直前に数えた呼び出しの深さ（これより深い区間はその内側）
+    for span in run['spans']:
+        if counted_depth is not None and span['depth'] > counted_depth:
+            continue
+        counted_depth = None
+        if not span['name'].startswith(prefix):
+            continue
+        counted_depth = span['depth']
+
+        entry = summary.setdefault(span['name'], {'name': span['name'], 'calls': 0, 'ms': 0.0, 'rows': 0})
+        entry['calls'] += 1
+        entry['ms'] += span['ms']
+        entry['rows'] += span.get('rows') or 0
+
+    return sorted(summary.values(), key=lambda entry: entry['ms'], reverse=True)
+
+
+def format_run(run: Dict[str, Any]) -> str:
+    """実行を区間の木として表示用の文字列にする"""
+    lines = [f"{run['name']}  {run['total_ms']:.1f}ms  ({run['ts']})"]
+    for span in run['spans'][1:]:
+        rows = f"  {span['rows']}行" if span.get('rows') is not None else ''
+        lines.append(f"{span['ms']:>9.1f}ms  {'  ' * span['depth']}{span['name']}{rows}")
+    return '\n'.join(lines)
@@ -1,24 +1,27 @@
 """
 学習フェーズ判定ユーティリティ
 """
-from datetime import date
+from bisect import bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterable, List, Tuple
 
+from config.constants import (
+    SHINDAN_1ST_EXAM_DATE,
+    SHINDAN_2ND_EXAM_DATE,
+    PHASE_2ND_EXAM,
+)
 
-def get_current_phase() -> str:
-    """現在の学習フェーズを取得
 
-    Returns:
-        現在の学習フェーズ:
-        - 1-3月: 基礎固め期（1次試験基礎学習）
-        - 4-5月: 応用力強化期（1次試験応用）
-        - 6-7月: 直前追い込み期（1次試験直前）
-        - 8-10月: 2次試験対策期（2次試験学習）
-        - 11-12月: 基礎固め期（次年度準備）
-    """
-    today = date.today()
-    month = today.month
+def _get_phase_by_month(month: int) -> str:
+    """月からフェーズを判定（ロードマップの期間外の日付用）
 
-    # フェーズ定義
+    - 1-3月: 基礎固め期（1次試験基礎学習）
+    - 4-5月: 応用力強化期（1次試験応用）
+    - 6-7月: 直前追い込み期（1次試験直前）
+    - 8-10月: 2次試験対策期（2次試験学習）
+    - 11-12月: 基礎固め期（次年度準備）
+    """
     if month in [1, 2, 3]:
         return "基礎固め期"
     elif month in [4, 5]:
@@ -29,3 +32,83 @@ def get_current_phase() -> str:
         return "2次試験対策期"
     else:  # 11, 12月
         return "基礎固め期"  # 次年度準備
+
+
+@lru_cache(maxsize=1)
+def get_phase_intervals() -> Tuple[Tuple[date, date, str], ...]:
+    """フェーズの区間表を取得（開始日でソート済み）
+
+    1次試験までは utils.roadmap.get_phase_boundaries()、
+    1次試験翌日から2次試験日までは config.constants の日程から構築する
+
+    Returns:
+        ((開始日, 終了日, フェーズ名), ...)
+    """
+    from utils.roadmap import get_phase_boundaries
+
+    intervals = [(p['start'], p['end'], p['name']) for p in get_phase_boundaries()]
+    intervals.append((SHINDAN_1ST_EXAM_DATE + timedelta(days=1), SHINDAN_2ND_EXAM_DATE, PHASE_2ND_EXAM))
+    return tuple(sorted(intervals))
+
+
+def get_phase_for_date(target_date: date) -> str:
+    """指定日の学習フェーズを取得
+
+    区間表を二分探索し、どの区間にも入らない日付は月で判定する
+
+    Args:
+        target_date: 対象日
+
+    Returns:
+        学習フェーズ名
+    """
+    intervals = get_phase_intervals()
+    index = bisect_right(intervals, (target_date, date.max)) - 1
+
+    if index >= 0:
+        start, end, name = intervals[index]
+        if start <= target_date <= end:
+            return name
+
+    return _get_phase_by_month(target_date.month)
+
+
+def get_phases_for_dates(dates: Iterable[date]) -> List[str]:
+    """複数日付の学習フェーズをまとめて取得
+
+    日付を一度だけソートし、区間表と並行して走査する（O(n log n + k)）。
+    一括同期やフェーズ別集計など、大量の日付を処理する場合に使う
+
+    Args:
+        dates: 対象日（順不同、重複可）
+
+    Returns:
+        入力と同じ順序のフェーズ名リスト
+    """
+    dates = list(dates)
+    intervals = get_phase_intervals()
+    phases: List[str] = [''] * len(dates)
+
+    position = 0
+    for index in sorted(range(len(dates)), key=dates.__getitem__):
+        target_date = dates[index]
+
+        # target_date より前に終わる区間を読み飛ばす
+        while position < len(intervals) and intervals[position][1] < target_date:
+            position += 1
+
+        if position < len(intervals) and intervals[position][0] <= target_date:
+            phases[index] = intervals[position][2]
+        else:
+            phases[index] = _get_phase_by_month(target_date.month)
+
+    return phases
+
+
+def get_current_phase() -> str:
+    """現在の学習フェーズを取得
+
+    Returns:
+        現在の学習フェーズ（get_phase_for_date(date.today())）
+    """
+    return get_phase_for_date(date.today())
@@ -3,15 +3,17 @@
 """
 from datetime import date, timedelta
 from typing import List, Dict, Tuple
-import pandas as pd
 
 
-def generate_roadmap_data() -> pd.DataFrame:
+def generate_roadmap_data() -> 'pd.DataFrame':
     """学習ロードマップデータを生成
 
     Returns:
         DataFrame with columns: date, phase, phase_name, days_from_start
     """
+    # pandasはここでのみ必要（utils.phase からのインポートを軽く保つ）
+    import pandas as pd
+
     # 基準日: 2026年1月1日
     start_date = date(2026, 1, 1)
 
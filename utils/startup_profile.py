@@ -0,0 +1,124 @@
+"""
+起動時の読み込み時間の計測
+新しいPythonプロセスで `-X importtime` を有効にしてアプリのモジュールを読み込み、
+モジュールごとの読み込み時間を集計する（実行中のプロセスの状態に影響されない）
+
+    python app_v3.py --profile-startup [--top 25] [--repeat 3]
+"""
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# 計測対象（アプリのエントリポイント）
+APP_MODULE = 'app_v3'
+APP_DIR = Path(__file__).resolve().parent.parent
+
+# 起動時に読み込まれていないことを確認する重いモジュール
+HEAVY_MODULES = ('pandas', 'numpy', 'plotly', 'pyperclip')
+
+# -X importtime の出力: "import time:  self [us] | cumulative | imported package"
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+@dataclass
+class ImportTiming:
+    """1モジュールの読み込み時間"""
+    module: str
+    self_us: int        # そのモジュール自身の時間（マイクロ秒）
+    cumulative_us: int  # 依存モジュールを含む時間（マイクロ秒）
+    depth: int          # 読み込みの深さ（0がトップレベル）
+
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """-X importtime の出力を解析"""
+    timings = []
+    for line in output.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+
+def measure_imports(module: str = APP_MODULE, cwd: Path = APP_DIR) -> List[ImportTiming]:
+    """新しいプロセスでモジュールを読み込み、読み込み時間を取得"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd,
+        capture_output=True,
+        text=True
+    )
+    timings = parse_importtime(result.stderr)
+    if result.returncode != 0 and not timings:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'import failed')
+    return timings
+
+
+def format_report(runs: List[List[ImportTiming]], module: str = APP_MODULE, top: int = 25) -> str:
+    """計測結果を表にする（複数回計測した場合は中央値）"""
+    cumulative: Dict[str, List[int]] = {}
+    self_times: Dict[str, List[int]] = {}
+    depths: Dict[str, int] = {}
+    for timings in runs:
+        for timing in timings:
+            cumulative.setdefault(timing.module, []).append(timing.cumulative_us)
+            self_times.setdefault(timing.module, []).append(timing.self_us)
+            depths.setdefault(timing.module, timing.depth)
+
+    def median_ms(values: List[int]) -> float:
+        return statistics.median(values) / 1000
+
+    lines = []
+    total = median_ms(cumulative[module]) if module in cumulative else sum(
+        median_ms(values) for name, values in cumulative.items() if depths[name] == 0
+    )
+    lines.append(f"⏱️  {module} の読み込み: {total:.1f}ms（{len(runs)}回の中央値、{len(cumulative)}モジュール）")
+    lines.append("")
+    lines.append(f"{'累計(ms)':>10} {'自身(ms)':>10}  モジュール")
+
+    ranked = sorted(
+        (name for name in cumulative if name != module),
+        key=lambda name: median_ms(cumulative[name]),
+        reverse=True
+    )
+    for name in ranked[:top]:
+        indent = '  ' * max(depths[name] - 1, 0)
+        lines.append(f"{median_ms(cumulative[name]):>10.1f} {median_ms(self_times[name]):>10.1f}  {indent}{name}")
+
+    lines.append("")
+    for heavy in HEAVY_MODULES:
+        if heavy in cumulative:
+            lines.append(f"⚠️  {heavy}: 起動時に読み込まれています（{median_ms(cumulative[heavy]):.1f}ms）")
+        else:
+            lines.append(f"✅ {heavy}: 起動時には読み込まれません")
+
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """コマンドライン実行"""
+    parser = argparse.ArgumentParser(description="起動時のモジュール読み込み時間を計測")
+    parser.add_argument('--profile-startup', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--module', default=APP_MODULE, help=f"計測するモジュール（既定: {APP_MODULE}）")
+    parser.add_argument('--top', type=int, default=25, help="表示するモジュール数")
+    parser.add_argument('--repeat', type=int, default=3, help="計測回数（中央値を表示）")
+    args = parser.parse_args(argv)
+
+    try:
+        runs = [measure_imports(args.module) for _ in range(max(args.repeat, 1))]
+    except RuntimeError as e:
+        print(f"❌ 読み込みに失敗しました: {e}", file=sys.stderr)
+        return 1
+
+    print(format_report(runs, args.module, args.top))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,7 +2,7 @@
 学習統計ユーティリティ
 """
 from datetime import date, datetime, timedelta
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from models.record import StudyRecord
 
 
@@ -46,15 +46,20 @@ def calculate_required_daily_pace(
     return round(remaining_hours / days_remaining, 2)
 
 
-def calculate_streak(records: List[StudyRecord]) -> int:
-    """連続学習日数を計算（関連資格を除外）"""
+def calculate_streak(records: List[StudyRecord], today: Optional[date] = None) -> int:
+    """連続学習日数を計算（関連資格を除外）
+
+    Args:
+        records: 学習記録のリスト
+        today: 基準日（省略時は今日）
+    """
     if not records:
         return 0
 
     # 日付順にソート（降順）
     sorted_records = sorted(records, key=lambda r: r.date, reverse=True)
 
-    today = date.today()
+    today = today or date.today()
     streak = 0
     current_date = today
 
@@ -78,13 +83,17 @@ def calculate_streak(records: List[StudyRecord]) -> int:
     return streak
 
 
-def calculate_weekly_stats(records: List[StudyRecord]) -> Dict[str, float]:
+def calculate_weekly_stats(records: List[StudyRecord], today: Optional[date] = None) -> Dict[str, float]:
     """今週の学習統計を計算（関連資格を除外）
 
+    Args:
+        records: 学習記録のリスト
+        today: 基準日（省略時は今日。その日を含む月曜〜日曜を集計）
+
     Returns:
         {'shindan': 総時間, 'toukei': 総時間, 'total': 総時間}
     """
-    today = date.today()
+    today = today or date.today()
     week_start = today - timedelta(days=today.weekday())  # 月曜日
     week_end = week_start + timedelta(days=6)  # 日曜日
 
@@ -103,13 +112,17 @@ def calculate_weekly_stats(records: List[StudyRecord]) -> Dict[str, float]:
     }
 
 
-def calculate_monthly_stats(records: List[StudyRecord]) -> Dict[str, float]:
+def calculate_monthly_stats(records: List[StudyRecord], today: Optional[date] = None) -> Dict[str, float]:
     """今月の学習統計を計算（関連資格を除外）
 
+    Args:
+        records: 学習記録のリスト
+        today: 基準日（省略時は今日。その日を含む月を集計）
+
     Returns:
         {'shindan': 総時間, 'toukei': 総時間, 'total': 総時間}
     """
-    today = date.today()
+    today = today or date.today()
 
     shindan_total = 0.0
     toukei_total = 0.0
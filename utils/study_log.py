@@ -0,0 +1,174 @@
+"""
+学習ログパーサー
+デイリーノートの `dur:: 25m subject:: 財務会計` 形式のインラインフィールドを抽出する
+
+- 正規表現はモジュール読み込み時に1回だけコンパイル
+- ノートは1行ずつストリーミング処理（全文をメモリに載せない）
+- 大きなノートは mmap で読み込み
+- 「## 学習ログ」セクションのみに限定した抽出にも対応
+"""
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from utils.subjects import normalize_subject_name
+
+# dur:: と subject:: パターン（1行内で完結する）
+# 例: "dur:: 25m subject:: 財務会計" または "dur:: 1h subject:: 統計検定"
+STUDY_LOG_PATTERN = re.compile(
+    r'dur::\s*(\d+(?:\.\d+)?)\s*(h|m)\s+subject::\s*([^\n|#]+)',
+    re.IGNORECASE
+)
+
+# Markdown見出し（レベルと見出し文字列）
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+
+# 学習ログセクションの見出し
+STUDY_LOG_HEADING = "学習ログ"
+
+# このサイズ以上のノートは mmap で読み込む（バイト）
+MMAP_THRESHOLD_BYTES = 1024 * 1024
+
+
+def iter_study_log_section(lines: Iterable[str], heading: str = STUDY_LOG_HEADING) -> Iterator[str]:
+    """学習ログセクション内の行だけを返す
+
+    見出しが `heading` に一致する行の次から、同じか上位レベルの見出しが
+    現れるまでの行を返す。セクションが複数あればすべて対象にする。
+
+    Args:
+        lines: ノートの行
+        heading: セクション見出しの文字列
+    """
+    section_level = 0
+
+    for line in lines:
+        if line.startswith('#'):
+            match = HEADING_PATTERN.match(line.rstrip('\r\n'))
+            if match:
+                level = len(match.group(1))
+                if match.group(2) == heading:
+                    section_level = level
+                    continue
+                if section_level and level <= section_level:
+                    section_level = 0
+
+        if section_level:
+            yield line
+
+
+def iter_log_entries(
+    lines: Iterable[str],
+    normalizer: Callable[[str], Optional[str]] = normalize_subject_name
+) -> Iterator[Dict[str, any]]:
+    """行のストリームから学習ログを1件ずつ抽出
+
+    Args:
+        lines: ノートの行
+        normalizer: 科目名の正規化関数（Noneを返した行はスキップ）
+
+    Yields:
+        {'subject': '科目名', 'duration_hours': 1.5, 'type': 'shindan'|'toukei'}
+    """
+    for line in lines:
+        # 大半の行はインラインフィールドを含まないので正規表現の前に除外
+        if '::' not in line:
+            continue
+
+        for match in STUDY_LOG_PATTERN.finditer(line):
+            # 科目名を正規化（略称や別名を正式名称に変換）
+            subject = normalizer(match.group(3).strip())
+
+            # 正規化に失敗した場合（未知の科目名）はスキップ
+            if subject is None:
+                continue
+
+            value = float(match.group(1))
+            hours = value / 60.0 if match.group(2).lower() == 'm' else value
+
+            # 科目タイプを判定（統計検定 or 診断士科目）
+            study_type = 'toukei' if '統計検定' in subject else 'shindan'
+
+            yield {
+                'subject': subject,
+                'duration_hours': round(hours, 2),
+                'type': study_type
+            }
+
+
+def parse_study_log(
+    content: str,
+    section_only: bool = False,
+    normalizer: Callable[[str], Optional[str]] = normalize_subject_name
+) -> List[Dict[str, any]]:
+    """ノート本文（文字列）から学習ログを抽出
+
+    Args:
+        content: デイリーノートの内容
+        section_only: Trueなら「学習ログ」セクション内のみを対象にする
+        normalizer: 科目名の正規化関数
+
+    Returns:
+        [{'subject': '科目名', 'duration_hours': 1.5, 'type': 'shindan'|'toukei'}, ...]
+    """
+    lines: Iterable[str] = content.splitlines()
+    if section_only:
+        lines = iter_study_log_section(lines)
+    return list(iter_log_entries(lines, normalizer))
+
+
+def _iter_mmap_lines(file_path: Path) -> Iterator[str]:
+    """mmap経由でファイルを1行ずつ読む"""
+    with open(file_path, 'rb') as f:
+        # 空ファイルは mmap できない
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for raw in iter(mm.readline, b''):
+                yield raw.decode('utf-8', errors='replace')
+
+
+def _iter_file_lines(file_path: Path) -> Iterator[str]:
+    """通常のファイル読み込みで1行ずつ読む"""
+    with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+        yield from f
+
+
+def iter_note_lines(file_path: Path, use_mmap: Optional[bool] = None) -> Iterator[str]:
+    """ノートを1行ずつ読む
+
+    Args:
+        file_path: ノートのパス
+        use_mmap: Trueでmmap、Falseで通常読み込み。Noneならサイズで自動判定
+    """
+    if use_mmap is None:
+        use_mmap = file_path.stat().st_size >= MMAP_THRESHOLD_BYTES
+
+    if use_mmap:
+        return _iter_mmap_lines(file_path)
+    return _iter_file_lines(file_path)
+
+
+def parse_study_log_file(
+    file_path: Path,
+    section_only: bool = False,
+    use_mmap: Optional[bool] = None,
+    normalizer: Callable[[str], Optional[str]] = normalize_subject_name
+) -> List[Dict[str, any]]:
+    """ノートファイルから学習ログをストリーミングで抽出
+
+    Args:
+        file_path: デイリーノートのパス
+        section_only: Trueなら「学習ログ」セクション内のみを対象にする
+        use_mmap: mmapを使うか（Noneならファイルサイズで自動判定）
+        normalizer: 科目名の正規化関数
+
+    Returns:
+        [{'subject': '科目名', 'duration_hours': 1.5, 'type': 'shindan'|'toukei'}, ...]
+    """
+    lines: Iterable[str] = iter_note_lines(file_path, use_mmap)
+    if section_only:
+        lines = iter_study_log_section(lines)
+    return list(iter_log_entries(lines, normalizer))
@@ -1,7 +1,9 @@
 """
 科目名関連のユーティリティ関数
 """
-from typing import Optional
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # 科目の別名・略称マッピング
 SUBJECT_ALIASES = {
@@ -60,6 +62,143 @@ SUBJECT_EMOJI_MAP = {
 }
 
 
+# 正規化結果のLRUキャッシュ上限
+NORMALIZE_CACHE_SIZE = 1024
+
+# 曖昧一致（編集距離）を試みる最短のキー長（短い略称は誤一致しやすいため対象外）
+FUZZY_MIN_LENGTH = 4
+
+
+def fold_subject_key(text: str) -> str:
+    """比較用のキーに変換
+
+    NFKC正規化で全角/半角・ローマ数字（Ⅰ→I）を揃え、casefoldで大文字小文字を無視し、
+    空白をすべて除去する
+    """
+    return ''.join(unicodedata.normalize('NFKC', text).casefold().split())
+
+
+def _edit_distance(a: str, b: str, limit: int) -> int:
+    """編集距離（レーベンシュタイン距離）を計算
+
+    limit を超えることが確定した時点で打ち切り、limit + 1 を返す
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+
+    return previous[-1]
+
+
+class SubjectNormalizer:
+    """科目名の正規化クラス
+
+    別名・略称とDBの科目マスタから比較用キー → 正式名称の辞書を一度だけ構築し、
+    以降は辞書引き（定数時間）で正規化する。辞書にない場合は編集距離で
+    タイプミスを補正する。結果はLRUキャッシュに保持する。
+    """
+
+    def __init__(
+        self,
+        db_subjects: Iterable[Tuple[str, Optional[str]]] = (),
+        aliases: Dict[str, str] = SUBJECT_ALIASES,
+        canonical_names: Iterable[str] = SUBJECT_EMOJI_MAP,
+        cache_size: int = NORMALIZE_CACHE_SIZE
+    ):
+        """
+        Args:
+            db_subjects: DBの科目マスタ [(科目名, 略称), ...]
+            aliases: 別名・略称マッピング
+            canonical_names: 正式名称
+            cache_size: LRUキャッシュの上限
+        """
+        lookup: Dict[str, str] = {}
+
+        # 優先順位: 正式名称 > 別名・略称 > DBの科目マスタ
+        for name in canonical_names:
+            lookup.setdefault(fold_subject_key(name), name)
+        for alias, canonical in aliases.items():
+            lookup.setdefault(fold_subject_key(alias), canonical)
+        for name, abbreviation in db_subjects:
+            lookup.setdefault(fold_subject_key(name), name)
+            if abbreviation:
+                lookup.setdefault(fold_subject_key(abbreviation), name)
+
+        self._lookup = lookup
+        self._fuzzy_keys: List[str] = [key for key in lookup if len(key) >= FUZZY_MIN_LENGTH]
+        self._cached_normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    @classmethod
+    def from_database(cls, db_service) -> 'SubjectNormalizer':
+        """DBの科目マスタを含めて構築"""
+        return cls(db_subjects=db_service.get_subjects())
+
+    def normalize(self, subject: str) -> Optional[str]:
+        """科目名を正規化（マッチしない場合はNone）"""
+        if not subject:
+            return None
+        return self._cached_normalize(subject)
+
+    __call__ = normalize
+
+    def _normalize(self, subject: str) -> Optional[str]:
+        key = fold_subject_key(subject)
+        if not key:
+            return None
+
+        canonical = self._lookup.get(key)
+        if canonical is not None:
+            return canonical
+
+        return self._fuzzy_match(key)
+
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        """編集距離が最小の候補を返す（同距離で別の科目が並ぶ場合はNone）"""
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+
+        limit = 1 if len(key) < 6 else 2
+        best_distance = limit + 1
+        best: Optional[str] = None
+
+        for candidate in self._fuzzy_keys:
+            distance = _edit_distance(key, candidate, limit)
+            if distance < best_distance:
+                best_distance = distance
+                best = self._lookup[candidate]
+            elif distance == best_distance and best != self._lookup[candidate]:
+                best = None
+
+        return best if best_distance <= limit else None
+
+    def cache_info(self):
+        """LRUキャッシュの統計"""
+        return self._cached_normalize.cache_info()
+
+
+_default_normalizer: Optional[SubjectNormalizer] = None
+
+
+def get_default_normalizer() -> SubjectNormalizer:
+    """別名・略称のみから構築した共有の正規化インスタンスを取得"""
+    global _default_normalizer
+    if _default_normalizer is None:
+        _default_normalizer = SubjectNormalizer()
+    return _default_normalizer
+
+
 def normalize_subject_name(subject: str) -> Optional[str]:
     """
     科目名を正規化する
@@ -77,29 +216,10 @@ def normalize_subject_name(subject: str) -> Optional[str]:
         '事例I'
         >>> normalize_subject_name("マーケ")
         '事例II'
+        >>> normalize_subject_name("事例Ⅲ")
+        '事例III'
     """
-    if not subject:
-        return None
-
-    # 前後の空白を削除
-    subject = subject.strip()
-
-    # 完全一致する正式名称の場合
-    if subject in SUBJECT_EMOJI_MAP:
-        return subject
-
-    # 別名・略称からマッピング
-    if subject in SUBJECT_ALIASES:
-        return SUBJECT_ALIASES[subject]
-
-    # 大文字小文字を無視してマッチング
-    subject_lower = subject.lower()
-    for alias, canonical in SUBJECT_ALIASES.items():
-        if alias.lower() == subject_lower:
-            return canonical
-
-    # マッチしない場合はNone
-    return None
+    return get_default_normalizer().normalize(subject)
 
 
 def get_subject_emoji(subject: str) -> str:
@@ -0,0 +1,158 @@
+"""
+X（旧Twitter）の重み付き文字数
+X の数え方（twitter-text v3）に合わせ、下記の範囲の文字は重み1、それ以外（日本語・絵文字など）は重み2、
+URLは長さによらず23として数える。上限は280（日本語のみなら140文字）
+
+BMP（U+0000〜U+FFFF）の重みは起動時に表として作っておき、1文字1回の表引きで数える
+"""
+import re
+import unicodedata
+from typing import Iterator, Tuple
+
+from config.constants import TWEET_WEIGHTED_LIMIT, TWEET_URL_WEIGHT
+
+# 重み1の範囲（twitter-text v3 の設定と同じ）
+LIGHT_RANGES = (
+    (0x0000, 0x10FF),  # ラテン文字・記号など
+    (0x2000, 0x200D),  # 各種スペース・ZWJ
+    (0x2010, 0x201F),  # ダッシュ・引用符
+    (0x2032, 0x2037),  # プライム記号
+)
+DEFAULT_WEIGHT = 2
+
+# 絵文字の一部として数えない（直前の文字と合わせて1つの絵文字になる）文字
+ZERO_WEIGHT_RANGES = (
+    (0x200D, 0x200D),    # ZWJ
+    (0xFE00, 0xFE0F),    # 異体字セレクタ
+    (0x1F3FB, 0x1F3FF),  # 肌の色
+    (0xE0020, 0xE007F),  # タグ文字（旗）
+)
+
+ZWJ = "\u200d"
+
+URL_PATTERN = re.compile(r'https?://[^\s　]+')
+
+# 省略記号
+ELLIPSIS = "..."
+
+
+def _build_bmp_weights() -> bytes:
+    """BMPの各文字の重みの表"""
+    weights = bytearray([DEFAULT_WEIGHT]) * 0x10000
+    for start, end in LIGHT_RANGES:
+        weights[start:end + 1] = bytes([1]) * (end - start + 1)
+    for start, end in ZERO_WEIGHT_RANGES:
+        if start < 0x10000:
+            weights[start:min(end, 0xFFFF) + 1] = bytes(min(end, 0xFFFF) - start + 1)
+    return bytes(weights)
+
+
+_BMP_WEIGHTS = _build_bmp_weights()
+
+
+def char_weight(char: str) -> int:
+    """1文字の重み"""
+    code = ord(char)
+    if code < 0x10000:
+        return _BMP_WEIGHTS[code]
+    for start, end in ZERO_WEIGHT_RANGES:
+        if start <= code <= end:
+            return 0
+    return DEFAULT_WEIGHT
+
+
+def _iter_weights(segment: str) -> Iterator[int]:
+    """URL以外の部分の各文字の重み（ZWJでつながった絵文字は先頭の文字だけ数える）"""
+    joined = False
+    for char in segment:
+        if joined:
+            joined = False
+            yield 0
+            continue
+        if char == ZWJ:
+            joined = True
+        yield char_weight(char)
+
+
+def _segment_weight(segment: str) -> int:
+    """URL以外の部分の重み"""
+    if ZWJ not in segment:
+        return sum(map(char_weight, segment))
+    return sum(_iter_weights(segment))
+
+
+def _segments(text: str) -> Iterator[Tuple[str, bool]]:
+    """テキストを (部分文字列, URLか) に分割"""
+    position = 0
+    for match in URL_PATTERN.finditer(text):
+        if match.start() > position:
+            yield text[position:match.start()], False
+        yield match.group(0), True
+        position = match.end()
+    if position < len(text):
+        yield text[position:], False
+
+
+def weighted_length(text: str) -> int:
+    """X の重み付き文字数"""
+    text = unicodedata.normalize('NFC', text)
+    total = 0
+    for segment, is_url in _segments(text):
+        if is_url:
+            total += TWEET_URL_WEIGHT
+        else:
+            total += _segment_weight(segment)
+    return total
+
+
+def truncate_weighted(text: str, limit: int, ellipsis: str = ELLIPSIS) -> str:
+    """重み付き文字数が limit 以下になるよう末尾を省略（1回の走査）
+
+    URLは途中で切らない（収まらなければURLごと省略する）
+
+    Args:
+        text: 対象のテキスト
+        limit: 重み付き文字数の上限
+        ellipsis: 省略したときに末尾に付ける文字列
+
+    Returns:
+        収まる場合はそのまま、収まらない場合は省略記号付きのテキスト
+    """
+    text = unicodedata.normalize('NFC', text)
+    budget = limit - weighted_length(ellipsis)
+
+    total = 0
+    cut = 0 if budget >= 0 else None  # 省略記号を付けて収まる最後の位置
+    position = 0
+
+    for segment, is_url in _segments(text):
+        if is_url:
+            total += TWEET_URL_WEIGHT
+            position += len(segment)
+            if total > limit:
+                break
+            if total <= budget:
+                cut = position
+            continue
+
+        for weight in _iter_weights(segment):
+            total += weight
+            position += 1
+            if total > limit:
+                break
+            if total <= budget:
+                cut = position
+        if total > limit:
+            break
+    else:
+        # 最後まで収まった
+        return text
+
+    if cut is None:
+        return ""
+    return text[:cut].rstrip().rstrip(ZWJ) + ellipsis
+
+
+def fits(text: str, limit: int = TWEET_WEIGHTED_LIMIT) -> bool:
+    """上限以内か"""
+    return weighted_length(text) <= limit